@@ -1,10 +1,25 @@
-from app.db.session import db 
-from google.cloud.firestore_v1.client import Client
+from typing import AsyncIterator, Optional, TYPE_CHECKING
+from fastapi import HTTPException
+from app.core.config import config
+from app.db.session import DatabaseUnavailableError, get_async_client
 
-def get_db() -> Client:
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
+
+async def get_db() -> AsyncIterator[Optional["AsyncClient"]]:
     """
-    Dependency function that yields the Firestore client.
+    Dependency function that yields the async Firestore client (or the memory
+    backend's stand-in, see STORAGE_BACKEND), creating it on first use.
+    When the catalogue is served from an artifact (CATALOGUE_ARTIFACT_PATH), no
+    client is needed and None is yielded if Firestore isn't configured.
     """
+    try:
+        db = get_async_client()
+    except DatabaseUnavailableError as e:
+        if config.CATALOGUE_ARTIFACT_PATH:
+            db = None
+        else:
+            raise HTTPException(status_code=503, detail=f"Database unavailable: {e}")
     try:
         yield db
     finally:
@@ -12,4 +27,4 @@ def get_db() -> Client:
         # For Firestore's client, it's managed globally, so there's
         # often no explicit close needed per request. The try/finally
         # block is good practice for future-proofing.
-        pass
\ No newline at end of file
+        pass
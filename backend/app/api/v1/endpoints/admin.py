@@ -0,0 +1,28 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+
+from app.core.config import config
+from app.services.catalogue_snapshot import catalogue_snapshot
+
+router = APIRouter()
+
+
+def _check_admin_token(token: Optional[str]) -> None:
+    """Rejects the request unless it carries the configured admin token."""
+    expected = config.ADMIN_API_TOKEN
+    if not expected or not token or not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.post("/admin/cache/invalidate")
+async def invalidate_cache(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Starts reloading the catalogue snapshot, which keeps being served until
+    the new one is ready.
+    Called by the uploaders after they write to Firestore.
+    """
+    _check_admin_token(x_admin_token)
+    catalogue_snapshot.invalidate()
+    return {"status": "ok"}
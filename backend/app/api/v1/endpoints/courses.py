@@ -1,102 +1,212 @@
-from fastapi import APIRouter, HTTPException
-from typing import Any, Dict, List
-from pydantic import ValidationError
-import asyncio
-# from google.cloud.firestore_v1.client import Client
-from app.db.session import db
-from app.api.v1.schemas import Department, Course
-from app.services.department_course_scraper import departments_names_to_codes
+import base64
+import binascii
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Any, Callable, Dict, List, Literal, Optional, TYPE_CHECKING
+from app.api.deps import get_db
+from app.api.v1.schemas import Department, Course, CourseBatchRequest, CourseBatchResponse
+from app.core.encoding import JSON_MEDIA_TYPE, EncodedBody, dumps
+from app.core.http_cache import cache_headers, make_etag, matching_etag, not_modified
+from app.services.catalogue_snapshot import CatalogueSnapshot, catalogue_snapshot
+from app.services.course_index import paginate
+from app.crud.crud_course import CourseCursor
+from app.crud.crud_department_courses import SemesterPlan
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-@router.get("/departments", response_model=List[Department])
-async def get_departments() -> List[Department]:
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+DEFAULT_SEARCH_RESULTS = 20
+MAX_SEARCH_RESULTS = 50
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+_EMPTY_LIST = EncodedBody(b"[]")
+
+
+def _encode_cursor(cursor: CourseCursor) -> str:
+    """Turns a page position into an opaque, URL-safe token."""
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode()).decode()
+
+
+def _decode_cursor(token: str) -> CourseCursor:
+    try:
+        course_code, doc_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if not isinstance(course_code, str) or not isinstance(doc_id, str):
+            raise ValueError
+        return course_code, doc_id
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parses a comma separated `fields=` projection, rejecting unknown Course fields."""
+    if fields is None:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in Course.model_fields]
+    if not requested or unknown:
+        raise HTTPException(status_code=400, detail=f"Invalid fields: {', '.join(unknown) or fields}")
+    return requested
+
+
+def _project(courses: List[Course], fields: List[str]) -> List[Dict[str, Any]]:
+    include = set(fields)
+    return [course.model_dump(mode="json", include=include) for course in courses]
+
+
+# The catalogue endpoints return the snapshot's pre-encoded JSON as raw
+# responses: the response_model is documentation only, nothing is validated
+# or serialized per request. Every response carries an ETag and a 304 is
+# returned when the client's copy is current.
+def _encoded_response(request: Request, body: EncodedBody) -> Response:
+    return body.response(request.headers.get("accept-encoding"), request.headers.get("if-none-match"))
+
+
+def _built_response(
+    request: Request,
+    snapshot: CatalogueSnapshot,
+    build: Callable[[], bytes],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
     """
-    Retrieves all available supported departments as a list of Department objects
+    Response for a body built per request (a filtered, paged, projected or
+    searched list). Its ETag comes from the catalogue version and the query,
+    so a 304 skips building the body. These go out uncompressed and are left
+    to the compression middleware.
     """
-    collection_name = "departments"
+    tag = make_etag(snapshot.version, request.url.query)
+    matched = matching_etag(request.headers.get("if-none-match"), tag)
+    if matched is not None:
+        return not_modified(matched, headers)
+    return Response(content=build(), media_type=JSON_MEDIA_TYPE, headers={**(headers or {}), **cache_headers(tag)})
+
+
+async def _get_snapshot(db: "AsyncClient", action: str) -> CatalogueSnapshot:
+    """The current catalogue snapshot; fails the request only if none could ever be loaded."""
     try:
-        docs = db.collection(collection_name).stream()
-        results = []
-        for doc in docs:
-            doc_data = doc.to_dict()
-            try:
-                department = Department(
-                    id=doc.id,
-                    name=doc_data.get('name', doc.id),  # Fallback to doc.id if name not present
-                    code=doc_data.get('code'),
-                    description=doc_data.get('description')
-                )
-                results.append(department)
-            except ValidationError as ve:
-                print(f"Validation error for document {doc.id}: {ve}")
-                continue
-                
-        return results
+        return await catalogue_snapshot.get(db)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve departments: {e}")
+        logger.exception("Failed to load the catalogue snapshot")
+        raise HTTPException(status_code=500, detail=f"Failed to {action}: {e}")
+
+
+@router.get("/departments", response_model=List[Department])
+async def get_departments(request: Request, db: "AsyncClient" = Depends(get_db)) -> Response:
+    """
+    Retrieves all available supported departments as a list of Department objects
+    """
+    snapshot = await _get_snapshot(db, "retrieve departments")
+    return _encoded_response(request, snapshot.departments_body)
 
 
 @router.get("/courses/", response_model=List[Course])
-async def get_courses() -> List[Course]:
+async def get_courses(
+    request: Request,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    course_type: Optional[Literal["Theory", "Lab"]] = None,
+    slot: Optional[str] = None,
+    code_prefix: Optional[str] = Query(default=None, min_length=1),
+    department: Optional[str] = Query(default=None, pattern=r"^[A-Z]{2}$"),
+    db: "AsyncClient" = Depends(get_db),
+) -> Response:
     """
-    Retrieves all running courses for the current sem
+    Retrieves all running courses for the current sem.
+
+    Pass `limit` (and the `X-Next-Cursor` header of the previous page as `cursor`)
+    to page through the catalogue ordered by course code, and `fields` (for
+    example `course_code,slot`) to return only those fields of each course.
+    `course_type`, `slot`, `code_prefix` and `department` filter the courses.
+    Everything is served from the in-memory catalogue snapshot.
     """
-    collection_name = "courses"
-    try:
-        docs = db.collection(collection_name).stream()
-        results: list[Course] = []
-        for doc in docs:
-            data: Dict[str, Any] = (doc.to_dict() or {})
-            try:
-                course = Course(id=doc.id, **data) if 'id' in Course.model_fields else Course(**data)
-                results.append(course)
-            except ValidationError as ve:
-                print(f"Validation error for document {doc.id}: {ve}")
-                continue
-        return results
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve courses for department: {e}")
+    projection = _parse_fields(fields)
+    start_after = _decode_cursor(cursor) if cursor is not None else None
+    next_cursor: Optional[CourseCursor] = None
+    filters = dict(course_type=course_type, slot=slot, code_prefix=code_prefix, department=department)
+    filtered = any(value is not None for value in filters.values())
+    paged = limit is not None or start_after is not None
+    snapshot = await _get_snapshot(db, "retrieve courses")
+    if not (filtered or paged or projection):
+        return _encoded_response(request, snapshot.courses_body)
+
+    courses = snapshot.course_index.filter(**filters) if filtered else snapshot.courses
+    if paged:
+        courses, next_cursor = paginate(courses, limit or DEFAULT_PAGE_SIZE, start_after)
+
+    headers = {NEXT_CURSOR_HEADER: _encode_cursor(next_cursor)} if next_cursor else {}
+    if projection is not None:
+        return _built_response(request, snapshot, lambda: dumps(_project(courses, projection)), headers)
+    return _built_response(request, snapshot, lambda: snapshot.courses_json(courses), headers)
+
+
+@router.get("/courses/search", response_model=List[Course])
+async def search_courses(
+    request: Request,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=DEFAULT_SEARCH_RESULTS, ge=1, le=MAX_SEARCH_RESULTS),
+    db: "AsyncClient" = Depends(get_db),
+) -> Response:
+    """
+    Searches courses by code ("EE 2", "cs101") or by words of their name
+    ("thermo"), best matches first.
+    """
+    snapshot = await _get_snapshot(db, "search courses")
+    return _built_response(request, snapshot, lambda: snapshot.courses_json(snapshot.search_index.search(q, limit)))
+
+
+@router.post("/courses/batch", response_model=CourseBatchResponse)
+async def get_courses_batch(payload: CourseBatchRequest, db: "AsyncClient" = Depends(get_db)) -> Response:
+    """
+    Resolves course codes (for example a semester plan) to full course
+    records from an in-memory code index, so a semester view doesn't need
+    the whole catalogue. Codes may be in any allowed format ("AE 103", "ae103").
+    """
+    snapshot = await _get_snapshot(db, "retrieve courses")
+    courses, missing = snapshot.course_index.lookup(payload.codes)
+    body = b'{"courses":' + snapshot.courses_json(courses) + b',"missing":' + dumps(missing) + b"}"
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
+
+def _department_name(snapshot: CatalogueSnapshot, department_code: str) -> str:
+    department_name = snapshot.department_index.get(department_code)
+    if department_name is None:
+        raise HTTPException(status_code=400, detail="Invalid department code")
+    return department_name
+
 
 @router.get("/courses/{department_code}/{semester}", response_model=List[str])
-async def get_courses_for_department(department_code: str, semester: int) -> List[str] | str:
+async def get_courses_for_department(request: Request, department_code: str, semester: int, db: "AsyncClient" = Depends(get_db)) -> Response:
     """Returns the core courses running for the given department"""
     if semester < 1 or semester > 8:
         raise HTTPException(status_code=400, detail="Invalid semester")
-    
-    available_departments = await get_departments()
-    for department in available_departments:
-        if department.code == department_code:
-            doc_ref = db.collection('department_courses').document(department.name)
-            doc = (doc_ref.get()).to_dict()
-            if doc:
-                courses = doc.get(str(semester), [])
-                return courses 
-            else:
-                raise HTTPException(status_code=404, detail=f"No courses found for department: {department_code} in semester {semester}")
-    
-    raise HTTPException(status_code=400, detail="Invalid department code")
-    
-async def get_all_department_data():
-    """Fetches all data from the department_courses collection."""
-    all_department_courses = {}
-    try:
-        docs = db.collection('department_courses').stream()
-                
-        for doc in docs:
-            # doc.id is the department name (e.g., "Civil Engineering")
-            all_department_courses[doc.id] = doc.to_dict()
-        
-        print(f"✅ Successfully fetched {len(all_department_courses)} departments.")
-        return all_department_courses
-    except Exception as e:
-        print(f"🔥 An error occurred: {e}")
-        return None
 
-# async def print_available_departments():
-#     available_departments = await get_departments()
-#     print(f"Available Departments: {(available_departments[0]).name}")
-    
-# if __name__ == "__main__":
-    # asyncio.run(print_available_departments())
-    # pass
\ No newline at end of file
+    snapshot = await _get_snapshot(db, "retrieve department courses")
+    department_name = _department_name(snapshot, department_code)
+    if not snapshot.department_courses.get(department_name):
+        raise HTTPException(status_code=404, detail=f"No courses found for department: {department_code} in semester {semester}")
+    body = snapshot.semester_bodies.get((department_name, str(semester)), _EMPTY_LIST)
+    return _encoded_response(request, body)
+
+
+@router.get("/departments/{department_code}/plan", response_model=SemesterPlan)
+async def get_department_plan(request: Request, department_code: str, db: "AsyncClient" = Depends(get_db)) -> Response:
+    """Returns the core courses of every semester for the given department, keyed by semester"""
+    snapshot = await _get_snapshot(db, "retrieve department plan")
+    department_name = _department_name(snapshot, department_code)
+    body = snapshot.plan_bodies.get(department_name)
+    if body is None:
+        raise HTTPException(status_code=404, detail=f"No courses found for department: {department_code}")
+    return _encoded_response(request, body)
+
+
+@router.get("/department-courses", response_model=Dict[str, SemesterPlan])
+async def get_all_department_courses(request: Request, db: "AsyncClient" = Depends(get_db)) -> Response:
+    """Returns the semester plans of every department, keyed by department name"""
+    snapshot = await _get_snapshot(db, "retrieve department courses")
+    return _encoded_response(request, snapshot.department_courses_body)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException
+from app.api.v1.schemas import TimetableCheckRequest, TimetableCheckResponse, TimetableClash
+from app.services.timetable import find_clashes
+
+router = APIRouter()
+
+@router.post("/timetable/check", response_model=TimetableCheckResponse)
+async def check_timetable(request: TimetableCheckRequest) -> TimetableCheckResponse:
+    """
+    Checks whether the chosen courses clash, and which pairs do.
+    Works purely on the slots in the request, so it needs no database reads.
+    """
+    entries = request.courses
+    try:
+        pairs = find_clashes([entry.slot for entry in entries])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    clashes = [TimetableClash(first=entries[i], second=entries[j]) for i, j in pairs]
+    return TimetableCheckResponse(has_clash=bool(clashes), clashes=clashes)
@@ -1,5 +1,9 @@
 from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List, Literal
+from app.core.slots import check_slot
+
+# The course code formats in use: "AB 123", "ABC123" and "AB1234"
+COURSE_CODE_PATTERN = r"^(?:[A-Z]{2} \d{3}|[A-Z]{3}\d{3}|[A-Z]{2}\d{4})$"
 
 class Department(BaseModel):
     """Department model for representing department data"""
@@ -18,31 +22,57 @@ class Course(BaseModel):
     """Course model for representing course data"""
     id: str
     course_name: str
-    course_code: str = Field(pattern=r"^(?:[A-Z]{2} \d{3}|[A-Z]{3}\d{3}|[A-Z]{2}\d{4})$")
+    course_code: str = Field(pattern=COURSE_CODE_PATTERN)
     course_type: Literal["Theory", "Lab"]
     slot: str
     
     @model_validator(mode='after')
     def validate_slot_for_course_type(self):
-        """Validate that slot matches the course type requirements"""
-        course_type = self.course_type
-        slot = self.slot
-        
-        if course_type == "Theory":
-            # Theory courses: slots 1-14
-            if not (slot.isdigit() and 1 <= int(slot) <= 15):
-                raise ValueError(f"Theory courses must have slots 1-15, got '{slot}'")
-        elif course_type == "Lab":
-            # Lab courses: slots L1-L6
-            if not (slot.startswith('L') and len(slot) == 2 and 
-                    slot[1].isdigit() and 1 <= int(slot[1]) <= 6):
-                raise ValueError(f"Lab courses must have slots L1-L6, got '{slot}'")
-        
+        """Validate that slot matches the course type requirements, storing its canonical id"""
+        canonical = check_slot(self.course_type, self.slot)
+        if canonical != self.slot:
+            self.slot = canonical
         return self
 
 class CourseCreate(BaseModel):
     """Course creation model"""
     course_name: str
+    course_code: str = Field(pattern=COURSE_CODE_PATTERN)
+    course_type: Literal["Theory", "Lab"]
+    slot: str
+
+    @model_validator(mode='after')
+    def validate_slot_for_course_type(self):
+        """Validate that slot matches the course type requirements, storing its canonical id"""
+        canonical = check_slot(self.course_type, self.slot)
+        if canonical != self.slot:
+            self.slot = canonical
+        return self
+
+class CourseBatchRequest(BaseModel):
+    """Course codes to resolve to full course records, in any allowed format ("AE 103", "ae103")"""
+    codes: List[str] = Field(min_length=1, max_length=200)
+
+class CourseBatchResponse(BaseModel):
+    """The courses matching the requested codes, and the codes that matched none"""
+    courses: List[Course]
+    missing: List[str]
+
+class TimetableEntry(BaseModel):
+    """A chosen course and the slot it runs in"""
     course_code: str
-    course_type: str
-    slot: str
\ No newline at end of file
+    slot: str
+
+class TimetableCheckRequest(BaseModel):
+    """A set of courses a student wants to take together"""
+    courses: List[TimetableEntry] = Field(min_length=1, max_length=30)
+
+class TimetableClash(BaseModel):
+    """Two chosen courses whose slots overlap"""
+    first: TimetableEntry
+    second: TimetableEntry
+
+class TimetableCheckResponse(BaseModel):
+    """Result of a timetable clash check"""
+    has_clash: bool
+    clashes: List[TimetableClash]
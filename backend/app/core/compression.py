@@ -0,0 +1,151 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import encoding
+from app.core.encoding import GZIP_LEVEL, MIN_COMPRESS_SIZE, choose_encoding
+
+# Bodies compressed per request trade density for speed; the precompressed
+# catalogue bodies use encoding.BROTLI_QUALITY instead
+DYNAMIC_BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+class _Compressor:
+    """Incremental gzip or brotli compressor with one interface."""
+
+    def __init__(self, coding: str):
+        if coding == "br":
+            self._brotli = encoding.brotli.Compressor(quality=DYNAMIC_BROTLI_QUALITY)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits=31 writes a gzip header and trailer
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data) if self._brotli is not None else self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.finish() if self._brotli is not None else self._zlib.flush()
+
+
+def _tag_for_coding(etag: str, coding: str) -> str:
+    """A strong ETag names one representation, so the compressed body gets its own."""
+    if etag.startswith('"') and etag.endswith('"'):
+        return f'{etag[:-1]}-{coding}"'
+    return etag
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with gzip or brotli, whichever the client prefers.
+
+    Responses that already carry a Content-Encoding (the precompressed
+    catalogue bodies) pass through untouched, as do bodies under
+    `minimum_size` bytes, non-text content types, and bodiless responses
+    such as 304s. Streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MIN_COMPRESS_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        await _CompressingResponder(self.app, coding, self.minimum_size, if_none_match)(scope, receive, send)
+
+
+class _CompressingResponder:
+    def __init__(self, app: ASGIApp, coding: str, minimum_size: int, if_none_match: Optional[str]):
+        self.app = app
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.if_none_match = if_none_match or ""
+        self.send: Send
+        self.start_message: Optional[Message] = None
+        # None until the first body chunk decides whether to compress
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _should_compress(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers or message["status"] in (204, 304):
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = not self._should_compress(message)
+            if self.passthrough:
+                await self.send(self._revalidated_start(message) if message["status"] == 304 else message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.coding)
+            if not more_body:
+                # The whole body is here, so its compressed length is known
+                compressed = self.compressor.compress(body) + self.compressor.flush()
+                await self.send(self._compressed_start(len(compressed)))
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(self._compressed_start(None))
+
+        compressed = self.compressor.compress(body)
+        if not more_body:
+            compressed += self.compressor.flush()
+        if compressed or not more_body:
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _revalidated_start(self, message: Message) -> Message:
+        """
+        A 304 must carry the ETag of the representation the client holds: if
+        it revalidated the copy this middleware compressed, that is the tagged one.
+        """
+        headers = MutableHeaders(raw=list(message["headers"]))
+        if "etag" in headers:
+            compressed_tag = _tag_for_coding(headers["etag"], self.coding)
+            if compressed_tag in self.if_none_match:
+                headers["ETag"] = compressed_tag
+        return {**message, "headers": headers.raw}
+
+    def _compressed_start(self, content_length: Optional[int]) -> Message:
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["ETag"] = _tag_for_coding(headers["etag"], self.coding)
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
+        elif "content-length" in headers:
+            # A streamed body's compressed length is unknown up front, so it goes out chunked
+            del headers["content-length"]
+        return {**self.start_message, "headers": headers.raw}
@@ -8,9 +8,37 @@ class Config:
         self.SERVICE_ACCOUNT_KEY_PATH = os.getenv("SERVICE_ACCOUNT_KEY_PATH")
         self.FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
 
+        # "firestore", or "memory" for an in-process stand-in seeded from the
+        # catalogue artifact (no service account needed; its writes last as long as the process)
+        self.STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore")
+        # Artifact the memory backend starts from, by default CATALOGUE_ARTIFACT_PATH or the scrapers' output
+        self.MEMORY_SEED_PATH = os.getenv("MEMORY_SEED_PATH")
+        # Simulated round trip of every memory backend call: a fixed delay plus
+        # jitter drawn from a seeded generator, so load tests are repeatable
+        self.MEMORY_LATENCY_MS = float(os.getenv("MEMORY_LATENCY_MS", "0"))
+        self.MEMORY_JITTER_MS = float(os.getenv("MEMORY_JITTER_MS", "0"))
+        self.MEMORY_LATENCY_SEED = int(os.getenv("MEMORY_LATENCY_SEED", "0"))
+
+        # How often the API reloads its in-memory catalogue snapshot; an older
+        # snapshot is still served (and refreshed in the background) if Firestore is slow or down
+        self.CATALOGUE_REFRESH_SECONDS = float(os.getenv("CATALOGUE_REFRESH_SECONDS", "300"))
+
+        # max-age clients and CDNs may reuse a catalogue response for before
+        # revalidating it with its ETag (a 304 when nothing changed)
+        self.CATALOGUE_MAX_AGE_SECONDS = int(os.getenv("CATALOGUE_MAX_AGE_SECONDS", "3600"))
+
+        # Serve the catalogue from a scraped catalogue artifact instead of
+        # Firestore (which is then not needed at all), e.g. for local development
+        self.CATALOGUE_ARTIFACT_PATH = os.getenv("CATALOGUE_ARTIFACT_PATH")
+
+        # Shared secret for internal endpoints such as cache invalidation
+        self.ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+        # Where the uploaders can reach the running API to invalidate its cache
+        self.API_BASE_URL = os.getenv("API_BASE_URL")
+
 config= Config()
 
 #validator
 #cleaner
 #read files
-#upload files
\ No newline at end of file
+#upload files
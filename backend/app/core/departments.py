@@ -0,0 +1,47 @@
+"""
+Static department mappings shared by the API and the scrapers.
+
+Kept free of heavy imports so the API can use them without pulling in the
+scraping stack (pandas, BeautifulSoup, lxml).
+"""
+
+departments_names_to_codes = {
+    "Chemical Engineering": "CL", 
+    "Aerospace Engineering": "AE",
+    "Civil Engineering": "CE",
+    "Computer Science and Engineering": "CS",
+    "Electrical Engineering": "EE",
+    "Energy Science and Engineering": "EN",
+    "Engineering Physics": "EP",
+    "Metallurgical Engineering and Materials Science": "MM",
+    # "Physics": "PH",
+    "Environmental Science and Engineering":"ES",
+    "Mechanical Engineering":"ME",
+    "Industrial Engineering and Operations Research":"IE",
+    "Economics":"EC",
+    "Chemistry":"CH",
+    "Mathematics":"MA"
+}
+
+departments_to_skip = ["Physics", "Humanities and Social Sciences", "Centre for Liberal Education (CLEdu)"]
+
+departments_names_to_divisions={
+    "Chemical Engineering": "D4", 
+    "Aerospace Engineering": "D2",
+    "Civil Engineering": "D2",
+    "Computer Science and Engineering": "D3",
+    "Electrical Engineering": "D4",
+    "Energy Science and Engineering": "D1",
+    "Engineering Physics": "D2",
+    "Metallurgical Engineering and Materials Science": "D3",
+    # "Physics": "PH",
+    "Environmental Science and Engineering":"D1",
+    "Mechanical Engineering":"D1",
+    "Industrial Engineering and Operations Research":"D2",
+    "Economics":"D3",
+    "Chemistry":"D1",
+    "Mathematics":"D1"
+}
+
+# Branches whose course pages are scraped into the catalogue artifact (its department column)
+department_branches = ["chemical", "electrical", "metallurgy", "civil", "computer_science", "aerospace", "economics", "energy", "digital_health", "data_science", "ent", "ieor", "environmental", "math", "mechanical", "physics", "chemistry", "biology", "climate_studies", "educational_tech", "gnr", "earth_sciences", "humanities", "idc", "management", "syscon", "policy_studies", "technology_alternatives", "liberal_education"]
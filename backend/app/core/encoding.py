@@ -0,0 +1,139 @@
+import gzip
+import json
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from fastapi import Response
+
+from app.core.http_cache import cache_headers, make_etag, matching_etag, not_modified
+
+# Both optional (the `speedups` extra): without orjson the stdlib encoder
+# produces the same bytes more slowly, without brotli only gzip is offered.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Below this size compression costs more than the bytes it saves
+MIN_COMPRESS_SIZE = 500
+GZIP_LEVEL = 6
+# Catalogue bodies are compressed once per snapshot, so a slow, dense setting pays off
+BROTLI_QUALITY = 11
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, the same bytes FastAPI's JSONResponse would send."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def join_json_array(items: Iterable[bytes]) -> bytes:
+    """Builds a JSON array from already encoded elements."""
+    return b"[" + b",".join(items) + b"]"
+
+
+def available_encodings() -> tuple:
+    """Content codings the server can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Maps each coding of an Accept-Encoding header to its q-value."""
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """The best coding the client accepts (q > 0), or None for an uncompressed body."""
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in available_encodings():
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if coding == "gzip":
+        # mtime=0 keeps the output, and so anything derived from it, stable across processes
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content coding: {coding}")
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """
+    A serialized JSON body and its compressed variants. Each variant is
+    computed the first time a client asks for it and then reused for as long
+    as the body lives, so serving it again costs no CPU.
+    """
+    identity: bytes
+
+    @classmethod
+    def from_content(cls, content: Any) -> "EncodedBody":
+        return cls(dumps(content))
+
+    @cached_property
+    def etag(self) -> str:
+        return make_etag(self.identity)
+
+    @cached_property
+    def gzip(self) -> bytes:
+        return compress(self.identity, "gzip")
+
+    @cached_property
+    def br(self) -> bytes:
+        return compress(self.identity, "br")
+
+    def variant(self, coding: Optional[str]) -> bytes:
+        if coding is None:
+            return self.identity
+        return self.gzip if coding == "gzip" else self.br
+
+    def response(
+        self,
+        accept_encoding: Optional[str],
+        if_none_match: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        """
+        A raw Response with the best variant for the client's Accept-Encoding,
+        or a 304 if the client already has this body (If-None-Match).
+        """
+        coding = choose_encoding(accept_encoding) if len(self.identity) >= MIN_COMPRESS_SIZE else None
+        response_headers = {"Vary": "Accept-Encoding", **(headers or {})}
+        matched = matching_etag(if_none_match, self.etag, coding)
+        if matched is not None:
+            return not_modified(matched, response_headers)
+        if coding is not None:
+            response_headers["Content-Encoding"] = coding
+        return Response(
+            content=self.variant(coding),
+            media_type=JSON_MEDIA_TYPE,
+            headers={**response_headers, **cache_headers(self.etag, coding)},
+        )
@@ -0,0 +1,64 @@
+import hashlib
+from typing import Dict, Optional, Union
+
+from fastapi import Response
+
+from app.core.config import config
+
+# Content codings a representation can be served in, each with its own ETag
+CONTENT_CODINGS = ("br", "gzip")
+
+
+def make_etag(*parts: Union[bytes, str]) -> str:
+    """Opaque validator derived from the content it describes."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        # Separator so ("ab", "c") and ("a", "bc") differ
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def format_etag(tag: str, coding: Optional[str] = None) -> str:
+    """
+    The quoted, strong ETag of one representation. A compressed body is a
+    different representation, so it gets its own tag, e.g. "abc-gzip".
+    """
+    return f'"{tag}-{coding}"' if coding else f'"{tag}"'
+
+
+def matching_etag(if_none_match: Optional[str], tag: str, coding: Optional[str] = None) -> Optional[str]:
+    """
+    The ETag of the representation of `tag` an If-None-Match header names, in
+    whichever content coding the client holds it, or None if it names none.
+    A 304 must echo this ETag rather than the one for the coding negotiated
+    now, or the client would store a tag that doesn't describe its body.
+    If-None-Match uses weak comparison, so W/ prefixes are ignored; "*"
+    matches the representation in `coding`.
+    """
+    if not if_none_match:
+        return None
+    variants = {tag: None, **{f"{tag}-{variant}": variant for variant in CONTENT_CODINGS}}
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return format_etag(tag, coding)
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') in variants:
+            return format_etag(tag, variants[candidate.strip('"')])
+    return None
+
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={config.CATALOGUE_MAX_AGE_SECONDS}"}
+
+
+def cache_headers(tag: str, coding: Optional[str] = None) -> Dict[str, str]:
+    """Validator and freshness headers for a catalogue response."""
+    return _cache_headers(format_etag(tag, coding))
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """A bodiless 304 with the caching headers of the full response and the ETag from matching_etag."""
+    return Response(status_code=304, headers={**(headers or {}), **_cache_headers(etag)})
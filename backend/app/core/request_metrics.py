@@ -0,0 +1,55 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import http_request_duration, http_requests, http_requests_in_flight, http_response_size
+
+
+def _route_label(scope: Scope) -> str:
+    """
+    The matched route's full path template ("/api/v1/courses/{department_code}/{semester}"),
+    so label values stay bounded. Routes of a mounted app are under the mount's root_path.
+    """
+    template = getattr(scope.get("route"), "path_format", None)
+    if template is None:
+        return "unmatched"
+    return scope.get("root_path", "") + template
+
+
+class RequestMetricsMiddleware:
+    """
+    Records per-route request counts, latency and response size, and the
+    number of requests in flight. Install it outermost so the sizes are the
+    bytes that actually go on the wire, after compression.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_measured(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_measured)
+        finally:
+            http_requests_in_flight.dec()
+            route = _route_label(scope)
+            method = scope["method"]
+            http_requests.inc(method=method, route=route, status=str(status))
+            http_request_duration.observe(time.perf_counter() - start, method=method, route=route)
+            http_response_size.observe(size, method=method, route=route)
@@ -0,0 +1,65 @@
+"""
+Which slots each course type may run in, shared by the API schemas, the
+scrapers and the bulk validation of uploads.
+
+Every legal (course type, slot spelling) pair is precomputed into one frozen
+table mapping it to the canonical slot id, so checking a course is a single
+dict lookup instead of string parsing.
+"""
+import re
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional, Tuple
+
+# Canonical slot ids, the keys of the timetable's SLOT_MEETINGS
+THEORY_SLOTS: Tuple[str, ...] = tuple(str(slot) for slot in range(1, 16))
+LAB_SLOTS: Tuple[str, ...] = tuple(f"L{slot}" for slot in range(1, 7))
+ALL_SLOTS: Tuple[str, ...] = THEORY_SLOTS + LAB_SLOTS
+
+COURSE_TYPE_SLOTS: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    "Theory": frozenset(THEORY_SLOTS),
+    "Lab": frozenset(LAB_SLOTS),
+})
+COURSE_TYPES: Tuple[str, ...] = tuple(COURSE_TYPE_SLOTS)
+
+# Every accepted spelling -> canonical id. Theory slots may be zero padded ("07").
+LEGAL_SLOTS: Mapping[Tuple[str, str], str] = MappingProxyType({
+    **{("Theory", spelling): slot for slot in THEORY_SLOTS for spelling in {slot, slot.zfill(2)}},
+    **{("Lab", slot): slot for slot in LAB_SLOTS},
+})
+
+SLOT_RULES: Mapping[str, str] = MappingProxyType({
+    "Theory": f"slots {THEORY_SLOTS[0]}-{THEORY_SLOTS[-1]}",
+    "Lab": f"slots {LAB_SLOTS[0]}-{LAB_SLOTS[-1]}",
+})
+
+# The first lab slot mentioned in a free text slot cell ("L3, Tue 2pm")
+_LAB_SLOT_IN_TEXT = re.compile("|".join(sorted(LAB_SLOTS, key=len, reverse=True)))
+
+
+def canonical_slot(course_type: str, slot: str) -> Optional[str]:
+    """The canonical id of `slot` if a `course_type` course may run in it, else None."""
+    return LEGAL_SLOTS.get((course_type, slot))
+
+
+def is_legal_slot(course_type: str, slot: str) -> bool:
+    return (course_type, slot) in LEGAL_SLOTS
+
+
+def check_slot(course_type: str, slot: str) -> str:
+    """
+    The canonical id of `slot`, raising ValueError (which pydantic reports as
+    a validation error) if a `course_type` course can't run in it.
+    """
+    canonical = LEGAL_SLOTS.get((course_type, slot))
+    if canonical is None:
+        rule = SLOT_RULES.get(course_type)
+        if rule is None:
+            raise ValueError(f"Unknown course type '{course_type}'")
+        raise ValueError(f"{course_type} courses must have {rule}, got '{slot}'")
+    return canonical
+
+
+def find_lab_slot(text: str) -> Optional[str]:
+    """The first lab slot mentioned anywhere in `text`, or None."""
+    match = _LAB_SLOT_IN_TEXT.search(text)
+    return match.group(0) if match else None
@@ -0,0 +1,5 @@
+from .crud_course import course
+from .crud_department import department
+from .crud_department_courses import department_courses
+
+__all__ = ["course", "department", "department_courses"]
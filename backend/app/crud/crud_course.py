@@ -1,8 +1,49 @@
-from app.db.session import db
+import logging
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Tuple
+from pydantic import ValidationError
+from app.api.v1.schemas import Course
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+
+# (course_code, document id) of the last course on a page, the position the next page starts after
+CourseCursor = Tuple[str, str]
+
+
+class CRUDCourse:
+    """Async access to the courses collection"""
+
+    collection_name = "courses"
+
+    async def get_all(self, db: "AsyncClient") -> List[Course]:
+        """Streams every course document, skipping the ones that fail validation."""
+        results: List[Course] = []
+        async for doc in db.collection(self.collection_name).stream():
+            course = self._validate(doc)
+            if course is not None:
+                results.append(course)
+        return results
+
+    @staticmethod
+    def _validate(doc) -> Optional[Course]:
+        data: Dict[str, Any] = (doc.to_dict() or {})
+        try:
+            return Course(**{**data, "id": doc.id})
+        except ValidationError as ve:
+            logger.warning("Validation error for document %s: %s", doc.id, ve)
+            return None
+
+
+course = CRUDCourse()
 
 if __name__ == "__main__":
-    courses = db.collection("courses").get()
-    for course in courses:
-        print(course.to_dict())
-        break
-    print("Total courses:", len(courses))
\ No newline at end of file
+    import asyncio
+    from app.db.session import get_async_client
+
+    courses = asyncio.run(course.get_all(get_async_client()))
+    if courses:
+        print(courses[0])
+    print("Total courses:", len(courses))
@@ -0,0 +1,35 @@
+import logging
+from typing import List, TYPE_CHECKING
+from pydantic import ValidationError
+from app.api.v1.schemas import Department
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+
+class CRUDDepartment:
+    """Async access to the departments collection"""
+
+    collection_name = "departments"
+
+    async def get_all(self, db: "AsyncClient") -> List[Department]:
+        """Streams every department document, skipping the ones that fail validation."""
+        results: List[Department] = []
+        async for doc in db.collection(self.collection_name).stream():
+            doc_data = doc.to_dict() or {}
+            try:
+                results.append(Department(
+                    id=doc.id,
+                    name=doc_data.get('name', doc.id),  # Fallback to doc.id if name not present
+                    code=doc_data.get('code'),
+                    description=doc_data.get('description')
+                ))
+            except ValidationError as ve:
+                logger.warning("Validation error for document %s: %s", doc.id, ve)
+                continue
+        return results
+
+
+department = CRUDDepartment()
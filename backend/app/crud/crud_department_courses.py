@@ -0,0 +1,24 @@
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
+
+# Semester number (as a string, e.g. "3") -> course codes
+SemesterPlan = Dict[str, List[str]]
+
+
+class CRUDDepartmentCourses:
+    """Async access to the department_courses collection, keyed by department name"""
+
+    collection_name = "department_courses"
+
+    async def get_all(self, db: "AsyncClient") -> Dict[str, SemesterPlan]:
+        """Reads the semester plans of every department."""
+        results: Dict[str, SemesterPlan] = {}
+        async for doc in db.collection(self.collection_name).stream():
+            # doc.id is the department name (e.g., "Civil Engineering")
+            results[doc.id] = doc.to_dict() or {}
+        return results
+
+
+department_courses = CRUDDepartmentCourses()
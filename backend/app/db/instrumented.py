@@ -0,0 +1,94 @@
+import time
+from typing import Any, AsyncIterator
+
+from app.core.metrics import firestore_call_duration, firestore_calls, firestore_documents
+
+
+class InstrumentedAsyncClient:
+    """
+    Wraps the async Firestore client to count and time every document read
+    and collection stream, and the documents they return. Anything not
+    wrapped here passes straight through to the real client.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def collection(self, name: str) -> "InstrumentedQuery":
+        return InstrumentedQuery(self._client.collection(name), name)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._client, attribute)
+
+
+class InstrumentedQuery:
+    """A collection or query; refinements return instrumented queries too."""
+
+    def __init__(self, query: Any, collection: str):
+        self._query = query
+        self._collection = collection
+
+    def _wrap(self, query: Any) -> "InstrumentedQuery":
+        return InstrumentedQuery(query, self._collection)
+
+    def where(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._wrap(self._query.where(*args, **kwargs))
+
+    def order_by(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._wrap(self._query.order_by(*args, **kwargs))
+
+    def start_after(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._wrap(self._query.start_after(*args, **kwargs))
+
+    def limit(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._wrap(self._query.limit(*args, **kwargs))
+
+    def select(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._wrap(self._query.select(*args, **kwargs))
+
+    def document(self, *args, **kwargs) -> "InstrumentedDocument":
+        return InstrumentedDocument(self._query.document(*args, **kwargs), self._collection)
+
+    async def stream(self, *args, **kwargs) -> AsyncIterator[Any]:
+        """Streams the documents, timing the whole stream and counting what it returned."""
+        start = time.perf_counter()
+        outcome = "ok"
+        count = 0
+        try:
+            async for doc in self._query.stream(*args, **kwargs):
+                count += 1
+                yield doc
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            firestore_calls.inc(operation="stream", collection=self._collection, outcome=outcome)
+            firestore_call_duration.observe(time.perf_counter() - start, operation="stream", collection=self._collection)
+            firestore_documents.inc(count, collection=self._collection)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._query, attribute)
+
+
+class InstrumentedDocument:
+    def __init__(self, reference: Any, collection: str):
+        self._reference = reference
+        self._collection = collection
+
+    async def get(self, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            snapshot = await self._reference.get(*args, **kwargs)
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            firestore_calls.inc(operation="get", collection=self._collection, outcome=outcome)
+            firestore_call_duration.observe(time.perf_counter() - start, operation="get", collection=self._collection)
+        if snapshot.exists:
+            firestore_documents.inc(collection=self._collection)
+        return snapshot
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._reference, attribute)
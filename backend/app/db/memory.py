@@ -0,0 +1,229 @@
+"""
+In-memory stand-ins for the Firestore clients, covering what the API and the
+uploaders use: collections, document reads, (ordered, paged) streams and
+write batches. Selected with STORAGE_BACKEND=memory to run everything without
+a service account, and used by the tests and benchmarks.
+
+Every call can wait out a simulated round-trip latency, a fixed delay plus
+seeded jitter, so load tests are repeatable and measure our code rather than
+the network. Tests can also have the calls recorded and commits fail.
+"""
+import asyncio
+import itertools
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+Collections = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+class Latency:
+    """A fixed delay plus uniform jitter drawn from a seeded generator, so the same seed replays the same delays."""
+
+    def __init__(self, seconds: float = 0.0, jitter_seconds: float = 0.0, seed: int = 0):
+        self.seconds = seconds
+        self.jitter_seconds = jitter_seconds
+        self._random = random.Random(seed)
+        # The uploaders' writer threads share one client
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.seconds or self.jitter_seconds)
+
+    def next(self) -> float:
+        if not self.jitter_seconds:
+            return self.seconds
+        with self._lock:
+            return self.seconds + self._random.uniform(0, self.jitter_seconds)
+
+
+class _Snapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict[str, Any]]):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class _Query:
+    def __init__(self, client, name: str, orders=(), start_after=None, limit=None):
+        self._client = client
+        self._name = name
+        self._orders = orders
+        self._start_after = start_after
+        self._limit = limit
+
+    def _copy(self, **changes) -> "_Query":
+        state = dict(orders=self._orders, start_after=self._start_after, limit=self._limit)
+        state.update(changes)
+        return type(self)(self._client, self._name, **state)
+
+    def order_by(self, field: str) -> "_Query":
+        return self._copy(orders=self._orders + (field,))
+
+    def start_after(self, values: Dict[str, Any]) -> "_Query":
+        return self._copy(start_after=tuple(values[field] for field in self._orders))
+
+    def limit(self, count: int) -> "_Query":
+        return self._copy(limit=count)
+
+    def _sort_key(self, doc_id: str, data: Dict[str, Any]):
+        return tuple(doc_id if field == "__name__" else data.get(field) for field in self._orders)
+
+    def _documents(self):
+        docs = list(self._client.collections.get(self._name, {}).items())
+        if self._orders:
+            docs.sort(key=lambda item: self._sort_key(*item))
+        if self._start_after is not None:
+            docs = [item for item in docs if self._sort_key(*item) > self._start_after]
+        if self._limit is not None:
+            docs = docs[:self._limit]
+        return [_Snapshot(doc_id, data) for doc_id, data in docs]
+
+    def document(self, doc_id: Optional[str] = None) -> "_DocumentRef":
+        return _DocumentRef(self._client, self._name, doc_id or f"auto{next(self._client.auto_ids)}")
+
+
+class _DocumentRef:
+    def __init__(self, client, collection: str, doc_id: str):
+        self._client = client
+        self._collection = collection
+        self.id = doc_id
+
+    def _read(self) -> _Snapshot:
+        self._client.record(self._client.reads, (self._collection, self.id))
+        return _Snapshot(self.id, self._client.collections.get(self._collection, {}).get(self.id))
+
+    def get(self):
+        if isinstance(self._client, MemoryAsyncFirestore):
+            return self._get_async()
+        self._client.wait()
+        return self._read()
+
+    async def _get_async(self) -> _Snapshot:
+        await self._client.wait()
+        return self._read()
+
+
+class _Batch:
+    def __init__(self, client: "MemoryFirestore"):
+        self._client = client
+        self._operations = []
+
+    def set(self, reference: _DocumentRef, data: Dict[str, Any]) -> None:
+        self._operations.append((reference, data))
+
+    def delete(self, reference: _DocumentRef) -> None:
+        self._operations.append((reference, None))
+
+    def commit(self) -> None:
+        self._client.wait()
+        if self._client.failures:
+            # All or nothing, like a Firestore batch
+            raise self._client.failures.pop(0)
+        for reference, data in self._operations:
+            collection = self._client.collections.setdefault(reference._collection, {})
+            if data is None:
+                collection.pop(reference.id, None)
+            else:
+                collection[reference.id] = dict(data)
+        self._client.record(self._client.commits, [
+            ("delete" if data is None else "set", reference.id, data) for reference, data in self._operations
+        ])
+
+
+class _SyncQuery(_Query):
+    def stream(self):
+        self._client.wait()
+        self._client.record(self._client.streams, self._name)
+        yield from self._documents()
+
+
+class _AsyncQuery(_Query):
+    async def stream(self):
+        await self._client.wait()
+        self._client.record(self._client.streams, self._name)
+        for snapshot in self._documents():
+            yield snapshot
+
+
+class _MemoryClient:
+    """
+    What both clients share: the collections, the simulated latency and, with
+    `record_calls`, a log of every document read, collection stream and
+    committed batch for tests to inspect (off by default, so a long running
+    server doesn't accumulate one).
+    """
+
+    def __init__(
+        self,
+        collections: Optional[Collections] = None,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        seed: int = 0,
+        record_calls: bool = False,
+    ):
+        self.collections: Collections = collections if collections is not None else {}
+        self.latency = Latency(latency_seconds, jitter_seconds, seed)
+        self.auto_ids = itertools.count()
+        self.record_calls = record_calls
+        # (collection, document id) of every document read
+        self.reads: List[Tuple[str, str]] = []
+        # Name of every collection streamed
+        self.streams: List[str] = []
+        # The (action, document id, data) operations of every committed batch
+        self.commits: List[List[Tuple[str, str, Optional[Dict[str, Any]]]]] = []
+
+    def record(self, log: List[Any], entry: Any) -> None:
+        if self.record_calls:
+            log.append(entry)
+
+
+class MemoryFirestore(_MemoryClient):
+    """
+    Blocking client, what the uploaders use: collections, streams and write
+    batches. `failures` are raised, in order, by the next batch commits.
+    """
+
+    def __init__(self, collections: Optional[Collections] = None, failures: Iterable[Exception] = (), **options):
+        super().__init__(collections, **options)
+        self.failures = list(failures)
+
+    def wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency.next())
+
+    def collection(self, name: str) -> _SyncQuery:
+        return _SyncQuery(self, name)
+
+    def batch(self) -> _Batch:
+        return _Batch(self)
+
+
+class MemoryAsyncFirestore(_MemoryClient):
+    """Non-blocking client, what the API uses: document reads and (ordered, paged) streams."""
+
+    async def wait(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency.next())
+
+    def collection(self, name: str) -> _AsyncQuery:
+        return _AsyncQuery(self, name)
+
+
+def artifact_collections(path: str) -> Collections:
+    """
+    The catalogue collections keyed by document id, as the uploaders would
+    write them from the catalogue artifact at `path` (invalid records skipped).
+    """
+    from app.services.catalogue_snapshot import read_artifact_catalogue
+
+    courses, departments, department_courses = read_artifact_catalogue(path)
+    return {
+        "courses": {course.id: course.model_dump(exclude={"id"}) for course in courses},
+        "departments": {department.id: department.model_dump(exclude={"id"}, exclude_none=True) for department in departments},
+        "department_courses": {name: dict(plan) for name, plan in department_courses.items()},
+    }
@@ -1,23 +1,118 @@
+import logging
 import os
-from firebase_admin import credentials, firestore, initialize_app
-from google.cloud.firestore_v1 import AsyncClient
+import threading
+from typing import TYPE_CHECKING
 from app.core.config import config
 
-service_account_key_path= config.SERVICE_ACCOUNT_KEY_PATH
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
+    from google.cloud.firestore_v1.client import Client
+    from app.db.memory import Collections
 
-if isinstance(service_account_key_path, str) and not os.path.exists(service_account_key_path):
-    raise FileNotFoundError(
-        f"Service account key file not found at: {service_account_key_path}\n"
-        "Please download it from Firebase Console > Project settings > Service accounts > Generate new private key."
-    )
+logger = logging.getLogger(__name__)
 
-try:
-    cred = credentials.Certificate(service_account_key_path)
-    initialize_app(cred)
-    # print("Firebase Admin SDK initialized successfully!")
-except Exception as e:
-    print(f"Error initializing Firebase Admin SDK: {e}")
-    # Handle more gracefully in production
-    exit(1)
+# "memory" swaps both clients for the in-process stand-ins of app.db.memory
+STORAGE_BACKENDS = ("firestore", "memory")
 
-db = firestore.client()
+# Nothing here runs at import time: the Firebase app and the clients are
+# created on first use (or from the API's lifespan hook) so importing the app
+# stays cheap and a missing key fails the first database call, not the import.
+_lock = threading.Lock()
+_app_initialized = False
+_client = None
+_async_client = None
+_memory_collections = None
+
+
+class DatabaseUnavailableError(RuntimeError):
+    """Raised when the Firebase Admin SDK cannot be initialized"""
+
+
+def _initialize_app() -> None:
+    global _app_initialized
+    if _app_initialized:
+        return
+
+    from firebase_admin import credentials, initialize_app
+
+    service_account_key_path= config.SERVICE_ACCOUNT_KEY_PATH
+
+    if isinstance(service_account_key_path, str) and not os.path.exists(service_account_key_path):
+        raise DatabaseUnavailableError(
+            f"Service account key file not found at: {service_account_key_path}\n"
+            "Please download it from Firebase Console > Project settings > Service accounts > Generate new private key."
+        )
+
+    try:
+        cred = credentials.Certificate(service_account_key_path)
+        initialize_app(cred)
+    except Exception as e:
+        raise DatabaseUnavailableError(f"Error initializing Firebase Admin SDK: {e}") from e
+    _app_initialized = True
+
+
+def _storage_backend() -> str:
+    if config.STORAGE_BACKEND not in STORAGE_BACKENDS:
+        raise DatabaseUnavailableError(f"Unknown STORAGE_BACKEND {config.STORAGE_BACKEND!r}, expected one of {', '.join(STORAGE_BACKENDS)}")
+    return config.STORAGE_BACKEND
+
+
+def _memory_store() -> "Collections":
+    """The memory backend's collections, shared by both clients and seeded from the catalogue artifact on first use."""
+    global _memory_collections
+    if _memory_collections is None:
+        from app.db.memory import artifact_collections
+        from app.services.catalogue_artifact import DEFAULT_ARTIFACT_PATH
+
+        path = config.MEMORY_SEED_PATH or config.CATALOGUE_ARTIFACT_PATH or DEFAULT_ARTIFACT_PATH
+        if os.path.exists(path):
+            _memory_collections = artifact_collections(path)
+            logger.info("Memory backend seeded with %d courses from %s", len(_memory_collections["courses"]), path)
+        else:
+            logger.warning("No catalogue artifact at %s, the memory backend starts empty", path)
+            _memory_collections = {}
+    return _memory_collections
+
+
+def _memory_options() -> dict:
+    return {
+        "latency_seconds": config.MEMORY_LATENCY_MS / 1000,
+        "jitter_seconds": config.MEMORY_JITTER_MS / 1000,
+        "seed": config.MEMORY_LATENCY_SEED,
+    }
+
+
+def get_client() -> "Client":
+    """Blocking Firestore client, used by the offline scripts (scrapers / uploaders)."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                if _storage_backend() == "memory":
+                    from app.db.memory import MemoryFirestore
+                    _client = MemoryFirestore(_memory_store(), **_memory_options())
+                else:
+                    from firebase_admin import firestore
+                    _initialize_app()
+                    _client = firestore.client()
+    return _client
+
+
+def get_async_client() -> "AsyncClient":
+    """
+    Non-blocking client, used by the API so Firestore round-trips don't stall
+    the event loop. Its calls are recorded in the Firestore metrics.
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                from app.db.instrumented import InstrumentedAsyncClient
+                if _storage_backend() == "memory":
+                    from app.db.memory import MemoryAsyncFirestore
+                    _async_client = InstrumentedAsyncClient(MemoryAsyncFirestore(_memory_store(), **_memory_options()))
+                else:
+                    from firebase_admin import firestore_async
+                    _initialize_app()
+                    _async_client = InstrumentedAsyncClient(firestore_async.client())
+    return _async_client
@@ -0,0 +1,181 @@
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from google.api_core import exceptions
+from google.cloud.firestore_v1.client import Client
+from google.cloud.firestore_v1.document import DocumentReference
+
+# Firestore rejects batches with more operations than this
+FIRESTORE_BATCH_LIMIT = 500
+
+# Errors worth retrying; anything else (permissions, invalid data...) fails the batch at once
+TRANSIENT_ERRORS = (
+    exceptions.Aborted,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+    exceptions.TooManyRequests,
+)
+
+# ("set", reference, data) or ("delete", reference, None)
+WriteOperation = Tuple[str, DocumentReference, Optional[Dict[str, Any]]]
+
+
+@dataclass
+class WriteSummary:
+    """Outcome of a batched write run"""
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    retries: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Operations written per second."""
+        return self.written / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def report(self) -> str:
+        lines = [
+            f"Wrote {self.written} documents in {self.batches} batches "
+            f"({self.elapsed_seconds:.2f}s, {self.throughput:.0f} docs/s, {self.retries} retries).",
+        ]
+        if self.failed:
+            lines.append(f"{self.failed} writes failed:")
+            lines.extend(f"  - {error}" for error in self.errors)
+        return "\n".join(lines)
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yields lists of at most `size` consecutive items."""
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def commit_batch(
+    client: Client,
+    operations: List[WriteOperation],
+    max_retries: int = 5,
+    base_delay: float = 0.5,
+    sleep=time.sleep,
+) -> int:
+    """
+    Commits the operations as one atomic WriteBatch, retrying transient errors
+    with exponential backoff and jitter. The references are fixed before the
+    first attempt, so retrying a commit that did go through only rewrites the
+    same documents.
+
+    Returns:
+        int: How many retries were needed.
+    """
+    for attempt in range(max_retries + 1):
+        batch = client.batch()
+        for action, reference, data in operations:
+            if action == "delete":
+                batch.delete(reference)
+            else:
+                batch.set(reference, data)
+        try:
+            batch.commit()
+            return attempt
+        except TRANSIENT_ERRORS:
+            if attempt == max_retries:
+                raise
+            sleep(base_delay * (2 ** attempt) * (1 + random.random()))
+    return max_retries
+
+
+def write_batches(
+    client: Client,
+    batches: Iterable[List[WriteOperation]],
+    max_workers: int = 4,
+    max_pending: int = 8,
+    max_retries: int = 5,
+    on_batch: Optional[Callable[[int, List[WriteOperation], Optional[Exception]], None]] = None,
+) -> WriteSummary:
+    """
+    Commits batches from a pool of `max_workers` writer threads, reading them
+    from `batches` only as fast as they are written: at most `max_pending`
+    batches wait in the queue, so a generator feeding this is held back
+    instead of being drained into memory.
+
+    `on_batch(index, batch, error)` is called from the writer thread once each
+    batch is committed (error None) or has failed, in completion order.
+    """
+    summary = WriteSummary()
+    lock = threading.Lock()
+    callback_errors: List[Exception] = []
+    pending: "queue.Queue[Optional[Tuple[int, List[WriteOperation]]]]" = queue.Queue(maxsize=max_pending)
+
+    def writer() -> None:
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            index, batch = item
+            error: Optional[Exception] = None
+            try:
+                retries = commit_batch(client, batch, max_retries)
+            except Exception as e:
+                error = e
+            with lock:
+                summary.batches += 1
+                if error is None:
+                    summary.retries += retries
+                    summary.written += len(batch)
+                else:
+                    summary.failed += len(batch)
+                    summary.errors.append(f"batch of {len(batch)} starting at {batch[0][1].id}: {error}")
+                if on_batch is not None:
+                    try:
+                        on_batch(index, batch, error)
+                    except Exception as e:
+                        # Re-raised once the writers stop, so a bad callback can't kill a writer and stall the queue
+                        callback_errors.append(e)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=writer, daemon=True) for _ in range(max_workers)]
+    for worker in workers:
+        worker.start()
+    try:
+        for index, batch in enumerate(batches):
+            # Blocks while the writers are behind: the backpressure on the producer
+            pending.put((index, batch))
+    finally:
+        for _ in workers:
+            pending.put(None)
+        for worker in workers:
+            worker.join()
+    summary.elapsed_seconds = time.perf_counter() - started
+    if callback_errors:
+        raise callback_errors[0]
+    return summary
+
+
+def write_in_batches(
+    client: Client,
+    operations: Iterable[WriteOperation],
+    batch_size: int = FIRESTORE_BATCH_LIMIT,
+    max_workers: int = 4,
+    max_retries: int = 5,
+    max_pending: int = 8,
+) -> WriteSummary:
+    """
+    Groups the operations into WriteBatches of up to `batch_size` and commits
+    them concurrently from a thread pool, consuming `operations` lazily.
+    """
+    if not 1 <= batch_size <= FIRESTORE_BATCH_LIMIT:
+        raise ValueError(f"batch_size must be between 1 and {FIRESTORE_BATCH_LIMIT}")
+    return write_batches(client, chunked(operations, batch_size), max_workers=max_workers, max_pending=max_pending, max_retries=max_retries)
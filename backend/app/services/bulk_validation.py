@@ -0,0 +1,167 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.api.v1.schemas import COURSE_CODE_PATTERN
+from app.core.slots import COURSE_TYPES, LEGAL_SLOTS
+
+COURSE_FIELDS = ["course_code", "course_name", "course_type", "slot"]
+
+# Columns with a handful of distinct values, cleaned and checked once per value
+LOW_CARDINALITY_FIELDS = ("course_type", "slot")
+
+REASON_MISSING = "missing_{field}"
+REASON_CODE = "invalid_course_code"
+REASON_TYPE = "invalid_course_type"
+REASON_THEORY_SLOT = "invalid_theory_slot"
+REASON_LAB_SLOT = "invalid_lab_slot"
+
+
+@dataclass
+class RejectionReport:
+    """Why each rejected record failed, with per-reason counts"""
+    total: int
+    valid: int
+    # One row per rejected record: its original index, its fields and a tuple of reasons
+    rejected: pd.DataFrame = field(repr=False)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rejected_count(self) -> int:
+        return self.total - self.valid
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return self.rejected.reset_index().rename(columns={"index": "row"}).to_dict("records")
+
+    def summary(self) -> str:
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.counts.items())) or "none"
+        return f"{self.valid}/{self.total} courses valid, {self.rejected_count} rejected ({reasons})."
+
+
+def _as_frame(records: Union[pd.DataFrame, Iterable[Mapping[str, Any]]]) -> pd.DataFrame:
+    frame = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+    for column in COURSE_FIELDS:
+        if column not in frame.columns:
+            frame[column] = None
+    return frame
+
+
+def _per_distinct(series: pd.Series, operation: Callable[[pd.Series], pd.Series], missing: Any) -> np.ndarray:
+    """
+    Runs a string operation once per distinct value and broadcasts the result
+    back. Scraped catalogues repeat a handful of types and slots across every
+    row, so this does a fraction of the per-element work; missing values map to `missing`.
+    """
+    codes, distinct = pd.factorize(series)
+    results = operation(pd.Series(distinct, dtype=object)).to_numpy(dtype=object)
+    return np.where(codes < 0, missing, results.take(codes) if len(results) else missing)
+
+
+def _strip(series: pd.Series) -> pd.Series:
+    """Every value as a stripped string, with the .str accessor over the whole column."""
+    if not isinstance(series.dtype, pd.StringDtype):
+        series = series.astype("string")
+    return series.str.strip()
+
+
+def clean_courses(records: Union[pd.DataFrame, Iterable[Mapping[str, Any]]]) -> pd.DataFrame:
+    """Strips the whitespace around every course field of a whole catalogue."""
+    frame = _as_frame(records)
+    for column in COURSE_FIELDS:
+        if column in LOW_CARDINALITY_FIELDS:
+            frame[column] = _per_distinct(frame[column].astype(object), lambda values: values.map(str).str.strip(), None)
+        else:
+            # Codes and names are nearly all distinct, factorizing them first would only add work
+            frame[column] = _strip(frame[column])
+    return frame
+
+
+def _valid_codes(codes: pd.Series, present: np.ndarray) -> np.ndarray:
+    """
+    Whether each present code matches COURSE_CODE_PATTERN. The ASCII forms of
+    the three formats are recognized with array comparisons on the code
+    points; only the codes this rejects (few, in a scraped catalogue) go
+    through the regex, which stays the definition.
+    """
+    strings = np.where(present, codes.to_numpy(dtype=object), "")
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    points = np.array(strings.tolist(), dtype="U6").view(np.uint32).reshape(len(strings), 6)
+    upper = (points >= ord("A")) & (points <= ord("Z"))
+    digit = (points >= ord("0")) & (points <= ord("9"))
+    # "AB 123", "ABC123" and "AB1234": two letters, then a space, letter or digit, then three digits
+    valid = (
+        present & (lengths == 6) & upper[:, 0] & upper[:, 1]
+        & ((points[:, 2] == ord(" ")) | upper[:, 2] | digit[:, 2])
+        & digit[:, 3] & digit[:, 4] & digit[:, 5]
+    )
+    recheck = present & ~valid
+    if recheck.any():
+        valid[recheck] = codes[recheck].str.fullmatch(COURSE_CODE_PATTERN).to_numpy(dtype=bool)
+    return valid
+
+
+def _canonical_slots(course_type: str, slot_ids: np.ndarray, slots: pd.Index) -> np.ndarray:
+    """Each slot's canonical id for a `course_type` course, or None where it is missing or not legal."""
+    # The trailing None is what the -1 of a missing slot takes
+    canonical = np.array([LEGAL_SLOTS.get((course_type, slot)) for slot in slots] + [None], dtype=object)
+    return canonical.take(slot_ids)
+
+
+def validate_courses(records: Union[pd.DataFrame, Iterable[Mapping[str, Any]]]) -> Tuple[pd.DataFrame, RejectionReport]:
+    """
+    Cleans and validates a whole catalogue with vectorized string operations,
+    applying the same rules as the Course schema: the course code formats,
+    the course type, and the slots of app.core.slots. Valid slots are
+    replaced by their canonical ids ("07" -> "7").
+
+    Args:
+        records: A DataFrame or an iterable of course dicts. Extra columns
+            (such as the department) are kept.
+
+    Returns:
+        tuple: The valid, cleaned courses (original index kept) and a report
+        of the rejected ones.
+    """
+    frame = clean_courses(records)
+    code, course_type, slot = frame["course_code"], frame["course_type"], frame["slot"]
+
+    # Every rule is checked on numpy masks: the missing values are found once,
+    # and types and slots are looked up once per distinct value
+    missing = {column: frame[column].isna().to_numpy() for column in COURSE_FIELDS}
+    type_ids, types = pd.factorize(course_type)
+    slot_ids, slots = pd.factorize(slot)
+
+    def of_type(*names: str) -> np.ndarray:
+        return np.isin(type_ids, [index for index, name in enumerate(types) if name in names])
+
+    failures: Dict[str, np.ndarray] = {}
+    for column in COURSE_FIELDS:
+        failures[REASON_MISSING.format(field=column)] = missing[column]
+
+    failures[REASON_CODE] = ~missing["course_code"] & ~_valid_codes(code, ~missing["course_code"])
+    failures[REASON_TYPE] = ~missing["course_type"] & ~of_type(*COURSE_TYPES)
+    canonical = {kind: _canonical_slots(kind, slot_ids, slots) for kind in ("Theory", "Lab")}
+    legal = {kind: np.not_equal(canonical[kind], None) for kind in canonical}
+    theory, lab = of_type("Theory"), of_type("Lab")
+    failures[REASON_THEORY_SLOT] = theory & ~missing["slot"] & ~legal["Theory"]
+    failures[REASON_LAB_SLOT] = lab & ~missing["slot"] & ~legal["Lab"]
+    replaced = np.where(theory, canonical["Theory"], canonical["Lab"])
+    frame["slot"] = slot.mask((theory & legal["Theory"]) | (lab & legal["Lab"]), pd.Series(replaced, index=frame.index))
+
+    failed = pd.DataFrame(failures, index=frame.index)
+    rejected_mask = failed.any(axis=1)
+
+    rejected = frame.loc[rejected_mask].copy()
+    # Rows failing the same rules share one reasons tuple, built once per combination
+    combination = failed.loc[rejected_mask].to_numpy() @ (1 << np.arange(len(failed.columns)))
+    combinations, inverse = np.unique(combination, return_inverse=True)
+    reasons = np.empty(len(combinations), dtype=object)
+    reasons[:] = [tuple(reason for bit, reason in enumerate(failed.columns) if flags >> bit & 1) for flags in combinations]
+    rejected["reasons"] = reasons.take(inverse)
+
+    counts = {reason: int(count) for reason, count in failed.sum().items() if count}
+    valid = frame.loc[~rejected_mask]
+    report = RejectionReport(total=len(frame), valid=len(valid), rejected=rejected, counts=counts)
+    return valid, report
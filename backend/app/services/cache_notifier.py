@@ -0,0 +1,25 @@
+import logging
+import urllib.request
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+def notify_catalogue_changed(timeout: float = 5.0) -> bool:
+    """
+    Asks the running API to drop its cached catalogue after an upload.
+
+    Returns:
+        bool: True if the API acknowledged the invalidation, False otherwise.
+    """
+    if not config.API_BASE_URL or not config.ADMIN_API_TOKEN:
+        logger.warning("API_BASE_URL or ADMIN_API_TOKEN not set, skipping cache invalidation.")
+        return False
+
+    url = f"{config.API_BASE_URL.rstrip('/')}/api/v1/admin/cache/invalidate"
+    request = urllib.request.Request(url, method="POST", headers={"X-Admin-Token": config.ADMIN_API_TOKEN})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status == 200
+    except Exception as e:
+        logger.error("Could not invalidate API cache: %s", e)
+        return False
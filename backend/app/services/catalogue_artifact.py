@@ -0,0 +1,334 @@
+"""
+The scraped catalogue as one columnar file: the handoff from the scrapers to
+the uploaders, the benchmarks and the API (which can boot from it without
+Firestore).
+
+Layout, all integers little-endian:
+
+    magic        8 bytes  b"IITBCAT\\0"
+    format       uint32   ARTIFACT_FORMAT
+    header size  uint32
+    header       JSON: row count, content version, where each column's
+                 buffers are, the dictionaries, and the optional departments
+                 and semester plans
+    padding      to an 8 byte boundary
+    buffers      per column: uint32 offsets + UTF-8 bytes for free text, or
+                 one uint8/uint16 code per row for dictionary-encoded columns
+
+Rows are sorted by (department, course_code). Readers map the file and view
+the buffers in place: nothing is decoded until a value is read.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+MAGIC = b"IITBCAT\0"
+ARTIFACT_FORMAT = 1
+# Next to the processed scrape outputs, replacing the per-department CSVs
+ARTIFACT_NAME = "catalogue.iitbcat"
+DEFAULT_ARTIFACT_PATH = os.path.join(os.path.dirname(__file__), "department_data_processed", ARTIFACT_NAME)
+
+# Few distinct values repeated on every row: stored as small integer codes
+DICTIONARY_COLUMNS = ("department", "course_type", "slot")
+COURSE_FIELDS = ("course_code", "course_name", "course_type", "slot")
+COLUMNS = ("department", *COURSE_FIELDS)
+
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 8
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class ArtifactFormatError(ValueError):
+    """The file is not a catalogue artifact, or one written in a format this code can't read."""
+
+
+def _code_typecode(size: int) -> str:
+    return "B" if size <= 1 << 8 else "H"
+
+
+def _uint_view(buffer: memoryview, typecode: str) -> Union[memoryview, array]:
+    """The buffer as unsigned integers, in place unless the machine is big-endian."""
+    if typecode == "B" or _LITTLE_ENDIAN:
+        return buffer.cast(typecode)
+    values = array(typecode, buffer.tobytes())
+    values.byteswap()
+    return values
+
+
+def _le_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class StringColumn(Sequence[str]):
+    """Free text column: value i is data[offsets[i]:offsets[i + 1]]."""
+
+    def __init__(self, offsets: Sequence[int], data: memoryview):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return str(self.data[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        # Plain ints, so no view into the mapping outlives the artifact
+        offsets = self.offsets.tolist()
+        text = str(self.data, "utf-8")
+        if len(text) == len(self.data):
+            # ASCII only (most of the catalogue): byte offsets are character
+            # offsets, so one decode serves every value
+            return map(text.__getitem__, map(slice, offsets[:-1], offsets[1:]))
+        data = self.data
+        return (str(data[start:end], "utf-8") for start, end in zip(offsets[:-1], offsets[1:]))
+
+
+class DictionaryColumn(Sequence[str]):
+    """Dictionary-encoded column: value i is dictionary[codes[i]]."""
+
+    def __init__(self, codes: Sequence[int], dictionary: Tuple[str, ...]):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.dictionary[code] for code in self.codes[index]]
+        return self.dictionary[self.codes[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        dictionary = self.dictionary
+        return (dictionary[code] for code in self.codes)
+
+
+class CatalogueArtifact:
+    """
+    A catalogue artifact viewed in place. Use `open` for a file (memory
+    mapped, close it or use it as a context manager) or pass bytes directly.
+    Values are decoded on access, so reading one column never touches the others.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap], source: Optional[str] = None):
+        self.source = source
+        self._buffer = buffer
+        self._views: List[memoryview] = []
+        view = self._track(memoryview(buffer))
+        if len(view) < _PREAMBLE.size:
+            raise ArtifactFormatError(f"{source or 'buffer'} is too short to be a catalogue artifact")
+        magic, format_version, header_size = _PREAMBLE.unpack_from(view)
+        if magic != MAGIC:
+            raise ArtifactFormatError(f"{source or 'buffer'} is not a catalogue artifact")
+        if format_version != ARTIFACT_FORMAT:
+            raise ArtifactFormatError(f"{source or 'buffer'} uses artifact format {format_version}, expected {ARTIFACT_FORMAT}")
+        header_end = _PREAMBLE.size + header_size
+        self.header: Dict[str, Any] = json.loads(bytes(view[_PREAMBLE.size:header_end]))
+        body = self._track(view[_padded(header_end):])
+
+        self.columns: Dict[str, Union[StringColumn, DictionaryColumn]] = {}
+        for name, spec in self.header["columns"].items():
+            if spec["encoding"] == "dictionary":
+                codes = _uint_view(self._track(body[spec["codes"][0]:spec["codes"][0] + spec["codes"][1]]), spec["typecode"])
+                self._track(codes)
+                self.columns[name] = DictionaryColumn(codes, tuple(spec["dictionary"]))
+            else:
+                offsets = _uint_view(self._track(body[spec["offsets"][0]:spec["offsets"][0] + spec["offsets"][1]]), "I")
+                self._track(offsets)
+                data = self._track(body[spec["data"][0]:spec["data"][0] + spec["data"][1]])
+                self.columns[name] = StringColumn(offsets, data)
+
+    @classmethod
+    def open(cls, path: str) -> "CatalogueArtifact":
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, source=path)
+        except Exception:
+            mapped.close()
+            raise
+
+    def _track(self, view):
+        # Views into a mapping have to be released before it can be closed
+        if isinstance(view, memoryview):
+            self._views.append(view)
+        return view
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self.columns.clear()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "CatalogueArtifact":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.header["rows"]
+
+    @property
+    def version(self) -> str:
+        """Content hash of the catalogue, the same for the same courses, departments and plans."""
+        return self.header["version"]
+
+    @property
+    def departments(self) -> List[Dict[str, Any]]:
+        """Department documents ({"id", "name", "code", ...}), if the writer included them."""
+        return self.header.get("departments", [])
+
+    @property
+    def department_courses(self) -> Dict[str, Dict[str, List[str]]]:
+        """Semester plans keyed by department name, if the writer included them."""
+        return self.header.get("department_courses", {})
+
+    def records(self, columns: Sequence[str] = COLUMNS) -> Iterator[Dict[str, str]]:
+        """One dict per course, in file order."""
+        return map(lambda *values: dict(zip(columns, values)), *(self.columns[name] for name in columns))
+
+    def to_frame(self):
+        """
+        The courses as a pandas DataFrame. Dictionary columns become
+        categoricals built straight from their codes, without decoding a value per row.
+        """
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for name in COLUMNS:
+            column = self.columns[name]
+            if isinstance(column, DictionaryColumn):
+                # A copy (one or two bytes a row), so the frame outlives the mapping
+                codes = np.array(column.codes, dtype=np.uint8 if column.codes.itemsize == 1 else np.uint16)
+                data[name] = pd.Categorical.from_codes(codes, categories=list(column.dictionary))
+            else:
+                data[name] = list(column)
+        return pd.DataFrame(data)
+
+
+def _padded(position: int) -> int:
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
+
+
+def encode_catalogue(
+    courses: Iterable[Mapping[str, Any]],
+    departments: Optional[List[Dict[str, Any]]] = None,
+    department_courses: Optional[Dict[str, Dict[str, List[str]]]] = None,
+) -> bytes:
+    """
+    Encodes courses (each with a department) and, optionally, the department
+    documents and semester plans into the artifact format.
+    """
+    rows = sorted(
+        ({name: str(course[name]) for name in COLUMNS} for course in courses),
+        key=lambda course: (course["department"], course["course_code"]),
+    )
+    buffers: List[bytes] = []
+    position = 0
+
+    def add(buffer: bytes) -> List[int]:
+        nonlocal position
+        start = position
+        padding = _padded(len(buffer)) - len(buffer)
+        buffers.append(buffer + b"\0" * padding)
+        position += len(buffer) + padding
+        return [start, len(buffer)]
+
+    columns: Dict[str, Dict[str, Any]] = {}
+    for name in COLUMNS:
+        values = [row[name] for row in rows]
+        if name in DICTIONARY_COLUMNS:
+            dictionary = sorted(set(values))
+            if len(dictionary) > 1 << 16:
+                raise ValueError(f"Column {name} has too many distinct values to dictionary-encode")
+            typecode = _code_typecode(len(dictionary))
+            code_of = {value: code for code, value in enumerate(dictionary)}
+            codes = array(typecode, (code_of[value] for value in values))
+            columns[name] = {"encoding": "dictionary", "dictionary": dictionary, "typecode": typecode, "codes": add(_le_bytes(codes))}
+        else:
+            encoded = [value.encode("utf-8") for value in values]
+            offsets = array("I", [0])
+            total = 0
+            for value in encoded:
+                total += len(value)
+                offsets.append(total)
+            columns[name] = {"encoding": "utf8", "offsets": add(_le_bytes(offsets)), "data": add(b"".join(encoded))}
+
+    metadata: Dict[str, Any] = {}
+    if departments is not None:
+        metadata["departments"] = sorted(departments, key=lambda department: department["id"])
+    if department_courses is not None:
+        metadata["department_courses"] = {
+            name: {semester: list(plan[semester]) for semester in sorted(plan)} for name, plan in sorted(department_courses.items())
+        }
+
+    digest = hashlib.blake2b(digest_size=16)
+    for buffer in buffers:
+        digest.update(buffer)
+    digest.update(json.dumps([columns, metadata], sort_keys=True).encode("utf-8"))
+    header = json.dumps({"rows": len(rows), "version": digest.hexdigest(), "columns": columns, **metadata}, ensure_ascii=False).encode("utf-8")
+
+    preamble = _PREAMBLE.pack(MAGIC, ARTIFACT_FORMAT, len(header))
+    head = preamble + header
+    return b"".join([head, b"\0" * (_padded(len(head)) - len(head)), *buffers])
+
+
+def write_catalogue_artifact(
+    path: str,
+    courses: Iterable[Mapping[str, Any]],
+    departments: Optional[List[Dict[str, Any]]] = None,
+    department_courses: Optional[Dict[str, Dict[str, List[str]]]] = None,
+) -> str:
+    """Writes the artifact atomically (readers never see a half written file) and returns its version."""
+    data = encode_catalogue(courses, departments, department_courses)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return CatalogueArtifact(data).version
+
+
+def read_catalogue_artifact(path: str) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]], Dict[str, Dict[str, List[str]]]]:
+    """The courses, department documents and semester plans of an artifact file."""
+    with CatalogueArtifact.open(path) as artifact:
+        return list(artifact.records()), artifact.departments, artifact.department_courses
+
+
+def update_catalogue_artifact(
+    path: str,
+    courses: Optional[Iterable[Mapping[str, Any]]] = None,
+    departments: Optional[List[Dict[str, Any]]] = None,
+    department_courses: Optional[Dict[str, Dict[str, List[str]]]] = None,
+) -> str:
+    """
+    Rewrites the artifact replacing only the parts given, so the course and
+    the department courses scrapers can each refresh their own part. A
+    missing file starts out empty.
+    """
+    previous_courses, previous_departments, previous_plans = read_catalogue_artifact(path) if os.path.exists(path) else ([], [], {})
+    return write_catalogue_artifact(
+        path,
+        previous_courses if courses is None else courses,
+        previous_departments if departments is None else departments,
+        previous_plans if department_courses is None else department_courses,
+    )
@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, TYPE_CHECKING, Tuple
+
+from pydantic import ValidationError
+
+from app import crud
+from app.api.v1.schemas import Course, Department
+from app.core.config import config
+from app.core.departments import departments_names_to_codes
+from app.core.encoding import EncodedBody, dumps, join_json_array
+from app.core.http_cache import make_etag
+from app.core.metrics import cache_requests, registry, snapshot_refreshes
+from app.crud.crud_department_courses import SemesterPlan
+from app.services.catalogue_artifact import COURSE_FIELDS, CatalogueArtifact
+from app.services.course_index import CourseIndex, latest_listings
+from app.services.course_search import CourseSearchIndex
+
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+
+def build_department_index(departments: List[Department]) -> Mapping[str, str]:
+    """
+    Maps department codes to the department names used as document ids in the
+    department_courses collection. The static mapping is the baseline so a
+    department missing from Firestore still resolves; Firestore departments
+    override it.
+    """
+    index = {code: name for name, code in departments_names_to_codes.items()}
+    for department in departments:
+        index[department.code] = department.name
+    return MappingProxyType(index)
+
+
+@dataclass(frozen=True)
+class CatalogueSnapshot:
+    """
+    The whole catalogue as of one load, with the indexes the endpoints query.
+    Never modified once built: a refresh builds a new snapshot and swaps it in,
+    so a request sees one consistent catalogue from start to finish.
+
+    Everything is validated and serialized while the snapshot is built, so
+    the endpoints return these bytes as they are instead of validating and
+    encoding models on every request.
+    """
+    departments: Tuple[Department, ...]
+    department_index: Mapping[str, str]
+    department_courses: Mapping[str, SemesterPlan]
+    course_index: CourseIndex
+    search_index: CourseSearchIndex
+    loaded_at: float
+    # Content hash of the whole catalogue, the ETag base of responses built per request
+    version: str
+    # Course document id -> the course's JSON object
+    course_json: Mapping[str, bytes]
+    courses_body: EncodedBody
+    departments_body: EncodedBody
+    # (department name, semester) -> the JSON list of its course codes
+    semester_bodies: Mapping[Tuple[str, str], EncodedBody]
+    # Department name -> its whole semester plan
+    plan_bodies: Mapping[str, EncodedBody]
+    # Every department's semester plan, keyed by department name
+    department_courses_body: EncodedBody
+
+    @property
+    def courses(self) -> List[Course]:
+        """Every course, sorted by (course_code, document id)."""
+        return self.course_index.courses
+
+    def courses_json(self, courses: List[Course]) -> bytes:
+        """The JSON array of some of the snapshot's courses, built from their pre-encoded objects."""
+        return join_json_array(self.course_json[course.id] for course in courses)
+
+
+# Loads a snapshot given the client and the snapshot being replaced (None on the first load)
+SnapshotLoader = Callable[[Optional["AsyncClient"], Optional[CatalogueSnapshot]], Awaitable[CatalogueSnapshot]]
+
+
+def build_catalogue_snapshot(
+    courses: List[Course],
+    departments: List[Department],
+    department_courses: Mapping[str, SemesterPlan],
+    clock: Callable[[], float] = time.monotonic,
+    previous: Optional[CatalogueSnapshot] = None,
+) -> CatalogueSnapshot:
+    """
+    Indexes and serializes a catalogue, wherever it was read from. The search
+    index is brought up to date from the `previous` snapshot's, so only the
+    courses that changed are tokenized again.
+    """
+    departments = sorted(departments, key=lambda department: department.id)
+    search_index = previous.search_index.copy() if previous is not None else CourseSearchIndex()
+    search_index.update(courses)
+    course_index = CourseIndex(courses)
+    course_json = {course.id: dumps(course.model_dump(mode="json")) for course in course_index.courses}
+    courses_body = EncodedBody(join_json_array(course_json.values()))
+    departments_body = EncodedBody.from_content([department.model_dump(mode="json") for department in departments])
+    # Sorted so the bytes, and so the ETags, don't depend on Firestore's stream order
+    plans = {name: {semester: plan[semester] for semester in sorted(plan)} for name, plan in sorted(department_courses.items())}
+    department_courses_body = EncodedBody.from_content(plans)
+    return CatalogueSnapshot(
+        departments=tuple(departments),
+        department_index=build_department_index(departments),
+        department_courses=MappingProxyType(department_courses),
+        course_index=course_index,
+        search_index=search_index,
+        loaded_at=clock(),
+        version=make_etag(courses_body.identity, departments_body.identity, department_courses_body.identity),
+        course_json=MappingProxyType(course_json),
+        courses_body=courses_body,
+        departments_body=departments_body,
+        semester_bodies=MappingProxyType({
+            (name, semester): EncodedBody.from_content(codes)
+            for name, plan in plans.items()
+            for semester, codes in plan.items()
+        }),
+        plan_bodies=MappingProxyType({name: EncodedBody.from_content(plan) for name, plan in plans.items()}),
+        department_courses_body=department_courses_body,
+    )
+
+
+async def load_catalogue_snapshot(
+    db: "AsyncClient", previous: Optional[CatalogueSnapshot] = None, clock: Callable[[], float] = time.monotonic,
+) -> CatalogueSnapshot:
+    """Streams the courses, departments and department_courses collections concurrently and indexes them."""
+    courses, departments, department_courses = await asyncio.gather(
+        crud.course.get_all(db),
+        crud.department.get_all(db),
+        crud.department_courses.get_all(db),
+    )
+    return build_catalogue_snapshot(courses, departments, department_courses, clock, previous)
+
+
+def read_artifact_catalogue(path: str) -> Tuple[List[Course], List[Department], Dict[str, SemesterPlan]]:
+    """
+    The courses, departments and semester plans of a catalogue artifact, as
+    the uploaders would have written them: one course per normalized code
+    (the last listing wins) and invalid records skipped.
+    """
+    with CatalogueArtifact.open(path) as artifact:
+        records = artifact.records(COURSE_FIELDS)
+        by_id = latest_listings(records)
+        raw_departments, department_courses = artifact.departments, artifact.department_courses
+    courses: List[Course] = []
+    for doc_id, record in by_id.items():
+        try:
+            courses.append(Course(id=doc_id, **record))
+        except ValidationError as ve:
+            logger.warning("Validation error for artifact course %s: %s", doc_id, ve)
+    departments: List[Department] = []
+    for record in raw_departments:
+        try:
+            departments.append(Department(**record))
+        except ValidationError as ve:
+            logger.warning("Validation error for artifact department %s: %s", record.get("id"), ve)
+    return courses, departments, department_courses
+
+
+def artifact_loader(path: str, clock: Callable[[], float] = time.monotonic) -> SnapshotLoader:
+    """
+    A SnapshotStore loader that reads a catalogue artifact instead of
+    Firestore (the client it is given is ignored), so the API can run without
+    Firestore. Each refresh re-reads the file, picking up a newly written artifact.
+    """
+    async def load(db: Optional["AsyncClient"] = None, previous: Optional[CatalogueSnapshot] = None) -> CatalogueSnapshot:
+        courses, departments, department_courses = await asyncio.to_thread(read_artifact_catalogue, path)
+        return build_catalogue_snapshot(courses, departments, department_courses, clock, previous)
+    return load
+
+
+class SnapshotStore:
+    """
+    Holds the current catalogue snapshot and keeps it fresh.
+
+    Reads are stale-while-revalidate: a snapshot older than `max_age_seconds`
+    is still served while a refresh runs in the background, and if Firestore is
+    slow or down the old snapshot keeps being served until a refresh succeeds.
+    Only the very first load (nothing to serve yet) makes a request wait.
+    Concurrent refreshes share one load.
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float,
+        loader: SnapshotLoader = load_catalogue_snapshot,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_age_seconds = max_age_seconds
+        self._loader = loader
+        self._clock = clock
+        self._snapshot: Optional[CatalogueSnapshot] = None
+        self._stale = False
+        self._refreshing: Optional[asyncio.Task] = None
+        self._refresh_requested: Optional[asyncio.Event] = None
+        # Bumped by clear() so loads that started before it are not swapped in
+        self._generation = 0
+
+    @property
+    def snapshot(self) -> Optional[CatalogueSnapshot]:
+        return self._snapshot
+
+    def age(self) -> float:
+        """Seconds since the current snapshot was loaded (0 if there is none)."""
+        return self._clock() - self._snapshot.loaded_at if self._snapshot is not None else 0.0
+
+    def is_stale(self) -> bool:
+        if self._snapshot is None:
+            return True
+        return self._stale or self._clock() - self._snapshot.loaded_at >= self.max_age_seconds
+
+    async def get(self, db: "AsyncClient") -> CatalogueSnapshot:
+        """
+        Returns the current snapshot, starting a background refresh if it is
+        stale. Waits for a load only when there is no snapshot yet.
+        """
+        if self._snapshot is None:
+            cache_requests.inc(cache="catalogue_snapshot", result="miss")
+            return await self.refresh(db)
+        if self.is_stale():
+            cache_requests.inc(cache="catalogue_snapshot", result="stale")
+            if self._refreshing is None:
+                self._start_refresh(db).add_done_callback(self._log_failure)
+        else:
+            cache_requests.inc(cache="catalogue_snapshot", result="hit")
+        return self._snapshot
+
+    async def refresh(self, db: "AsyncClient") -> CatalogueSnapshot:
+        """Loads a new snapshot and swaps it in, joining a refresh that is already running."""
+        task = self._refreshing or self._start_refresh(db)
+        return await asyncio.shield(task)
+
+    def _start_refresh(self, db: "AsyncClient") -> asyncio.Task:
+        self._refreshing = asyncio.ensure_future(self._load(db, self._generation))
+        return self._refreshing
+
+    async def _load(self, db: "AsyncClient", generation: int) -> CatalogueSnapshot:
+        try:
+            snapshot = await self._loader(db, self._snapshot)
+        except Exception:
+            snapshot_refreshes.inc(outcome="failure")
+            raise
+        finally:
+            self._refreshing = None
+        snapshot_refreshes.inc(outcome="success")
+        if generation == self._generation:
+            self._snapshot = snapshot
+            self._stale = False
+        return snapshot
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Catalogue refresh failed, serving the previous snapshot: %s", task.exception())
+
+    def invalidate(self) -> None:
+        """
+        Marks the snapshot stale: it is still served, but the next request (or
+        the background refresher, which is woken up) loads a fresh one.
+        """
+        self._stale = True
+        if self._refresh_requested is not None:
+            self._refresh_requested.set()
+
+    def clear(self) -> None:
+        """Forgets the snapshot so the next request waits for a fresh load."""
+        self._generation += 1
+        self._snapshot = None
+        self._stale = False
+
+    async def run_refresher(self, get_db: Callable[[], "AsyncClient"], interval_seconds: Optional[float] = None) -> None:
+        """
+        Refreshes the snapshot every `interval_seconds` (default `max_age_seconds`)
+        and whenever `invalidate` is called, until cancelled. Failures are
+        logged and the previous snapshot is kept.
+        """
+        interval = self.max_age_seconds if interval_seconds is None else interval_seconds
+        self._refresh_requested = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._refresh_requested.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._refresh_requested.clear()
+                try:
+                    await self.refresh(get_db())
+                except Exception as e:
+                    logger.warning("Catalogue refresh failed, serving the previous snapshot: %s", e)
+        finally:
+            self._refresh_requested = None
+
+
+catalogue_snapshot = SnapshotStore(
+    config.CATALOGUE_REFRESH_SECONDS,
+    loader=artifact_loader(config.CATALOGUE_ARTIFACT_PATH) if config.CATALOGUE_ARTIFACT_PATH else load_catalogue_snapshot,
+)
+registry.gauge("catalogue_snapshot_age_seconds", "Seconds since the served catalogue snapshot was loaded.", function=catalogue_snapshot.age)
@@ -0,0 +1,154 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.api.v1.schemas import Course
+from app.crud.crud_course import CourseCursor
+
+
+def course_key(course: Course) -> CourseCursor:
+    """The (course_code, document id) order courses are listed and paged in."""
+    return course.course_code, course.id
+
+
+def normalize_code(code: str) -> str:
+    """Normalizes a course code (or a prefix of one) so "CS 101", "cs101" and "CS101" compare equal."""
+    return "".join(code.split()).upper()
+
+
+def last_listing_positions(course_codes: Iterable[str]) -> Dict[str, int]:
+    """
+    Normalized code (the courses document id) -> position of the last listing
+    of that code. A course listed by several departments is stored once, as
+    its last listing: the uploaders and the artifact loader all apply this rule.
+    """
+    return {normalize_code(code): position for position, code in enumerate(course_codes)}
+
+
+def latest_listings(courses: Iterable[Mapping[str, Any]]) -> Dict[str, Mapping[str, Any]]:
+    """Keys course records by normalized code, keeping the last listing of each (see last_listing_positions)."""
+    courses = list(courses)
+    positions = last_listing_positions(course["course_code"] for course in courses)
+    return {doc_id: courses[position] for doc_id, position in positions.items()}
+
+
+def department_of(course: Course) -> str:
+    """The department code of a course; every allowed course_code format starts with it."""
+    return course.course_code[:2]
+
+
+def paginate(courses: List[Course], limit: int, start_after: Optional[CourseCursor] = None) -> Tuple[List[Course], Optional[CourseCursor]]:
+    """
+    Pages through `courses`, which must be sorted by course_key.
+
+    Returns:
+        tuple: The courses of the page and the key the next page starts after,
+        or None when this was the last page.
+    """
+    start = 0 if start_after is None else bisect_right(courses, start_after, key=course_key)
+    page = courses[start:start + limit]
+    has_more = start + limit < len(courses)
+    return page, (course_key(page[-1]) if has_more and page else None)
+
+
+class CourseIndex:
+    """
+    Secondary indexes over the course catalogue for server-side filtering.
+
+    Each exact-match field maps a value to the positions of its courses, and
+    normalized course codes are kept sorted so a prefix is a bisected range.
+    A query starts from the smallest candidate list and checks the remaining
+    filters per candidate, so it costs O(matches) rather than O(catalogue).
+    """
+
+    def __init__(self, courses: List[Course]):
+        self.courses: List[Course] = sorted(courses, key=course_key)
+        self._by_type: Dict[str, List[int]] = {}
+        self._by_slot: Dict[str, List[int]] = {}
+        self._by_department: Dict[str, List[int]] = {}
+        self._by_code: Dict[str, List[int]] = {}
+        codes: List[Tuple[str, int]] = []
+
+        for position, course in enumerate(self.courses):
+            self._by_type.setdefault(course.course_type, []).append(position)
+            self._by_slot.setdefault(course.slot, []).append(position)
+            self._by_department.setdefault(department_of(course), []).append(position)
+            code = normalize_code(course.course_code)
+            self._by_code.setdefault(code, []).append(position)
+            codes.append((code, position))
+
+        codes.sort()
+        self._codes = [code for code, _ in codes]
+        self._code_positions = [position for _, position in codes]
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def _code_prefix_range(self, prefix: str) -> List[int]:
+        prefix = normalize_code(prefix)
+        start = bisect_left(self._codes, prefix)
+        # Every code starting with the prefix sorts before prefix + the highest code point
+        end = bisect_left(self._codes, prefix + "\U0010ffff", lo=start)
+        return self._code_positions[start:end]
+
+    def lookup(self, codes: List[str]) -> Tuple[List[Course], List[str]]:
+        """
+        Resolves course codes, in any format normalize_code accepts, with one
+        hash lookup each.
+
+        Returns:
+            tuple: The matching courses in request order (each once, all of them
+            when a code is listed under several documents) and the requested
+            codes that matched nothing.
+        """
+        found: List[Course] = []
+        missing: List[str] = []
+        seen = set()
+        for code in codes:
+            positions = self._by_code.get(normalize_code(code))
+            if not positions:
+                missing.append(code)
+                continue
+            for position in positions:
+                if position not in seen:
+                    seen.add(position)
+                    found.append(self.courses[position])
+        return found, missing
+
+    def filter(
+        self,
+        course_type: Optional[str] = None,
+        slot: Optional[str] = None,
+        code_prefix: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> List[Course]:
+        """Returns the courses matching every given filter, in course_key order."""
+        candidates: List[List[int]] = []
+        if course_type is not None:
+            candidates.append(self._by_type.get(course_type, []))
+        if slot is not None:
+            candidates.append(self._by_slot.get(slot, []))
+        if department is not None:
+            candidates.append(self._by_department.get(department, []))
+        if code_prefix is not None:
+            candidates.append(self._code_prefix_range(code_prefix))
+        if not candidates:
+            return list(self.courses)
+
+        smallest = min(candidates, key=len)
+        prefix = normalize_code(code_prefix) if code_prefix is not None else None
+        positions = []
+        for position in smallest:
+            course = self.courses[position]
+            if course_type is not None and course.course_type != course_type:
+                continue
+            if slot is not None and course.slot != slot:
+                continue
+            if department is not None and department_of(course) != department:
+                continue
+            if prefix is not None and not normalize_code(course.course_code).startswith(prefix):
+                continue
+            positions.append(position)
+
+        # The code prefix range is in normalized-code order, not course_key order
+        positions.sort()
+        return [self.courses[position] for position in positions]
@@ -1,9 +1,57 @@
 import os
-import pandas as pd
-from bs4 import BeautifulSoup
-import re
+from bs4 import BeautifulSoup, Tag
+from app.core.departments import department_branches, departments_names_to_codes
+from app.core.slots import COURSE_TYPE_SLOTS, canonical_slot, find_lab_slot
+from app.services.catalogue_artifact import DEFAULT_ARTIFACT_PATH, read_catalogue_artifact, update_catalogue_artifact
+from app.services.scrape_manifest import ScrapeManifest
+from app.services.scraping_pipeline import cell_text, iter_rows, row_cells, scrape_changed_files
 
 VALID_COURSE_TYPES = ["Theory", "Lab", "Non-Credit"]
+COURSE_ROW_COLOR = "#CCCC99"
+# Kept next to the catalogue artifact; records which raw pages changed since the last upload
+SCRAPE_MANIFEST_NAME = "scrape_manifest.json"
+
+def parse_course_row(course_code, course_name, course_type, slot_details):
+    """
+    Builds a course record from the text of one course row's cells, or returns
+    None if the row should be skipped.
+
+    Args:
+        course_code (str): Text of the course code cell.
+        course_name (str): Text of the course name cell.
+        course_type (str): Text of the course type cell.
+        slot_details (str): Text of the slot cell, one line per text node.
+
+    Returns:
+        dict: The course, or None.
+    """
+    if course_type not in VALID_COURSE_TYPES:
+        return None
+
+    if course_type == "Lab":
+        slot_details = find_lab_slot(slot_details)
+        if slot_details is None:
+            #Skipping cause invalid slot
+            return None
+
+    slot_details = slot_details.split('\n')[0]
+
+    if not slot_details or slot_details == "X":
+        #Skipping cause no slot details (Maybe i shouldnt be skipping, rather keep it and later update when get to know the slot)
+        return None
+
+    if course_type in COURSE_TYPE_SLOTS:
+        slot_details = canonical_slot(course_type, slot_details)
+        if slot_details is None:
+            #Skipping cause invalid slot, why does theory slot have a Lab slot
+            return None
+
+    return {
+        'course_name' : course_name,
+        'course_code': course_code,
+        'course_type': course_type,
+        'slot': slot_details
+    }
 
 def scrape_course_data(html_content):
     """
@@ -18,63 +66,52 @@ def scrape_course_data(html_content):
     soup = BeautifulSoup(html_content, 'lxml')
     scraped_data = []
 
-    course_rows = soup.find_all('tr', bgcolor="#CCCC99")
+    course_rows = soup.find_all('tr', bgcolor=COURSE_ROW_COLOR)
 
-    from bs4 import Tag
     for row in course_rows:
         if not isinstance(row, Tag):
             continue
         columns = row.find_all('td')
         
         if len(columns) > 8:
-            try:
-                course_code = columns[2].get_text(strip=True)
-                course_name = columns[3].get_text(strip=True)
-
-
-                # course_code = "".join([char for char in course_code_raw if char.isalnum() and char != ' '])
-                # course_code = course_code_raw
-                # if len(course_code) == 6 and course_code.find(' ') == -1:
-                    # course_code = course_code[:3] + ' ' + course_code[3:]
-                    # print(course_code)
-
-
-                course_type = columns[4].get_text(strip=True)
-                if course_type not in VALID_COURSE_TYPES:
-                    continue
-                
-                slot_details = columns[8].get_text(separator='\n', strip=True)
-                if course_type == "Lab":
-                    matches = re.findall('L[1-6]', slot_details)
-                    if matches:
-                        slot_details = matches[0]
-                    else:
-                        #Skipping cause invalid slot
-                        continue
-                
-                slot_details = slot_details.split('\n')[0]
-                
-                if not slot_details or slot_details == "X":
-                    #Skipping cause no slot details (Maybe i shouldnt be skipping, rather keep it and later update when get to know the slot)
-                    continue
-
-                if course_type == "Theory" and not slot_details.isdigit():
-                    #Skipping cause invalid slot, why does theory slot have a Lab slot
-                    continue
-
-                scraped_data.append({
-                    'course_name' : course_name,
-                    'course_code': course_code,
-                    'course_type': course_type,
-                    # 'Slot': slot_details
-                    'slot': slot_details
-                })
-            except IndexError:
-                print(f"Skipping a malformed row...")
-                continue
+            course = parse_course_row(
+                columns[2].get_text(strip=True),
+                columns[3].get_text(strip=True),
+                columns[4].get_text(strip=True),
+                columns[8].get_text(separator='\n', strip=True),
+            )
+            if course:
+                scraped_data.append(course)
 
     return scraped_data
 
+def iter_course_file(file_path):
+    """
+    Streams a department's course page and yields its courses one at a time,
+    materializing only the course rows instead of the whole document.
+
+    Args:
+        file_path (str): Path to the HTML file
+
+    Yields:
+        dict: A course
+    """
+    for row in iter_rows(file_path, lambda row: row.get('bgcolor') == COURSE_ROW_COLOR):
+        columns = row_cells(row)
+        if len(columns) > 8:
+            course = parse_course_row(
+                cell_text(columns[2]),
+                cell_text(columns[3]),
+                cell_text(columns[4]),
+                cell_text(columns[8], separator='\n'),
+            )
+            if course:
+                yield course
+
+def scrape_course_file(file_path):
+    """Streams a department's course page into a list of courses (picklable, for the process pool)."""
+    return list(iter_course_file(file_path))
+
 def load_and_scrape_html_file(file_path):
     """
     Loads an HTML file and scrapes course data from it.
@@ -96,21 +133,42 @@ def load_and_scrape_html_file(file_path):
         print(f"Error reading file {file_path}: {e}")
         return []
 
-if __name__ == "__main__":
-    
-    departments =["chemical", "electrical", "metallurgy", "civil", "computer_science", "aerospace", "economics", "energy", "digital_health", "data_science", "ent", "ieor", "environmental", "math", "mechanical", "physics", "chemistry", "biology", "climate_studies", "educational_tech", "gnr", "earth_sciences", "humanities", "idc", "management", "syscon", "policy_studies", "technology_alternatives", "liberal_education"]
+def department_documents():
+    """The departments collection as the app knows it: the supported departments keyed by name."""
+    return [{"id": name, "name": name, "code": code} for name, code in departments_names_to_codes.items()]
 
-    for branch in departments:
-        html_file_path = os.path.join(os.path.dirname(__file__), f"department_data_raw/{branch}.html")
-        
-        courses = load_and_scrape_html_file(html_file_path)
-        
-        if courses:
-            # print(courses[0])
-            df = pd.DataFrame(courses, index=None)
-            df = df.drop_duplicates(subset=['course_code'])
-            print(f"Found {len(df)} courses for {branch}")
-            # Optionally save to CSV
-            df.to_csv(os.path.join(os.path.dirname(__file__), f"department_data_processed/{branch}_data.csv"), index=False)
-        else:
-            print("No course data found.")
+if __name__ == "__main__":
+    base_dir = os.path.dirname(__file__)
+    processed_dir = os.path.join(base_dir, "department_data_processed")
+    manifest = ScrapeManifest(os.path.join(processed_dir, SCRAPE_MANIFEST_NAME))
+    jobs = [(os.path.join(base_dir, f"department_data_raw/{branch}.html"),) for branch in department_branches]
+    branch_of = {job[0]: branch for job, branch in zip(jobs, department_branches)}
+
+    # Departments that were not re-scraped keep the courses of the previous artifact
+    courses_by_branch = {}
+    if os.path.exists(DEFAULT_ARTIFACT_PATH):
+        for course in read_catalogue_artifact(DEFAULT_ARTIFACT_PATH)[0]:
+            courses_by_branch.setdefault(course["department"], []).append(course)
+
+    for (html_file_path,), courses in scrape_changed_files(scrape_course_file, jobs, manifest):
+        branch = branch_of[html_file_path]
+        if not courses:
+            print(f"No course data found for {branch}.")
+            continue
+        if os.path.basename(html_file_path) not in manifest.dirty and branch in courses_by_branch:
+            continue
+        # One row per course code, the first listing wins
+        unique_courses = {}
+        for course in courses:
+            unique_courses.setdefault(course["course_code"], {**course, "department": branch})
+        courses_by_branch[branch] = list(unique_courses.values())
+        print(f"Found {len(unique_courses)} courses for {branch}")
+
+    version = update_catalogue_artifact(
+        DEFAULT_ARTIFACT_PATH,
+        courses=[course for branch_courses in courses_by_branch.values() for course in branch_courses],
+        departments=department_documents(),
+    )
+    print(f"Catalogue artifact {version} written to {DEFAULT_ARTIFACT_PATH}")
+    manifest.save()
+    print(f"Departments changed since the last upload: {', '.join(manifest.dirty) or 'none'}")
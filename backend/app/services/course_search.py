@@ -0,0 +1,142 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Set, Tuple
+
+from app.api.v1.schemas import Course
+from app.services.course_index import normalize_code
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Scores of the ways a course can match a query; higher ranks first
+EXACT_CODE_SCORE = 100
+CODE_PREFIX_SCORE = 50
+NAME_TOKEN_SCORE = 10
+NAME_PREFIX_SCORE = 5
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into lowercase alphanumeric tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _prefix_range(sorted_values: List[str], prefix: str) -> Tuple[int, int]:
+    start = bisect_left(sorted_values, prefix)
+    end = bisect_left(sorted_values, prefix + "\U0010ffff", lo=start)
+    return start, end
+
+
+class CourseSearchIndex:
+    """
+    Search index over the course catalogue.
+
+    Course names are tokenized into an inverted index whose vocabulary is kept
+    sorted, so a query token matches every indexed token it is a prefix of
+    ("thermo" finds "thermodynamics"). Normalized course codes are kept sorted
+    for prefix lookups, so "EE 2", "ee2" and "EE2" all find EE 2xx courses.
+
+    `update` applies only the difference from the previous catalogue, so a
+    snapshot refresh where little changed is cheap: the new snapshot starts
+    from a `copy` of the previous one's index, which keeps serving unchanged.
+    """
+
+    def __init__(self):
+        self._courses: Dict[str, Course] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._codes: List[Tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._courses)
+
+    def copy(self) -> "CourseSearchIndex":
+        """An independent copy, much cheaper than tokenizing and sorting the catalogue again."""
+        index = CourseSearchIndex()
+        index._courses = dict(self._courses)
+        index._postings = {token: set(posting) for token, posting in self._postings.items()}
+        index._vocabulary = list(self._vocabulary)
+        index._codes = list(self._codes)
+        return index
+
+    def update(self, courses: List[Course]) -> None:
+        """Brings the index in line with `courses`, touching only added, changed and removed courses."""
+        incoming = {course.id: course for course in courses}
+        for course_id, course in list(self._courses.items()):
+            if incoming.get(course_id) != course:
+                self._remove(course)
+        for course_id, course in incoming.items():
+            if course_id not in self._courses:
+                self._add(course)
+
+    def _add(self, course: Course) -> None:
+        self._courses[course.id] = course
+        for token in set(tokenize(course.course_name)):
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                insort(self._vocabulary, token)
+            posting.add(course.id)
+        insort(self._codes, (normalize_code(course.course_code), course.id))
+
+    def _remove(self, course: Course) -> None:
+        del self._courses[course.id]
+        for token in set(tokenize(course.course_name)):
+            posting = self._postings[token]
+            posting.discard(course.id)
+            if not posting:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+        code = (normalize_code(course.course_code), course.id)
+        del self._codes[bisect_left(self._codes, code)]
+
+    def _match_code(self, query: str, scores: Dict[str, int]) -> None:
+        code = normalize_code(query)
+        if not code:
+            return
+        start, end = self._code_range(code)
+        for normalized, course_id in self._codes[start:end]:
+            score = EXACT_CODE_SCORE if normalized == code else CODE_PREFIX_SCORE
+            scores[course_id] = max(scores.get(course_id, 0), score)
+
+    def _code_range(self, code: str) -> Tuple[int, int]:
+        start = bisect_left(self._codes, (code,))
+        end = bisect_left(self._codes, (code + "\U0010ffff",), lo=start)
+        return start, end
+
+    def _match_name(self, query: str, scores: Dict[str, int]) -> None:
+        tokens = tokenize(query)
+        if not tokens:
+            return
+        name_scores: Dict[str, int] = {}
+        for position, token in enumerate(tokens):
+            token_scores: Dict[str, int] = {}
+            start, end = _prefix_range(self._vocabulary, token)
+            for indexed_token in self._vocabulary[start:end]:
+                score = NAME_TOKEN_SCORE if indexed_token == token else NAME_PREFIX_SCORE
+                for course_id in self._postings[indexed_token]:
+                    token_scores[course_id] = max(token_scores.get(course_id, 0), score)
+            # Every query token has to match some token of the name
+            if position == 0:
+                name_scores = token_scores
+            else:
+                name_scores = {
+                    course_id: score + token_scores[course_id]
+                    for course_id, score in name_scores.items()
+                    if course_id in token_scores
+                }
+            if not name_scores:
+                return
+        for course_id, score in name_scores.items():
+            scores[course_id] = scores.get(course_id, 0) + score
+
+    def search(self, query: str, limit: int = 20) -> List[Course]:
+        """Returns up to `limit` courses matching `query`, best matches first."""
+        scores: Dict[str, int] = {}
+        self._match_code(query, scores)
+        self._match_name(query, scores)
+        ranked = heapq.nsmallest(
+            limit,
+            scores.items(),
+            key=lambda item: (-item[1], self._courses[item[0]].course_code, item[0]),
+        )
+        return [self._courses[course_id] for course_id, _ in ranked]
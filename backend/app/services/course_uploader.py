@@ -1,50 +1,76 @@
-from app.db.session import db
+from app.db.session import get_client
+from app.services.cache_notifier import notify_catalogue_changed
+from app.services.batch_writer import FIRESTORE_BATCH_LIMIT, WriteSummary, write_in_batches
+from app.services.course_index import latest_listings
+from app.services.firestore_sync import SyncPlan, sync_collection
+from app.services.scrape_manifest import ScrapeManifest
+from app.services.course_scraper import SCRAPE_MANIFEST_NAME
+from app.services.catalogue_artifact import DEFAULT_ARTIFACT_PATH
+from app.services.upload_pipeline import UploadCheckpoint, upload_artifact
 from pathlib import Path
-import csv
-from typing import Dict, Any, Iterable
+import argparse
+from typing import Dict, Any, Iterable, Optional, Tuple
 import os
 
-def validate_course_data(course_data: Dict[str, str]) -> bool:
-    """Validates the course data against predefined rules."""
-    required_fields = ['course_code', 'course_name', 'course_type', 'slot']
-    missing = [k for k in required_fields if k not in course_data]
-    if missing:
-        # print(f"Missing required fields: {', '.join(missing)}")
-        return False
-    return True
-
-def clean_course_data(course_data):
-    """Cleans the course data by removing whitespaces."""
-    for field in ['course_code', 'course_name', 'course_type', 'slot']:
-        course_data[field] = course_data[field].strip()
-
-    return course_data
-
-def upload_course_data(course_data):
-    """Uploads the cleaned and validated course data to the database."""
-    try:
-        db.collection("courses").add(course_data)
-        print(f"{course_data['course_name']} uploaded successfully.")
-    except Exception as e:
-        print(f"Error uploading course data: {e}")
+# Kept next to the catalogue artifact while an upload is unfinished
+UPLOAD_CHECKPOINT_NAME = "upload_checkpoint.json"
+
+def upload_courses(client, courses: Iterable[Dict[str, str]], batch_size: int = FIRESTORE_BATCH_LIMIT, max_workers: int = 4) -> WriteSummary:
+    """
+    Uploads the cleaned and validated courses to the database in batched,
+    concurrently committed writes (one auto-id document per course).
+    """
+    collection = client.collection("courses")
+    operations = (("set", collection.document(), course) for course in courses)
+    return write_in_batches(client, operations, batch_size=batch_size, max_workers=max_workers)
+
+def courses_by_document_id(courses: Iterable[Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Keys the courses by their deterministic document id. A course listed by
+    several departments collapses into one document (the last one read wins).
+    """
+    return latest_listings(courses)
+
+def sync_courses(client, courses: Iterable[Dict[str, str]], manifest_path: Optional[str] = None, dry_run: bool = False) -> Tuple[SyncPlan, Optional[WriteSummary]]:
+    """
+    Makes the courses collection match `courses`: only new or changed courses
+    are written and courses that are no longer offered are deleted.
+    """
+    return sync_collection(client, "courses", courses_by_document_id(courses), manifest_path=manifest_path, dry_run=dry_run)
 
 if __name__ == "__main__":
-    
-    departments =["chemical", "electrical", "metallurgy", "civil", "computer_science", "aerospace", "economics", "energy", "digital_health", "data_science", "ent", "ieor", "environmental", "math", "mechanical", "physics", "chemistry", "biology", "climate_studies", "educational_tech", "gnr", "earth_sciences", "humanities", "idc", "management", "syscon", "policy_studies", "technology_alternatives", "liberal_education"]
-
-
-    courses_data = []
-    for branch in departments:
-        file_path = os.path.join(os.path.dirname(__file__), f"department_data_processed/{branch}_data.csv")
-        with open(file_path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                courses_data.append(dict(row))
-        
-    for raw_course in courses_data:
-        if validate_course_data(raw_course):
-            course = clean_course_data(raw_course)
-            upload_course_data(course)
-        else:
-            print(f"Invalid course data: {raw_course}")
-    print("All course data upload completed.")
+    parser = argparse.ArgumentParser(description="Upload the scraped catalogue artifact to Firestore.")
+    parser.add_argument("--mode", choices=["sync", "append"], default="sync",
+                        help="sync: write only changes under deterministic ids (default); append: add every row under a new id")
+    parser.add_argument("--manifest", help="Local content hash manifest to diff against instead of reading Firestore")
+    parser.add_argument("--dry-run", action="store_true", help="Only print what sync would change")
+    parser.add_argument("--only-if-dirty", action="store_true",
+                        help="Skip the upload when the scraper saw no department page change since the last upload")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent batch writers")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an interrupted upload and start over")
+    args = parser.parse_args()
+
+    processed_dir = os.path.join(os.path.dirname(__file__), "department_data_processed")
+    scrape_manifest = ScrapeManifest(os.path.join(processed_dir, SCRAPE_MANIFEST_NAME))
+    if args.only_if_dirty and not scrape_manifest.dirty:
+        print("No department changed since the last upload, nothing to do.")
+        raise SystemExit(0)
+    print(f"Departments changed since the last upload: {', '.join(scrape_manifest.dirty) or 'unknown'}")
+
+    checkpoint_path = os.path.join(processed_dir, UPLOAD_CHECKPOINT_NAME)
+    if args.restart:
+        UploadCheckpoint(checkpoint_path, key="").clear()
+    result = upload_artifact(
+        get_client(), DEFAULT_ARTIFACT_PATH, mode=args.mode, checkpoint_path=checkpoint_path,
+        manifest_path=args.manifest, dry_run=args.dry_run, max_workers=args.workers,
+    )
+    print(result.report())
+
+    summary = result.summary
+    if summary is not None:
+        print("All course data upload completed.")
+        if summary.written:
+            notify_catalogue_changed()
+        if not summary.failed and scrape_manifest.dirty:
+            scrape_manifest.clear_dirty()
+            scrape_manifest.save()
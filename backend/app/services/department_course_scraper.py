@@ -2,45 +2,72 @@ import json
 import pandas as pd
 from bs4 import BeautifulSoup
 import os
-from app.db.session import db
-
-departments_names_to_codes = {
-    "Chemical Engineering": "CL", 
-    "Aerospace Engineering": "AE",
-    "Civil Engineering": "CE",
-    "Computer Science and Engineering": "CS",
-    "Electrical Engineering": "EE",
-    "Energy Science and Engineering": "EN",
-    "Engineering Physics": "EP",
-    "Metallurgical Engineering and Materials Science": "MM",
-    # "Physics": "PH",
-    "Environmental Science and Engineering":"ES",
-    "Mechanical Engineering":"ME",
-    "Industrial Engineering and Operations Research":"IE",
-    "Economics":"EC",
-    "Chemistry":"CH",
-    "Mathematics":"MA"
-}
-
-departments_to_skip = ["Physics", "Humanities and Social Sciences", "Centre for Liberal Education (CLEdu)"]
-
-departments_names_to_divisions={
-    "Chemical Engineering": "D4", 
-    "Aerospace Engineering": "D2",
-    "Civil Engineering": "D2",
-    "Computer Science and Engineering": "D3",
-    "Electrical Engineering": "D4",
-    "Energy Science and Engineering": "D1",
-    "Engineering Physics": "D2",
-    "Metallurgical Engineering and Materials Science": "D3",
-    # "Physics": "PH",
-    "Environmental Science and Engineering":"D1",
-    "Mechanical Engineering":"D1",
-    "Industrial Engineering and Operations Research":"D2",
-    "Economics":"D3",
-    "Chemistry":"D1",
-    "Mathematics":"D1"
-}
+import sys
+from app.core.departments import departments_names_to_codes, departments_names_to_divisions, departments_to_skip
+from app.db.session import get_client
+from app.services.cache_notifier import notify_catalogue_changed
+from app.services.catalogue_artifact import DEFAULT_ARTIFACT_PATH, update_catalogue_artifact
+from app.services.firestore_sync import sync_collection
+from app.services.scrape_manifest import ScrapeManifest
+from app.services.scraping_pipeline import cell_text, has_ancestor_table, iter_rows, row_cells, scrape_changed_files
+
+DEPARTMENT_TABLE_ID = 'example'
+
+def parse_department_row(cols, isFirstYear):
+    """
+    Picks the department and course code out of one row of the department
+    courses table, or returns None if the row should be skipped.
+
+    Args:
+        cols (list): Stripped text of each cell of the row.
+        isFirstYear (bool): Whether the page lists first year (division based) courses.
+
+    Returns:
+        tuple: (department name, course code), or None.
+    """
+    DEPARTMENT_COLUMN_INDEX = 4
+    CODE_COLUMN_INDEX = 8 if not isFirstYear else 9
+    DIVISION_COLUMN_INDEX = 8
+
+    if not cols:
+        print("Empty columns, skipping....")
+        return None
+
+    if len(cols) <= 8:
+        print("Less than 8 columns, skipping....")
+        return None
+
+    department = cols[DEPARTMENT_COLUMN_INDEX]
+
+    if not department:
+        print("Department is empty, skipping....")
+        return None
+
+    if isFirstYear:
+        if department not in departments_names_to_divisions:
+            print(f"Unknown department '{department}', skipping...")
+            return None
+
+        division = departments_names_to_divisions[department]
+        division_asc = cols[DIVISION_COLUMN_INDEX]
+        if division != division_asc or len(cols) <= CODE_COLUMN_INDEX:
+            return None
+
+    code = cols[CODE_COLUMN_INDEX]
+    if not code:
+        return None
+
+    if department in departments_to_skip:
+        return None
+
+    if department not in departments_names_to_codes:
+        print(f"Unknown department '{department}', skipping...")
+        return None
+
+    #To convert from branch name to branch code
+    # department = departments_names_to_codes[department]
+
+    return department, code
 
 def scrape_course_data(html_content, isFirstYear):
     """
@@ -55,64 +82,44 @@ def scrape_course_data(html_content, isFirstYear):
     soup = BeautifulSoup(html_content, 'lxml')
     department_courses: dict[str, set[str]] = {}
 
-    table = soup.find('table', id='example')
+    table = soup.find('table', id=DEPARTMENT_TABLE_ID)
     if table is None:
         print("Error: Table with id 'example' not found.")
         return []
-    
-    DEPARTMENT_COLUMN_INDEX = 4
-    CODE_COLUMN_INDEX = 8 if not isFirstYear else 9
-    DIVISION_COLUMN_INDEX = 8
 
     table_body = table.find('tbody') or table
 
     for row in table_body.find_all('tr'):
-        cols = row.find_all('td')
-        if not cols:
-            print("Empty columns, skipping....")
-            continue 
-
-        if len(cols) <= 8:
-            print("Less than 8 columns, skipping....")
-            continue
-        
-        department= cols[DEPARTMENT_COLUMN_INDEX].get_text(strip=True)
+        cols = [col.get_text(strip=True) for col in row.find_all('td')]
+        parsed = parse_department_row(cols, isFirstYear)
+        if parsed:
+            department, code = parsed
+            department_courses.setdefault(department, set()).add(code)
 
-        if not department:
-            print("Department is empty, skipping....")
-            continue
-        
-        if isFirstYear:
-            if department not in departments_names_to_divisions:
-                print(f"Unknown department '{department}', skipping...")
-                continue
-
-            division = departments_names_to_divisions[department]
-            division_asc = cols[DIVISION_COLUMN_INDEX].get_text(strip=True)
-            if division != division_asc:
-                # print(f"Division mismatch for {department}: {division} != {division_asc}, skipping...")
-                # break
-                continue
-
-
-        code = cols[CODE_COLUMN_INDEX].get_text(strip=True)
-        if not code:
-            continue
-        
-        if department in departments_to_skip:
-            continue
+    return department_courses
 
-        if department not in departments_names_to_codes:
-            print(f"Unknown department '{department}', skipping...")
-            continue
-        
-        #To convert from branch name to branch code
-        # department = departments_names_to_codes[department]
+def is_first_year(semester: int) -> bool:
+    return semester/2 <= 1
+
+def scrape_department_course_file(file_path, semester: int):
+    """
+    Streams a semester's department courses page, materializing only the rows
+    of the courses table instead of the whole document.
 
-        if department not in department_courses:
-            department_courses[department] = set()
-        department_courses[department].add(code)
+    Args:
+        file_path (str): Path to the HTML file
+        semester (int): Semester the page lists courses for
 
+    Returns:
+        dict: Department name -> set of course codes
+    """
+    isFirstYear = is_first_year(semester)
+    department_courses: dict[str, set[str]] = {}
+    for row in iter_rows(file_path, lambda row: has_ancestor_table(row, DEPARTMENT_TABLE_ID)):
+        parsed = parse_department_row([cell_text(col) for col in row_cells(row)], isFirstYear)
+        if parsed:
+            department, code = parsed
+            department_courses.setdefault(department, set()).add(code)
     return department_courses
 
 def load_and_scrape_html_file(file_path, semester: int):
@@ -125,7 +132,7 @@ def load_and_scrape_html_file(file_path, semester: int):
     Returns:
         list: A list of dictionaries containing course data
     """
-    isFirstYear = True if semester/2 <= 1 else False
+    isFirstYear = is_first_year(semester)
     try:
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
             html_content = f.read()
@@ -137,39 +144,107 @@ def load_and_scrape_html_file(file_path, semester: int):
         print(f"Error reading file {file_path}: {e}")
         return []
 
-def uploadDataToFireStore(departments_data, semesters):
+def build_department_documents(scraped_data, semesters):
     """
-    Uploads scraped course data to Firestore.
+    Turns the per-semester scrape results into one document per department.
 
     Args:
-        scraped_data (list): List of scraped course data.
-        semesters (list): List of semesters corresponding to the data.
+        scraped_data (list): For each semester, the list of {department: courses} dicts scraped from its pages.
+        semesters (list): The semesters corresponding to the data.
 
     Returns:
-        bool: True if upload was successful, False otherwise.
+        dict: Department name -> {semester (str): sorted course codes}.
     """
-    departments_data={}
+    departments_data = {}
     for semester_num, semester_data_list in zip(semesters, scraped_data):
         for department_group_dict in semester_data_list:
             for department_name, courses in department_group_dict.items():
-                
-                if department_name not in departments_data:
-                    departments_data[department_name] = {}
-                
-                unique_courses = sorted(list(set(courses)))
-                departments_data[department_name][str(semester_num)] = unique_courses
-    collection_ref = db.collection('department_courses')
+                semester_courses = departments_data.setdefault(department_name, {}).setdefault(str(semester_num), set())
+                # A department can show up in several streams' pages for the same semester
+                semester_courses.update(courses)
+
+    return {
+        department_name: {semester: sorted(courses) for semester, courses in semester_map.items()}
+        for department_name, semester_map in departments_data.items()
+    }
+
+def uploadDataToFireStore(scraped_data, semesters, manifest_path=None, dry_run=False):
+    """
+    Syncs scraped course data to Firestore, writing only the departments whose
+    semester plans changed and deleting departments that are no longer scraped.
+
+    Args:
+        scraped_data (list): List of scraped course data.
+        semesters (list): List of semesters corresponding to the data.
+        manifest_path (str): Optional local content hash manifest to diff against instead of reading Firestore.
+        dry_run (bool): Only print what would change.
+
+    Returns:
+        bool: True if upload was successful, False otherwise.
+    """
+    departments_data = build_department_documents(scraped_data, semesters)
+
+    print("Starting data sync to Firestore...")
+    plan, summary = sync_collection(get_client(), 'department_courses', departments_data, manifest_path=manifest_path, dry_run=dry_run)
+    print(plan.report())
+    if summary is None:
+        return True
+
+    print(summary.report())
+    if summary.written:
+        notify_catalogue_changed()
+    return summary.failed == 0
+
+
+def publish_department_courses(scraped_files, semesters, manifest, artifact_path=DEFAULT_ARTIFACT_PATH):
+    """
+    Builds the semester plans from every scraped page, writes them into the
+    catalogue artifact and syncs them to Firestore if a page changed.
+
+    Nothing is written if any page failed to scrape: plans built without it
+    would drop that page's semesters, and the sync would delete the
+    departments only it listed.
 
-    print("Starting data upload to Firestore...")
+    Args:
+        scraped_files (iterable): (job, courses or None) pairs from scrape_changed_files, jobs being (path, semester).
+        semesters (list): The semesters the pages cover.
+        manifest (ScrapeManifest): Manifest of the scraped pages, saved as it is updated.
+        artifact_path (str): Catalogue artifact to store the plans in.
+
+    Returns:
+        bool: True if the plans were published (or nothing changed), False otherwise.
+    """
+    semester_courses = {semester: [] for semester in semesters}
+    failed_pages = []
+    for (html_file_path, semester), scraped_courses_from_stream in scraped_files:
+        if scraped_courses_from_stream is None:
+            failed_pages.append(html_file_path)
+        elif scraped_courses_from_stream:
+            semester_courses[semester].append(scraped_courses_from_stream)
+    manifest.save()
+
+    if failed_pages:
+        print(f"Not publishing the department courses, these pages failed to scrape: {', '.join(sorted(failed_pages))}")
+        return False
 
-    for department_name, semesters in departments_data.items():
-        try:
-            doc_ref = collection_ref.document(department_name)
-            doc_ref.set(semesters)
-            
-            print(f"✅ Successfully uploaded data for: {department_name}")
-        except Exception as e:
-            print(f"❌ Error uploading data for {department_name}: {e}")
+    scraped_data=[]
+    for semester in semesters:
+        if not semester_courses[semester]:
+            print(f"No course data found for in semester {semester}")
+        # Keep one entry per semester so scraped_data stays aligned with semesters
+        scraped_data.append(semester_courses[semester])
+    # The semester plans go into the catalogue artifact too, so it alone can serve the API
+    update_catalogue_artifact(artifact_path, department_courses=build_department_documents(scraped_data, semesters))
+    if not manifest.dirty:
+        print("No semester page changed since the last upload, nothing to do.")
+        return True
+
+    print(f"Pages changed since the last upload: {', '.join(manifest.dirty)}")
+    uploadStats = uploadDataToFireStore(scraped_data, semesters)
+    if uploadStats:
+        manifest.clear_dirty()
+        manifest.save()
+    return uploadStats
 
 
 if __name__ == "__main__":
@@ -180,35 +255,21 @@ if __name__ == "__main__":
     raw_base = os.path.join(base_dir, "api", "v1", "endpoints", "department_courses_raw")
     processed_base = os.path.join(base_dir, "api", "v1", "endpoints", "department_courses_processed")
 
-    scraped_data=[]
-
-    for semester in semesters:
-        streams =["btech", "bs"]
-        all_semester_courses=[]
-
-        for stream in streams:
-            html_file_path = os.path.join(raw_base, f"sem_{semester}_{stream}.html")
-
-            try:
-                scraped_courses_from_stream = load_and_scrape_html_file(html_file_path, semester)
-                
-                if scraped_courses_from_stream:
-                    all_semester_courses.append(scraped_courses_from_stream)
-
-            except FileNotFoundError:
-                print(f"  > Warning: File not found, skipping: {html_file_path}")
-            except Exception as e:
-                # Catch other potential errors during scraping
-                print(f"  > Error processing {html_file_path}: {e}")
-            # all_semester_courses.append((load_and_scrape_html_file(html_file_path)))
-        
-        if all_semester_courses:
-            # print(f"SEMESTER{semester}: ",all_semester_courses)
-            scraped_data.append(all_semester_courses)
-        else:
-            print(f"No course data found for in semester {semester}")
-    # print(scraped_data)
-    uploadStats = uploadDataToFireStore(scraped_data, semesters)
+    streams =["btech", "bs"]
+    jobs = [
+        (os.path.join(raw_base, f"sem_{semester}_{stream}.html"), semester)
+        for semester in semesters
+        for stream in streams
+    ]
+
+    manifest = ScrapeManifest(os.path.join(processed_base, "scrape_manifest.json"))
+    scraped_files = scrape_changed_files(
+        scrape_department_course_file, jobs, manifest,
+        encode=lambda courses: {department: sorted(codes) for department, codes in courses.items()},
+        decode=lambda courses: {department: set(codes) for department, codes in courses.items()},
+    )
+    if not publish_department_courses(scraped_files, semesters, manifest):
+        sys.exit(1)
 
     # departments_data = {}
 
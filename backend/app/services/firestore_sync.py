@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from google.cloud.firestore_v1.client import Client
+
+from app.services.batch_writer import WriteSummary, write_in_batches
+from app.services.course_index import normalize_code
+
+logger = logging.getLogger(__name__)
+
+Document = Dict[str, Any]
+
+
+def content_hash(data: Document) -> str:
+    """Stable hash of a document's content, independent of key order."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def course_document_id(course_code: str) -> str:
+    """Deterministic courses document id, e.g. "CS 101" -> "CS101", so re-uploads overwrite instead of duplicating."""
+    return normalize_code(course_code)
+
+
+@dataclass
+class SyncPlan:
+    """Writes needed to make a collection match the desired documents"""
+    inserts: Dict[str, Document] = field(default_factory=dict)
+    updates: Dict[str, Document] = field(default_factory=dict)
+    deletes: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.inserts or self.updates or self.deletes)
+
+    def report(self) -> str:
+        return (
+            f"{len(self.inserts)} to insert, {len(self.updates)} to update, "
+            f"{len(self.deletes)} to delete, {self.unchanged} unchanged."
+        )
+
+
+def plan_sync(desired: Dict[str, Document], existing_hashes: Dict[str, str]) -> SyncPlan:
+    """Compares the desired documents against the content hashes of the stored ones."""
+    plan = SyncPlan()
+    for doc_id, data in desired.items():
+        stored_hash = existing_hashes.get(doc_id)
+        if stored_hash is None:
+            plan.inserts[doc_id] = data
+        elif stored_hash != content_hash(data):
+            plan.updates[doc_id] = data
+        else:
+            plan.unchanged += 1
+    plan.deletes = sorted(doc_id for doc_id in existing_hashes if doc_id not in desired)
+    return plan
+
+
+def read_existing_hashes(client: Client, collection_name: str) -> Dict[str, str]:
+    """Streams a collection once and hashes what is stored in each document."""
+    return {doc.id: content_hash(doc.to_dict() or {}) for doc in client.collection(collection_name).stream()}
+
+
+def load_manifest(path: str) -> Optional[Dict[str, str]]:
+    """Reads a document id -> content hash manifest, or None if there is none yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(path: str, hashes: Dict[str, str]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+
+
+def apply_sync(client: Client, collection_name: str, plan: SyncPlan, **batch_options) -> WriteSummary:
+    """Writes the inserted and changed documents and deletes the removed ones."""
+    collection = client.collection(collection_name)
+    operations: Iterable[Tuple[str, Any, Optional[Document]]] = [
+        *(("set", collection.document(doc_id), data) for doc_id, data in {**plan.inserts, **plan.updates}.items()),
+        *(("delete", collection.document(doc_id), None) for doc_id in plan.deletes),
+    ]
+    return write_in_batches(client, operations, **batch_options)
+
+
+def sync_collection(
+    client: Client,
+    collection_name: str,
+    desired: Dict[str, Document],
+    manifest_path: Optional[str] = None,
+    dry_run: bool = False,
+    **batch_options,
+) -> Tuple[SyncPlan, Optional[WriteSummary]]:
+    """
+    Makes `collection_name` hold exactly the `desired` documents, writing only
+    what changed. The stored state comes from the local manifest if one exists
+    (no reads at all), otherwise from one stream of the collection. The manifest
+    is rewritten after a fully successful sync.
+
+    Returns:
+        tuple: The plan, and the write summary (None on a dry run).
+    """
+    existing = load_manifest(manifest_path) if manifest_path else None
+    if existing is None:
+        existing = read_existing_hashes(client, collection_name)
+
+    if not desired and existing:
+        raise ValueError(f"Refusing to delete every document in {collection_name}: nothing to sync")
+
+    plan = plan_sync(desired, existing)
+    if dry_run:
+        return plan, None
+
+    summary = apply_sync(client, collection_name, plan, **batch_options)
+    if manifest_path:
+        if summary.failed:
+            logger.warning("Not updating %s: %d writes failed.", manifest_path, summary.failed)
+        else:
+            save_manifest(manifest_path, {doc_id: content_hash(data) for doc_id, data in desired.items()})
+    return plan, summary
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Set
+
+MANIFEST_VERSION = 1
+
+
+def file_digest(file_path: str, chunk_size: int = 1 << 16) -> str:
+    """sha256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ScrapeManifest:
+    """
+    Remembers the content hash of every raw HTML file a scraper parsed along
+    with the records it produced, so the next run only re-parses files whose
+    bytes changed and reuses the cached records for the rest.
+
+    Entries whose records changed are marked dirty. Dirty marks accumulate
+    across scrapes until an uploader has pushed them and calls `clear_dirty`,
+    so uploaders can tell whether there is anything new to send.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self._entries = data.get("files", {})
+                self._dirty = set(data.get("dirty", []))
+
+    @property
+    def dirty(self) -> List[str]:
+        return sorted(self._dirty)
+
+    def cached_records(self, key: str, digest: str) -> Optional[List[Any]]:
+        """Returns the records parsed from `key` if its content hash is still `digest`."""
+        entry = self._entries.get(key)
+        if entry is None or entry["sha256"] != digest:
+            return None
+        return entry["records"]
+
+    def update(self, key: str, digest: str, records: List[Any]) -> None:
+        """Stores freshly parsed records, marking the entry dirty if they differ from the cached ones."""
+        previous = self._entries.get(key)
+        if previous is None or previous["records"] != records:
+            self._dirty.add(key)
+        self._entries[key] = {"sha256": digest, "records": records}
+
+    def clear_dirty(self, keys: Optional[List[str]] = None) -> None:
+        """Marks the given entries (all by default) as uploaded."""
+        if keys is None:
+            self._dirty.clear()
+        else:
+            self._dirty.difference_update(keys)
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "dirty": self.dirty, "files": self._entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,112 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from lxml import etree
+
+from app.services.scrape_manifest import ScrapeManifest, file_digest
+
+
+def cell_text(cell, separator: str = "") -> str:
+    """
+    Text of a table cell with every text node stripped and empty ones dropped,
+    the same as BeautifulSoup's get_text(separator, strip=True).
+    """
+    return separator.join(text.strip() for text in cell.itertext() if text.strip())
+
+
+def row_cells(row) -> List[Any]:
+    """The td elements of a row, nested ones included like BeautifulSoup's find_all('td')."""
+    return list(row.iter("td"))
+
+
+def iter_rows(file_path: str, match: Callable[[Any], bool]) -> Iterator[Any]:
+    """
+    Streams an HTML file and yields the `tr` elements for which `match` is true.
+
+    Only the rows are materialized: each row is cleared once the consumer moves
+    on, along with the already processed rows before it, so memory stays flat
+    however large the page is. Read what you need from a row before asking for
+    the next one.
+    """
+    context = etree.iterparse(file_path, events=("end",), tag="tr", html=True, recover=True, encoding="utf-8")
+    for _, row in context:
+        if match(row):
+            yield row
+        row.clear(keep_tail=True)
+        parent = row.getparent()
+        while parent is not None and row.getprevious() is not None:
+            del parent[0]
+
+
+def has_ancestor_table(row, table_id: str) -> bool:
+    return any(table.get("id") == table_id for table in row.iterancestors("table"))
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def scrape_in_parallel(
+    scrape_file: Callable[..., List[Any]],
+    jobs: Iterable[Tuple[Any, ...]],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[Tuple[Any, ...], Optional[Any]]]:
+    """
+    Runs `scrape_file(*job)` for every job across a process pool and yields
+    (job, records) as each file finishes, so later stages can start on the
+    first files while the rest are still being parsed.
+
+    `scrape_file` must be a module level function so it can be sent to the
+    worker processes. A file that fails is reported and yields None.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or default_workers()) as executor:
+        futures = {executor.submit(scrape_file, *job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                yield job, future.result()
+            except Exception as e:
+                print(f"Error scraping {job[0]}: {e}")
+                yield job, None
+
+
+def scrape_changed_files(
+    scrape_file: Callable[..., Any],
+    jobs: Iterable[Tuple[Any, ...]],
+    manifest: ScrapeManifest,
+    max_workers: Optional[int] = None,
+    encode: Callable[[Any], Any] = lambda records: records,
+    decode: Callable[[Any], Any] = lambda records: records,
+) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+    """
+    Like scrape_in_parallel, but files whose bytes match the manifest are not
+    parsed again: their cached records are yielded straight away and only the
+    changed files go to the process pool. The first item of every job is the
+    file path; the manifest is keyed by its file name.
+
+    `encode`/`decode` convert records to and from what is stored in the JSON
+    manifest. Files that fail to parse are not recorded, so they are retried
+    on the next run.
+    """
+    changed = {}
+    for job in jobs:
+        file_path = job[0]
+        try:
+            digest = file_digest(file_path)
+        except OSError as e:
+            print(f"Error reading {file_path}: {e}")
+            yield job, None
+            continue
+        cached = manifest.cached_records(os.path.basename(file_path), digest)
+        if cached is not None:
+            yield job, decode(cached)
+        else:
+            changed[job] = digest
+
+    if not changed:
+        return
+    for job, records in scrape_in_parallel(scrape_file, list(changed), max_workers):
+        if records is not None:
+            manifest.update(os.path.basename(job[0]), changed[job], encode(records))
+        yield job, records
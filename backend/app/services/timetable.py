@@ -0,0 +1,93 @@
+from itertools import combinations
+from typing import Dict, List, Sequence, Tuple
+from app.core.slots import COURSE_TYPES, canonical_slot
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri")
+DAY_START_MINUTES = 8 * 60
+DAY_END_MINUTES = 21 * 60
+BLOCK_MINUTES = 5
+BLOCKS_PER_DAY = (DAY_END_MINUTES - DAY_START_MINUTES) // BLOCK_MINUTES
+
+# Weekly meetings of every slot as (day, start, end). Theory slots 1-15 and lab
+# slots L1-L6, the values Course.slot allows. Keep in sync with the institute
+# timetable; the bitmasks below are derived from this table at import time.
+SLOT_MEETINGS: Dict[str, List[Tuple[str, str, str]]] = {
+    "1": [("Mon", "08:30", "09:25"), ("Tue", "09:30", "10:25"), ("Thu", "10:35", "11:30")],
+    "2": [("Mon", "09:30", "10:25"), ("Tue", "10:35", "11:30"), ("Thu", "11:35", "12:30")],
+    "3": [("Mon", "10:35", "11:30"), ("Tue", "11:35", "12:30"), ("Thu", "08:30", "09:25")],
+    "4": [("Mon", "11:35", "12:30"), ("Tue", "08:30", "09:25"), ("Thu", "09:30", "10:25")],
+    "5": [("Wed", "09:30", "10:55"), ("Fri", "09:30", "10:55")],
+    "6": [("Wed", "11:05", "12:30"), ("Fri", "11:05", "12:30")],
+    "7": [("Wed", "08:30", "09:25"), ("Fri", "08:30", "09:25")],
+    "8": [("Mon", "14:00", "15:25"), ("Thu", "14:00", "15:25")],
+    "9": [("Mon", "15:30", "16:55"), ("Thu", "15:30", "16:55")],
+    "10": [("Tue", "14:00", "15:25"), ("Fri", "14:00", "15:25")],
+    "11": [("Tue", "15:30", "16:55"), ("Fri", "15:30", "16:55")],
+    "12": [("Mon", "17:30", "18:55"), ("Thu", "17:30", "18:55")],
+    "13": [("Tue", "17:30", "18:55"), ("Fri", "17:30", "18:55")],
+    "14": [("Wed", "17:30", "18:55"), ("Mon", "19:00", "20:25")],
+    "15": [("Tue", "19:00", "20:25"), ("Thu", "19:00", "20:25")],
+    "L1": [("Mon", "14:00", "16:55")],
+    "L2": [("Tue", "14:00", "16:55")],
+    "L3": [("Wed", "14:00", "16:55")],
+    "L4": [("Thu", "14:00", "16:55")],
+    "L5": [("Fri", "14:00", "16:55")],
+    "L6": [("Wed", "09:30", "12:30")],
+}
+
+
+def _minutes(clock: str) -> int:
+    hours, minutes = clock.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def meeting_mask(day: str, start: str, end: str) -> int:
+    """
+    Bitmask of the 5 minute blocks a meeting occupies. Bit `d * BLOCKS_PER_DAY + b`
+    is block `b` (counted from DAY_START_MINUTES) of day `d`.
+    """
+    first = (_minutes(start) - DAY_START_MINUTES) // BLOCK_MINUTES
+    last = -(-(_minutes(end) - DAY_START_MINUTES) // BLOCK_MINUTES)  # round partial blocks up
+    if not (0 <= first < last <= BLOCKS_PER_DAY):
+        raise ValueError(f"Meeting {day} {start}-{end} is outside the timetable day")
+    offset = DAYS.index(day) * BLOCKS_PER_DAY
+    return ((1 << (last - first)) - 1) << (offset + first)
+
+
+def _slot_mask(meetings: List[Tuple[str, str, str]]) -> int:
+    mask = 0
+    for meeting in meetings:
+        mask |= meeting_mask(*meeting)
+    return mask
+
+
+SLOT_MASKS: Dict[str, int] = {slot: _slot_mask(meetings) for slot, meetings in SLOT_MEETINGS.items()}
+
+
+def slot_mask(slot: str) -> int:
+    """
+    Returns the weekly time-block bitmask of a slot, raising ValueError for
+    unknown slots. Accepts every spelling a course may have ("07" is slot 7).
+    """
+    for course_type in COURSE_TYPES:
+        canonical = canonical_slot(course_type, slot)
+        if canonical is not None:
+            return SLOT_MASKS[canonical]
+    raise ValueError(f"Unknown slot '{slot}'")
+
+
+def has_clash(slots: Sequence[str]) -> bool:
+    """True if any two of the slots overlap in time."""
+    occupied = 0
+    for slot in slots:
+        mask = slot_mask(slot)
+        if occupied & mask:
+            return True
+        occupied |= mask
+    return False
+
+
+def find_clashes(slots: Sequence[str]) -> List[Tuple[int, int]]:
+    """Returns the index pairs (i, j), i < j, of the slots that overlap in time."""
+    masks = [slot_mask(slot) for slot in slots]
+    return [(i, j) for (i, a), (j, b) in combinations(enumerate(masks), 2) if a & b]
@@ -0,0 +1,309 @@
+"""
+Streams the catalogue artifact into the courses collection:
+
+    read (chunks of the artifact) -> validate and clean (bulk, per chunk)
+    -> build write operations -> batch -> bounded queue -> writer threads
+
+Only a few chunks and `max_pending` batches are held in memory at once, and
+writes start as soon as the first batch is ready. A checkpoint records how
+far the writes got, so an interrupted upload resumes there instead of
+starting over.
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from app.services.batch_writer import FIRESTORE_BATCH_LIMIT, WriteOperation, WriteSummary, write_batches
+from app.services.bulk_validation import validate_courses
+from app.services.catalogue_artifact import COURSE_FIELDS, CatalogueArtifact
+from app.services.course_index import last_listing_positions
+from app.services.firestore_sync import content_hash, course_document_id, load_manifest, read_existing_hashes, save_manifest
+
+CHECKPOINT_VERSION = 1
+# Artifact rows validated together; large enough for the vectorized checks to pay off
+READ_CHUNK_SIZE = 5000
+COLLECTION_NAME = "courses"
+
+# (position of the course in the artifact, or None for deletes, operation)
+PositionedOperation = Tuple[Optional[int], WriteOperation]
+
+
+class UploadCheckpoint:
+    """
+    How far an upload got: every artifact row before `position` has been
+    written. Tied to a key (the artifact version and the upload mode) so a
+    checkpoint left by a different catalogue or mode is ignored.
+    """
+
+    def __init__(self, path: str, key: str):
+        self.path = path
+        self.key = key
+        self.position = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CHECKPOINT_VERSION and data.get("key") == key:
+                self.position = data["position"]
+
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CHECKPOINT_VERSION, "key": self.key, "position": self.position}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Forgets the checkpoint once an upload has completed."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+@dataclass
+class StreamedSync:
+    """What a streamed sync found to do, counted as it went"""
+    inserts: int = 0
+    updates: int = 0
+    deletes: int = 0
+    unchanged: int = 0
+    # Document id -> content hash of every desired course, the next manifest
+    hashes: Dict[str, str] = field(default_factory=dict)
+
+    def report(self) -> str:
+        return f"{self.inserts} to insert, {self.updates} to update, {self.deletes} to delete, {self.unchanged} unchanged."
+
+
+@dataclass
+class UploadResult:
+    """Outcome of an upload_artifact run"""
+    total: int
+    resumed_from: int = 0
+    rejected: Dict[str, int] = field(default_factory=dict)
+    sync: Optional[StreamedSync] = None
+    # None on a dry run
+    summary: Optional[WriteSummary] = None
+
+    def report(self) -> str:
+        lines = []
+        if self.resumed_from:
+            lines.append(f"Resumed at row {self.resumed_from} of {self.total}.")
+        rejected = sum(self.rejected.values())
+        if rejected:
+            reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.rejected.items()))
+            lines.append(f"Rejected rows by reason ({reasons}).")
+        if self.sync is not None:
+            lines.append(self.sync.report())
+        if self.summary is not None:
+            lines.append(self.summary.report())
+        return "\n".join(lines)
+
+
+def iter_valid_courses(
+    artifact: CatalogueArtifact,
+    chunk_size: int = READ_CHUNK_SIZE,
+    on_rejected: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yields (artifact row, cleaned course) for every valid row, validating a
+    chunk of rows at a time. Rejected rows go to `on_rejected`.
+    """
+    records = artifact.records()
+    start = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        valid, report = validate_courses(pd.DataFrame(chunk, index=range(start, start + len(chunk))))
+        if on_rejected is not None:
+            for rejected in report.to_records():
+                on_rejected(rejected)
+        # Column by column: much cheaper than DataFrame.to_dict("records")
+        columns = [valid[name].tolist() for name in COURSE_FIELDS]
+        courses = (dict(zip(COURSE_FIELDS, values)) for values in zip(*columns))
+        yield from zip(valid.index.tolist(), courses)
+        start += len(chunk)
+
+
+def append_operations(client, courses: Iterable[Tuple[int, Dict[str, str]]], start: int = 0) -> Iterator[PositionedOperation]:
+    """One auto-id document per course, skipping the rows before `start` (already written)."""
+    collection = client.collection(COLLECTION_NAME)
+    for position, course in courses:
+        if position >= start:
+            yield position, ("set", collection.document(), course)
+
+
+def sync_operations(
+    client,
+    courses: Iterable[Tuple[int, Dict[str, str]]],
+    existing_hashes: Dict[str, str],
+    sync: StreamedSync,
+    last_positions: Dict[str, int],
+    start: int = 0,
+) -> Iterator[PositionedOperation]:
+    """
+    Writes only new or changed courses under their deterministic ids, then
+    deletes the stored courses that were not seen. Only the last listing of
+    a course code is written, found up front in `last_positions` (see
+    last_listing_positions); a code whose last listing is invalid is not
+    written at all, as in the API's artifact loader. Rows before `start` are
+    not written again but still count as seen, so a resumed run doesn't delete them.
+    """
+    collection = client.collection(COLLECTION_NAME)
+    for position, course in courses:
+        doc_id = course_document_id(course["course_code"])
+        if last_positions.get(doc_id) != position:
+            continue
+        digest = sync.hashes[doc_id] = content_hash(course)
+        stored = existing_hashes.get(doc_id)
+        if stored == digest:
+            sync.unchanged += 1
+            continue
+        if stored is None:
+            sync.inserts += 1
+        else:
+            sync.updates += 1
+        if position >= start:
+            yield position, ("set", collection.document(doc_id), course)
+
+    if not sync.hashes and existing_hashes:
+        raise ValueError(f"Refusing to delete every document in {COLLECTION_NAME}: nothing to sync")
+    for doc_id in sorted(existing_hashes):
+        if doc_id not in sync.hashes:
+            sync.deletes += 1
+            yield None, ("delete", collection.document(doc_id), None)
+
+
+class _Progress:
+    """Advances the checkpoint past contiguous written batches and prints progress now and then."""
+
+    def __init__(self, total: int, checkpoint: Optional[UploadCheckpoint], interval: float, log: Callable[[str], None]):
+        self.total = total
+        self.checkpoint = checkpoint
+        self.interval = interval
+        self.log = log
+        self.position = checkpoint.position if checkpoint is not None else 0
+        # Batch index -> the artifact row its last course came from, + 1
+        self.batch_ends: Dict[int, int] = {}
+        self.done: Set[int] = set()
+        self.next_batch = 0
+        self.written = 0
+        self.started = time.perf_counter()
+        self.last_report = self.started
+
+    def batches(self, operations: Iterable[PositionedOperation], batch_size: int) -> Iterator[List[WriteOperation]]:
+        end = self.position
+        batch: List[WriteOperation] = []
+        index = 0
+        for position, operation in operations:
+            batch.append(operation)
+            if position is not None:
+                end = position + 1
+            if len(batch) == batch_size:
+                self.batch_ends[index] = end
+                index += 1
+                yield batch
+                batch = []
+        if batch:
+            self.batch_ends[index] = end
+            yield batch
+
+    def on_batch(self, index: int, batch: List[WriteOperation], error: Optional[Exception]) -> None:
+        if error is not None:
+            # The checkpoint never moves past a failed batch, so a rerun retries it
+            return
+        self.written += len(batch)
+        self.done.add(index)
+        advanced = False
+        while self.next_batch in self.done:
+            self.done.remove(self.next_batch)
+            self.position = max(self.position, self.batch_ends.pop(self.next_batch))
+            self.next_batch += 1
+            advanced = True
+        if advanced and self.checkpoint is not None:
+            self.checkpoint.position = self.position
+            self.checkpoint.save()
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            rate = self.written / (now - self.started)
+            self.log(f"{self.written} documents written ({rate:.0f} docs/s), done up to row {self.position} of {self.total}")
+
+
+def upload_artifact(
+    client,
+    artifact_path: str,
+    mode: str = "sync",
+    checkpoint_path: Optional[str] = None,
+    manifest_path: Optional[str] = None,
+    dry_run: bool = False,
+    batch_size: int = FIRESTORE_BATCH_LIMIT,
+    max_workers: int = 4,
+    max_pending: int = 8,
+    chunk_size: int = READ_CHUNK_SIZE,
+    progress_interval: float = 5.0,
+    log: Callable[[str], None] = print,
+) -> UploadResult:
+    """
+    Streams the courses of a catalogue artifact into Firestore.
+
+    Args:
+        mode: "sync" writes only changes under deterministic ids and deletes
+            courses no longer listed; "append" adds every course under a new id.
+        checkpoint_path: Where to record progress. A rerun after an
+            interruption skips the rows already written; the file is removed
+            once an upload completes without failures. The checkpoint stops
+            at the first failed batch, so in append mode the batches written
+            after it are added again on the rerun.
+        manifest_path: Sync only: local content hash manifest to diff against
+            instead of reading the collection. Rewritten after a fully successful sync.
+        dry_run: Sync only: count what would change without writing.
+        max_pending: Batches that may wait for a writer before reading pauses.
+    """
+    if mode not in ("sync", "append"):
+        raise ValueError(f"Unknown upload mode {mode!r}")
+    if not 1 <= batch_size <= FIRESTORE_BATCH_LIMIT:
+        raise ValueError(f"batch_size must be between 1 and {FIRESTORE_BATCH_LIMIT}")
+
+    with CatalogueArtifact.open(artifact_path) as artifact:
+        checkpoint = UploadCheckpoint(checkpoint_path, f"{artifact.version}:{mode}") if checkpoint_path and not dry_run else None
+        start = checkpoint.position if checkpoint is not None else 0
+        result = UploadResult(total=len(artifact), resumed_from=start)
+
+        def on_rejected(record: Dict[str, Any]) -> None:
+            for reason in record["reasons"]:
+                result.rejected[reason] = result.rejected.get(reason, 0) + 1
+            log(f"Invalid course data: {record}")
+
+        courses = iter_valid_courses(artifact, chunk_size, on_rejected)
+        if mode == "append":
+            operations = append_operations(client, courses, start)
+        else:
+            existing = load_manifest(manifest_path) if manifest_path else None
+            if existing is None:
+                existing = read_existing_hashes(client, COLLECTION_NAME)
+            result.sync = StreamedSync()
+            last_positions = last_listing_positions(artifact.columns["course_code"])
+            operations = sync_operations(client, courses, existing, result.sync, last_positions, start)
+
+        if dry_run:
+            for _ in operations:
+                pass
+            return result
+
+        progress = _Progress(len(artifact), checkpoint, progress_interval, log)
+        result.summary = write_batches(
+            client, progress.batches(operations, batch_size),
+            max_workers=max_workers, max_pending=max_pending, on_batch=progress.on_batch,
+        )
+
+    if not result.summary.failed:
+        if checkpoint is not None:
+            checkpoint.clear()
+        if manifest_path and result.sync is not None:
+            save_manifest(manifest_path, result.sync.hashes)
+    elif manifest_path:
+        log(f"Not updating {manifest_path}: {result.summary.failed} writes failed.")
+    return result
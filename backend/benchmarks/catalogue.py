@@ -0,0 +1,105 @@
+"""
+Synthetic catalogue data at realistic sizes, scaled up for stress runs.
+
+Scale 1 approximates one semester at IIT Bombay: about 1,200 running courses
+across 30 departments, with semester plans for the 14 departments the app
+supports. Scale 10 and 100 keep the same shape with more courses.
+"""
+import random
+from typing import Any, Dict, List
+
+from app.core.departments import departments_names_to_codes
+from app.core.slots import LAB_SLOTS, THEORY_SLOTS
+from app.services.course_scraper import COURSE_ROW_COLOR
+from app.services.firestore_sync import course_document_id
+
+BASE_COURSES = 1200
+DEPARTMENT_CODES = [
+    "AE", "BB", "CE", "CH", "CL", "CM", "CS", "DE", "EE", "EN", "EP", "ES", "ET", "GS", "HS",
+    "IE", "MA", "ME", "MM", "MS", "PH", "PS", "SC", "SI", "SOM", "TD", "CSE", "EES", "MMS", "IDC",
+]
+NAME_WORDS = [
+    "Introduction", "Advanced", "Engineering", "Mechanics", "Thermodynamics", "Design", "Analysis",
+    "Systems", "Laboratory", "Computation", "Materials", "Fluid", "Signals", "Control", "Data",
+    "Structures", "Algorithms", "Networks", "Quantum", "Economics", "Optimization", "Machine", "Learning",
+]
+
+
+def _course_code(department: str, number: int) -> str:
+    # The three allowed formats: "AB 123", "ABC123" and "AB1234"
+    if len(department) == 3:
+        return f"{department}{number % 1000:03d}"
+    if number >= 1000:
+        return f"{department}{number:04d}"
+    return f"{department} {number:03d}"
+
+
+def generate_courses(scale: int = 1, seed: int = 0) -> List[Dict[str, str]]:
+    """Course documents (without ids) that pass the Course schema, about BASE_COURSES * scale of them."""
+    rng = random.Random(seed)
+    courses: Dict[str, Dict[str, str]] = {}
+    target = BASE_COURSES * scale
+    while len(courses) < target:
+        department = rng.choice(DEPARTMENT_CODES)
+        # 3-letter codes only have 1000 numbers, the 4-digit ones make room for large scales
+        number = rng.randrange(100, 1000 if len(department) == 3 or scale == 1 else 10000)
+        code = _course_code(department, number)
+        is_lab = rng.random() < 0.2
+        courses.setdefault(code, {
+            "course_code": code,
+            "course_name": " ".join(rng.sample(NAME_WORDS, rng.randint(2, 5))),
+            "course_type": "Lab" if is_lab else "Theory",
+            "slot": rng.choice(LAB_SLOTS if is_lab else THEORY_SLOTS),
+        })
+    return list(courses.values())
+
+
+def generate_department_courses(courses: List[Dict[str, str]], seed: int = 0) -> Dict[str, Dict[str, List[str]]]:
+    """Semester plans for every supported department, drawn from the generated courses."""
+    rng = random.Random(seed)
+    codes = [course["course_code"] for course in courses]
+    return {
+        name: {str(semester): sorted(rng.sample(codes, min(len(codes), rng.randint(4, 8)))) for semester in range(1, 9)}
+        for name in departments_names_to_codes
+    }
+
+
+def generate_departments() -> Dict[str, Dict[str, str]]:
+    return {code.lower(): {"name": name, "code": code} for name, code in departments_names_to_codes.items()}
+
+
+def firestore_collections(scale: int = 1, seed: int = 0) -> Dict[str, Dict[str, Dict]]:
+    """The three catalogue collections keyed by document id, ready to seed a memory Firestore."""
+    courses = generate_courses(scale, seed)
+    return {
+        "courses": {course_document_id(course["course_code"]): course for course in courses},
+        "departments": generate_departments(),
+        "department_courses": generate_department_courses(courses, seed),
+    }
+
+
+def artifact_catalogue(scale: int = 1, seed: int = 0) -> Dict[str, Any]:
+    """The generated catalogue as write_catalogue_artifact takes it, each course under its code's department."""
+    collections = firestore_collections(scale, seed)
+    return {
+        "courses": [
+            {**course, "department": course["course_code"].rstrip("0123456789").strip()}
+            for course in collections["courses"].values()
+        ],
+        "departments": [{"id": doc_id, **department} for doc_id, department in collections["departments"].items()],
+        "department_courses": collections["department_courses"],
+    }
+
+
+def course_page_html(courses: List[Dict[str, str]]) -> str:
+    """A department course listing page in the layout the course scraper parses (course rows have 9+ cells)."""
+    rows = []
+    for index, course in enumerate(courses):
+        cells = [
+            str(index), "", course["course_code"], course["course_name"], course["course_type"],
+            "6", "0", "Instructor", f'{course["slot"]}<br>Mon 9:30',
+        ]
+        rows.append(f'<tr bgcolor="{COURSE_ROW_COLOR}">' + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+        # Listing pages interleave other rows (headers, notes) the scraper must skip
+        rows.append('<tr bgcolor="#FFFFFF"><td colspan="9">Note</td></tr>')
+    return "<html><body><table>" + "".join(rows) + "</table></body></html>"
@@ -0,0 +1,352 @@
+"""
+Benchmarks for the API, the scrapers and the uploader against an in-memory
+Firestore, with baselines to catch regressions.
+
+    python -m benchmarks.run                      # scales 1 and 10, compare with baselines.json
+    python -m benchmarks.run --scales 1 10 100    # include the 100x catalogue
+    python -m benchmarks.run --save               # record the results as the new baselines
+    python -m benchmarks.run --only endpoints     # endpoints, snapshot, scraper, uploader, artifact, slots or validation
+    python -m benchmarks.run --latency-ms 20 --jitter-ms 10   # simulate Firestore round trips
+
+Run from the backend directory. Baselines are machine specific: record them
+on the machine (or CI runner class) you compare on. With a simulated latency
+the Firestore-bound results are named with it (e.g. "snapshot_load[1x]@20+10ms"),
+so they are kept apart from the baselines without one. The jitter is seeded,
+so every run waits out the same delays.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.catalogue import artifact_catalogue, course_page_html, firestore_collections, generate_courses
+from app.db.memory import MemoryAsyncFirestore, MemoryFirestore
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+SUITES = ("snapshot", "endpoints", "scraper", "uploader", "artifact", "slots", "validation")
+
+ENDPOINTS = {
+    "courses": ("/api/v1/courses/", {}),
+    "courses_gzip": ("/api/v1/courses/", {"Accept-Encoding": "gzip"}),
+    "courses_filtered": ("/api/v1/courses/?department=CS&limit=50", {}),
+    "departments": ("/api/v1/departments", {}),
+    "department_semester": ("/api/v1/courses/CS/3", {}),
+    "courses_not_modified": ("/api/v1/courses/", None),
+}
+
+
+@dataclass
+class Result:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = True
+
+
+def best_of(repeat: int, run: Callable[[], None]) -> float:
+    """Fastest wall time of `repeat` runs, the least noisy estimate of the cost."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _load_snapshot(collections, latency: Dict[str, Any]) -> None:
+    from app.services.catalogue_snapshot import load_catalogue_snapshot
+    await load_catalogue_snapshot(MemoryAsyncFirestore(collections, **latency))
+
+
+def bench_snapshot(scale: int, collections, latency: Dict[str, Any]) -> List[Result]:
+    seconds = best_of(3, lambda: asyncio.run(_load_snapshot(collections, latency)))
+    return [Result(f"snapshot_load[{scale}x]", seconds * 1000, "ms", higher_is_better=False)]
+
+
+async def _hammer(client: httpx.AsyncClient, path: str, headers: Dict[str, str], requests: int, concurrency: int):
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code not in (200, 304):
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - start, latencies
+
+
+async def _bench_endpoints(scale: int, collections, requests: int, concurrency: int, latency: Dict[str, Any]) -> List[Result]:
+    from main import app
+    from app.api.deps import get_db
+    from app.services.catalogue_snapshot import catalogue_snapshot
+
+    db = MemoryAsyncFirestore(collections, **latency)
+    app.dependency_overrides[get_db] = lambda: db
+    catalogue_snapshot.clear()
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            warm = await client.get("/api/v1/courses/")
+            for name, (path, headers) in ENDPOINTS.items():
+                if headers is None:
+                    headers = {"If-None-Match": warm.headers["ETag"]}
+                await _hammer(client, path, headers, min(requests, 20), concurrency)
+                elapsed, latencies = await _hammer(client, path, headers, requests, concurrency)
+                results += [
+                    Result(f"{name}[{scale}x].throughput", requests / elapsed, "req/s"),
+                    Result(f"{name}[{scale}x].p50", statistics.median(latencies) * 1000, "ms", higher_is_better=False),
+                    Result(f"{name}[{scale}x].p95", percentile(latencies, 0.95) * 1000, "ms", higher_is_better=False),
+                ]
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        catalogue_snapshot.clear()
+    return results
+
+
+def bench_endpoints(scale: int, collections, requests: int, concurrency: int, latency: Dict[str, Any]) -> List[Result]:
+    return asyncio.run(_bench_endpoints(scale, collections, requests, concurrency, latency))
+
+
+def bench_scraper(scale: int) -> List[Result]:
+    from app.services.course_scraper import scrape_course_data, scrape_course_file
+
+    courses = generate_courses(scale)
+    html = course_page_html(courses)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "department.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        soup_seconds = best_of(3, lambda: scrape_course_data(html))
+        stream_seconds = best_of(3, lambda: scrape_course_file(path))
+    return [
+        Result(f"scrape_course_data[{scale}x]", len(courses) / soup_seconds, "rows/s"),
+        Result(f"scrape_course_file[{scale}x]", len(courses) / stream_seconds, "rows/s"),
+    ]
+
+
+def bench_uploader(scale: int, latency: Dict[str, Any]) -> List[Result]:
+    from app.services.course_uploader import sync_courses, upload_courses
+
+    courses = generate_courses(scale)
+    append_seconds = best_of(3, lambda: upload_courses(MemoryFirestore(**latency), courses))
+    client = MemoryFirestore(**latency)
+    sync_courses(client, courses)
+    # A re-upload where nothing changed: one stream, hashing, no writes
+    unchanged_seconds = best_of(3, lambda: sync_courses(client, courses))
+    # The streaming pipeline the uploader script runs: artifact -> bulk validation -> bounded writer pool
+    from app.services.catalogue_artifact import write_catalogue_artifact
+    from app.services.upload_pipeline import upload_artifact
+
+    with tempfile.TemporaryDirectory() as directory:
+        artifact_path = os.path.join(directory, "catalogue.iitbcat")
+        write_catalogue_artifact(artifact_path, artifact_catalogue(scale)["courses"])
+        pipeline_seconds = best_of(3, lambda: upload_artifact(MemoryFirestore(**latency), artifact_path, log=lambda message: None))
+    return [
+        Result(f"upload_courses[{scale}x]", len(courses) / append_seconds, "docs/s"),
+        Result(f"sync_courses_unchanged[{scale}x]", len(courses) / unchanged_seconds, "docs/s"),
+        Result(f"upload_artifact[{scale}x]", len(courses) / pipeline_seconds, "docs/s"),
+    ]
+
+
+def _read_csv(path: str) -> List[Dict[str, str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _read_artifact(path: str) -> List[Dict[str, str]]:
+    from app.services.catalogue_artifact import CatalogueArtifact
+    with CatalogueArtifact.open(path) as artifact:
+        return list(artifact.records())
+
+
+def bench_artifact(scale: int) -> List[Result]:
+    """The catalogue artifact against the per-department CSVs it replaced, and booting the API's snapshot from it."""
+    from app.services.catalogue_artifact import CatalogueArtifact, write_catalogue_artifact
+    from app.services.catalogue_snapshot import artifact_loader
+
+    catalogue = artifact_catalogue(scale)
+    courses = catalogue["courses"]
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "catalogue.csv")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(courses[0]))
+            writer.writeheader()
+            writer.writerows(courses)
+        artifact_path = os.path.join(directory, "catalogue.iitbcat")
+        write_seconds = best_of(3, lambda: write_catalogue_artifact(artifact_path, **catalogue))
+        csv_seconds = best_of(3, lambda: _read_csv(csv_path))
+        artifact_seconds = best_of(3, lambda: _read_artifact(artifact_path))
+
+        def read_frame() -> None:
+            with CatalogueArtifact.open(artifact_path) as artifact:
+                artifact.to_frame()
+
+        frame_seconds = best_of(3, read_frame)
+        load = artifact_loader(artifact_path)
+        snapshot_seconds = best_of(3, lambda: asyncio.run(load(None)))
+    return [
+        Result(f"artifact_write[{scale}x]", len(courses) / write_seconds, "rows/s"),
+        Result(f"csv_read[{scale}x]", len(courses) / csv_seconds, "rows/s"),
+        Result(f"artifact_read[{scale}x]", len(courses) / artifact_seconds, "rows/s"),
+        Result(f"artifact_frame[{scale}x]", len(courses) / frame_seconds, "rows/s"),
+        Result(f"snapshot_load_artifact[{scale}x]", snapshot_seconds * 1000, "ms", higher_is_better=False),
+    ]
+
+
+def _legacy_slot_ok(course_type: str, slot: str) -> bool:
+    """The string and int parsing the schemas did before app.core.slots, kept to compare against."""
+    if course_type == "Theory":
+        return slot.isdigit() and 1 <= int(slot) <= 15
+    if course_type == "Lab":
+        return slot.startswith("L") and len(slot) == 2 and slot[1].isdigit() and 1 <= int(slot[1]) <= 6
+    return False
+
+
+def bench_slots(scale: int) -> List[Result]:
+    """Per record slot checks: the precomputed table against the old parsing, and whole course validations."""
+    from app.api.v1.schemas import CourseCreate
+    from app.core.slots import is_legal_slot
+
+    courses = generate_courses(scale)
+    pairs = [(course["course_type"], course["slot"]) for course in courses]
+    table_seconds = best_of(5, lambda: [is_legal_slot(course_type, slot) for course_type, slot in pairs])
+    legacy_seconds = best_of(5, lambda: [_legacy_slot_ok(course_type, slot) for course_type, slot in pairs])
+    schema_seconds = best_of(3, lambda: [CourseCreate.model_validate(course) for course in courses])
+    return [
+        Result(f"slot_check_table[{scale}x]", len(pairs) / table_seconds, "checks/s"),
+        Result(f"slot_check_legacy[{scale}x]", len(pairs) / legacy_seconds, "checks/s"),
+        Result(f"course_validate[{scale}x]", len(courses) / schema_seconds, "courses/s"),
+    ]
+
+
+def bench_validation(scale: int) -> List[Result]:
+    """Cleaning and validating a whole catalogue frame at once, as the bulk upload does."""
+    import pandas as pd
+
+    from app.services.bulk_validation import validate_courses
+
+    frame = pd.DataFrame(artifact_catalogue(scale)["courses"])
+    seconds = best_of(5, lambda: validate_courses(frame))
+    return [Result(f"bulk_validate[{scale}x]", len(frame) / seconds, "rows/s")]
+
+
+def run(
+    scales: List[int], suites: List[str], requests: int, concurrency: int,
+    latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0,
+) -> List[Result]:
+    results: List[Result] = []
+    latency = {"latency_seconds": latency_ms / 1000, "jitter_seconds": jitter_ms / 1000, "seed": seed}
+    suffix = f"@{latency_ms:g}{f'+{jitter_ms:g}' if jitter_ms else ''}ms" if latency_ms or jitter_ms else ""
+    for scale in scales:
+        collections = firestore_collections(scale)
+        firestore_bound: List[Result] = []
+        if "snapshot" in suites:
+            firestore_bound += bench_snapshot(scale, collections, latency)
+        if "endpoints" in suites:
+            firestore_bound += bench_endpoints(scale, collections, requests, concurrency, latency)
+        if "uploader" in suites:
+            firestore_bound += bench_uploader(scale, latency)
+        for result in firestore_bound:
+            result.name += suffix
+        results += firestore_bound
+        if "scraper" in suites:
+            results += bench_scraper(scale)
+        if "artifact" in suites:
+            results += bench_artifact(scale)
+        if "slots" in suites:
+            results += bench_slots(scale)
+        if "validation" in suites:
+            results += bench_validation(scale)
+    return results
+
+
+def load_baselines(path: str = BASELINES_PATH) -> Dict[str, Dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(results: List[Result], path: str = BASELINES_PATH) -> None:
+    baselines = load_baselines(path)
+    baselines.update({result.name: asdict(result) for result in results})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write("\n")
+
+
+def regression(result: Result, baseline: Optional[Dict], tolerance: float) -> Optional[float]:
+    """The relative slowdown against the baseline if it exceeds `tolerance`, else None."""
+    if baseline is None or not baseline["value"]:
+        return None
+    if result.higher_is_better:
+        change = 1 - result.value / baseline["value"]
+    else:
+        change = result.value / baseline["value"] - 1
+    return change if change > tolerance else None
+
+
+def report(results: List[Result], baselines: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Prints the results next to their baselines and returns the names of the regressions."""
+    regressions = []
+    width = max(len(result.name) for result in results)
+    for result in results:
+        baseline = baselines.get(result.name)
+        line = f"{result.name:<{width}}  {result.value:>12.2f} {result.unit:<6}"
+        if baseline is not None:
+            line += f"  baseline {baseline['value']:>12.2f}"
+            slowdown = regression(result, baseline, tolerance)
+            if slowdown is not None:
+                regressions.append(result.name)
+                line += f"  REGRESSION ({slowdown:.0%} worse)"
+        print(line)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the API, scrapers and uploader against an in-memory Firestore.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="Catalogue size multipliers (1 is about 1,200 courses)")
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=list(SUITES), help="Suites to run")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated round trip of every Firestore call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Up to this much extra, seeded random latency per call")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the latency jitter")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown against the baseline (0.3 = 30%%)")
+    parser.add_argument("--save", action="store_true", help="Record the results as the new baselines")
+    args = parser.parse_args(argv)
+
+    results = run(args.scales, args.only, args.requests, args.concurrency, args.latency_ms, args.jitter_ms, args.seed)
+    regressions = report(results, load_baselines(), args.tolerance)
+    if args.save:
+        save_baselines(results)
+        print(f"Baselines written to {BASELINES_PATH}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,61 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import Optional, TYPE_CHECKING
+from fastapi import FastAPI, Depends, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from google.cloud.firestore_v1.client import Client
-from google.api_core.exceptions import GoogleAPICallError
 from app.api.deps import get_db
+from app.core.compression import CompressionMiddleware
+from app.core.config import config
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry
+from app.core.request_metrics import RequestMetricsMiddleware
+from app.db.session import DatabaseUnavailableError, get_async_client
+from app.services.catalogue_snapshot import catalogue_snapshot
 from app.api.v1.endpoints.courses import router as courses_router
+from app.api.v1.endpoints.admin import router as admin_router
+from app.api.v1.endpoints.timetable import router as timetable_router
 
-app = FastAPI() 
+if TYPE_CHECKING:
+    from google.cloud.firestore_v1 import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_TIMEOUT_SECONDS = 5
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the Firestore client once at startup, in a thread so reading the
+    # key file doesn't block the event loop. If it fails the server still
+    # starts: requests get a 503 from get_db, which retries the initialization.
+    # A catalogue served from an artifact needs no client at all.
+    get_refresh_db = get_async_client
+    try:
+        db = await asyncio.to_thread(get_async_client)
+    except DatabaseUnavailableError as e:
+        if not config.CATALOGUE_ARTIFACT_PATH:
+            logger.error("Firestore is unavailable at startup: %s", e)
+            yield
+            return
+        logger.info("Firestore is unavailable, serving the catalogue from %s", config.CATALOGUE_ARTIFACT_PATH)
+        db, get_refresh_db = None, lambda: None
+
+    # Load the catalogue before taking traffic so no user pays for the first
+    # full scans, then keep it fresh in the background.
+    try:
+        await catalogue_snapshot.refresh(db)
+    except Exception as e:
+        logger.error("Could not load the catalogue at startup, the first request will retry: %s", e)
+    refresher = asyncio.create_task(catalogue_snapshot.run_refresher(get_refresh_db))
+    try:
+        yield
+    finally:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow CORS for all origins
 app.add_middleware(
@@ -14,37 +64,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods (GET, POST, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor", "ETag"],  # Pagination cursor of GET /api/v1/courses/, catalogue validators
 )
 
+# gzip / brotli for everything but the catalogue bodies, which are precompressed once per snapshot
+app.add_middleware(CompressionMiddleware)
+# Outermost, so it times the whole stack and sees the compressed sizes
+app.add_middleware(RequestMetricsMiddleware)
+
 @app.get("/")
 def test():
     return {"message": "Hello World"}
 
-# @app.get("/health", tags=["System"])
-# def health_check(db: Client = Depends(get_db)):
+@app.get("/health", tags=["System"])
+async def health_check(db: Optional["AsyncClient"] = Depends(get_db)):
     """
     Performs a health check of the API and its connection to the database.
     Returns a 200 OK status if healthy, otherwise a 503 Service Unavailable.
     """
+    if db is None:
+        # Serving the catalogue from an artifact, without Firestore
+        return {"status": "ok", "database": "not configured"}
     try:
         # Perform a simple, low-cost read operation on the database.
         # We try to get a document that doesn't exist to confirm connectivity
         # without retrieving any data.
-        db.collection("health_check").document("ping").get(timeout=5)
-        
+        await asyncio.wait_for(db.collection("health_check").document("ping").get(), timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
         return {"status": "ok", "database": "healthy"}
-    
-    except GoogleAPICallError as e:
-        # This catches issues like permissions, network problems, etc.
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail={"status": "error", "database": "unhealthy", "reason": str(e)},
-        )
     except Exception as e:
-        # Catch any other unexpected errors
+        # Permissions, network problems, timeouts, etc.
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail={"status": "error", "database": "unhealthy", "reason": str(e)},
+            detail={"status": "error", "database": "unhealthy", "reason": str(e) or type(e).__name__},
         )
-    
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Request, Firestore and cache metrics in the Prometheus text format."""
+    return Response(content=registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 app.include_router(courses_router, prefix="/api/v1", tags=["Courses"])
+app.include_router(timetable_router, prefix="/api/v1", tags=["Timetable"])
+app.include_router(admin_router, prefix="/api/v1", tags=["Admin"])
+
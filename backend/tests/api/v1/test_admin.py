@@ -0,0 +1,23 @@
+from app.core.config import config
+from app.services.catalogue_snapshot import catalogue_snapshot
+
+
+def test_invalidate_cache_requires_token(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_API_TOKEN", "secret")
+    response = client.post("/api/v1/admin/cache/invalidate", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 403
+
+
+def test_invalidate_cache_disabled_without_configured_token(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_API_TOKEN", None)
+    response = client.post("/api/v1/admin/cache/invalidate")
+    assert response.status_code == 403
+
+
+def test_invalidate_cache_reloads_the_snapshot(client, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_API_TOKEN", "secret")
+    invalidations = []
+    monkeypatch.setattr(catalogue_snapshot, "invalidate", lambda: invalidations.append(True))
+    response = client.post("/api/v1/admin/cache/invalidate", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert invalidations == [True]
@@ -1,7 +1,6 @@
 import pytest
 
-# @pytest.mark.skip(reason="This is a placeholder for a future health check.")
-def db_health(client):
+def test_db_health(client, fake_db):
     response = client.get("/health")
     assert response.status_code == 200
     result = response.json()
@@ -9,8 +8,311 @@ def db_health(client):
     assert "database" in result
     assert result["status"] == "ok"
     assert result["database"] == "healthy"
+    assert fake_db.reads == [("health_check", "ping")]
+
+def test_db_health_reports_an_unresponsive_database(client, monkeypatch):
+    import main
+    from app.api.deps import get_db
+    from app.db.memory import MemoryAsyncFirestore
+
+    monkeypatch.setattr(main, "HEALTH_CHECK_TIMEOUT_SECONDS", 0.01)
+    main.app.dependency_overrides[get_db] = lambda: MemoryAsyncFirestore(latency_seconds=1)
+    try:
+        response = client.get("/health")
+    finally:
+        main.app.dependency_overrides.pop(get_db, None)
+    assert response.status_code == 503
+    assert response.json()["detail"]["database"] == "unhealthy"
 
 def test_placeholder(client):
     assert 5==5
 
 
+
+COURSES = {
+    "c1": {"course_name": "Computer Programming", "course_code": "CS 101", "course_type": "Theory", "slot": "3"},
+    "c2": {"course_name": "Data Structures Lab", "course_code": "CS 293", "course_type": "Lab", "slot": "L2"},
+    "bad": {"course_name": "Broken", "course_code": "cs101", "course_type": "Theory", "slot": "3"},
+}
+
+DEPARTMENT_COURSES = {
+    "Computer Science and Engineering": {"1": ["CS 101", "MA 105"], "2": ["CS 102"]},
+}
+
+# Loading the catalogue snapshot streams each collection once
+SNAPSHOT_STREAMS = ["courses", "department_courses", "departments"]
+
+
+def test_get_courses_skips_invalid_documents(client, fake_db):
+    fake_db.collections["courses"] = COURSES
+    response = client.get("/api/v1/courses/")
+    assert response.status_code == 200
+    assert [course["id"] for course in response.json()] == ["c1", "c2"]
+
+
+def test_get_courses_is_cached(client, fake_db):
+    fake_db.collections["courses"] = COURSES
+    client.get("/api/v1/courses/")
+    client.get("/api/v1/courses/")
+    assert sorted(fake_db.streams) == SNAPSHOT_STREAMS
+
+
+def test_get_departments(client, fake_db):
+    fake_db.collections["departments"] = {"cse": {"name": "Computer Science and Engineering", "code": "CS"}}
+    response = client.get("/api/v1/departments")
+    assert response.status_code == 200
+    assert response.json() == [{"id": "cse", "name": "Computer Science and Engineering", "code": "CS", "description": None}]
+
+
+def test_courses_for_department(client, fake_db):
+    fake_db.collections["department_courses"] = DEPARTMENT_COURSES
+    response = client.get("/api/v1/courses/CS/1")
+    assert response.status_code == 200
+    assert response.json() == ["CS 101", "MA 105"]
+
+
+def test_courses_for_department_serves_repeat_from_snapshot(client, fake_db):
+    fake_db.collections["department_courses"] = DEPARTMENT_COURSES
+    assert client.get("/api/v1/courses/CS/1").status_code == 200
+    assert client.get("/api/v1/courses/CS/2").json() == ["CS 102"]
+    assert client.get("/api/v1/departments").status_code == 200
+    assert sorted(fake_db.streams) == SNAPSHOT_STREAMS
+    assert fake_db.reads == []
+
+
+def test_courses_for_department_unknown_code(client, fake_db):
+    response = client.get("/api/v1/courses/ZZ/1")
+    assert response.status_code == 400
+    assert fake_db.reads == []
+
+
+def test_courses_for_department_missing_document(client, fake_db):
+    response = client.get("/api/v1/courses/CS/1")
+    assert response.status_code == 404
+
+
+def make_courses(count):
+    return {
+        f"doc{i:03d}": {"course_name": f"Course {i}", "course_code": f"CS {100 + i}", "course_type": "Theory", "slot": "1"}
+        for i in range(count)
+    }
+
+
+def test_get_courses_paginates_by_course_code(client, fake_db):
+    fake_db.collections["courses"] = make_courses(5)
+    seen = []
+    cursor = None
+    for _ in range(3):
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = client.get("/api/v1/courses/", params=params)
+        assert response.status_code == 200
+        seen += [course["course_code"] for course in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+    assert seen == ["CS 100", "CS 101", "CS 102", "CS 103", "CS 104"]
+    assert cursor is None
+
+
+def test_get_courses_page_keeps_duplicate_codes(client, fake_db):
+    fake_db.collections["courses"] = {
+        doc_id: {"course_name": "Calculus", "course_code": "MA 105", "course_type": "Theory", "slot": "1"}
+        for doc_id in ("a", "b", "c")
+    }
+    first = client.get("/api/v1/courses/", params={"limit": 2})
+    second = client.get("/api/v1/courses/", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [course["id"] for course in first.json() + second.json()] == ["a", "b", "c"]
+
+
+def test_get_courses_field_projection(client, fake_db):
+    fake_db.collections["courses"] = COURSES
+    response = client.get("/api/v1/courses/", params={"fields": "course_code,slot"})
+    assert response.status_code == 200
+    assert response.json() == [{"course_code": "CS 101", "slot": "3"}, {"course_code": "CS 293", "slot": "L2"}]
+
+
+@pytest.mark.parametrize("params, status_code, detail", [
+    ({"fields": "course_code,password"}, 400, "Invalid fields: password"),
+    ({"fields": ","}, 400, "Invalid fields: ,"),
+    ({"cursor": "not-a-cursor"}, 400, "Invalid cursor"),
+])
+def test_get_courses_rejects_bad_parameters(client, fake_db, params, status_code, detail):
+    response = client.get("/api/v1/courses/", params=params)
+    assert response.status_code == status_code
+    assert response.json()["detail"] == detail
+
+
+def test_get_courses_validates_the_limit(client, fake_db):
+    response = client.get("/api/v1/courses/", params={"limit": 0})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "limit"]
+
+
+def test_get_courses_filters(client, fake_db):
+    fake_db.collections["courses"] = COURSES
+    response = client.get("/api/v1/courses/", params={"course_type": "Lab", "code_prefix": "CS"})
+    assert response.status_code == 200
+    assert [course["course_code"] for course in response.json()] == ["CS 293"]
+    assert client.get("/api/v1/courses/", params={"department": "EE"}).json() == []
+
+
+def test_get_courses_filters_with_pagination(client, fake_db):
+    fake_db.collections["courses"] = make_courses(5)
+    first = client.get("/api/v1/courses/", params={"department": "CS", "limit": 3})
+    second = client.get("/api/v1/courses/", params={"department": "CS", "limit": 3, "cursor": first.headers["X-Next-Cursor"]})
+    assert [course["course_code"] for course in first.json() + second.json()] == ["CS 100", "CS 101", "CS 102", "CS 103", "CS 104"]
+    assert "X-Next-Cursor" not in second.headers
+    assert sorted(fake_db.streams) == SNAPSHOT_STREAMS
+
+
+def test_search_courses(client, fake_db):
+    fake_db.collections["courses"] = COURSES
+    response = client.get("/api/v1/courses/search", params={"q": "data struct"})
+    assert response.status_code == 200
+    assert [course["course_code"] for course in response.json()] == ["CS 293"]
+    assert client.get("/api/v1/courses/search", params={"q": "cs 1"}).json()[0]["id"] == "c1"
+    assert sorted(fake_db.streams) == SNAPSHOT_STREAMS
+
+
+def test_search_courses_requires_query(client, fake_db):
+    assert client.get("/api/v1/courses/search").status_code == 422
+
+
+def test_full_course_list_is_served_precompressed(client, fake_db):
+    fake_db.collections["courses"] = make_courses(30)
+    plain = client.get("/api/v1/courses/", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/v1/courses/", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert compressed.json() == plain.json()
+    assert len(plain.json()) == 30
+
+
+def test_courses_for_department_semester_without_courses(client, fake_db):
+    fake_db.collections["department_courses"] = DEPARTMENT_COURSES
+    response = client.get("/api/v1/courses/CS/5")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_catalogue_responses_carry_etag_and_cache_control(client, fake_db):
+    fake_db.collections["courses"] = COURSES
+    response = client.get("/api/v1/courses/")
+    assert response.headers["ETag"].startswith('"')
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/v1/courses/", {}),
+    ("/api/v1/courses/", {"department": "CS", "limit": 1}),
+    ("/api/v1/courses/search", {"q": "data"}),
+    ("/api/v1/departments", {}),
+    ("/api/v1/courses/CS/1", {}),
+])
+def test_if_none_match_returns_304(client, fake_db, path, params):
+    fake_db.collections["courses"] = COURSES
+    fake_db.collections["department_courses"] = DEPARTMENT_COURSES
+    first = client.get(path, params=params)
+    assert first.status_code == 200
+    again = client.get(path, params=params, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_etag_changes_with_the_catalogue(client, fake_db):
+    from app.services.catalogue_snapshot import catalogue_snapshot
+
+    fake_db.collections["courses"] = COURSES
+    etag = client.get("/api/v1/courses/").headers["ETag"]
+    fake_db.collections["courses"] = make_courses(3)
+    catalogue_snapshot.clear()
+    response = client.get("/api/v1/courses/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_compressed_variant_has_its_own_etag_but_revalidates(client, fake_db):
+    fake_db.collections["courses"] = make_courses(30)
+    plain = client.get("/api/v1/courses/", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/api/v1/courses/", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+    again = client.get("/api/v1/courses/", headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]})
+    assert again.status_code == 304
+    # The client still holds the plain body, so it keeps the plain body's tag
+    assert again.headers["ETag"] == plain.headers["ETag"]
+    switched = client.get("/api/v1/courses/", headers={"Accept-Encoding": "br", "If-None-Match": compressed.headers["ETag"]})
+    assert switched.status_code == 304
+    assert switched.headers["ETag"] == compressed.headers["ETag"]
+
+
+def test_filtered_list_is_compressed_by_the_middleware(client, fake_db):
+    fake_db.collections["courses"] = make_courses(30)
+    params = {"department": "CS"}
+    response = client.get("/api/v1/courses/", params=params, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"].endswith('-gzip"')
+    assert len(response.json()) == 30
+    again = client.get("/api/v1/courses/", params=params, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == response.headers["ETag"]
+    switched = client.get("/api/v1/courses/", params=params, headers={"Accept-Encoding": "br", "If-None-Match": response.headers["ETag"]})
+    assert switched.status_code == 304
+    assert switched.headers["ETag"] == response.headers["ETag"]
+
+
+def test_department_plan(client, fake_db):
+    fake_db.collections["department_courses"] = DEPARTMENT_COURSES
+    response = client.get("/api/v1/departments/CS/plan")
+    assert response.status_code == 200
+    assert response.json() == {"1": ["CS 101", "MA 105"], "2": ["CS 102"]}
+    again = client.get("/api/v1/departments/CS/plan", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_department_plan_unknown_or_missing(client, fake_db):
+    assert client.get("/api/v1/departments/ZZ/plan").status_code == 400
+    assert client.get("/api/v1/departments/CS/plan").status_code == 404
+
+
+def test_all_department_courses_in_one_request(client, fake_db):
+    fake_db.collections["department_courses"] = {
+        **DEPARTMENT_COURSES,
+        "Civil Engineering": {"3": ["CE 201"]},
+    }
+    response = client.get("/api/v1/department-courses")
+    assert response.status_code == 200
+    assert response.json() == {
+        "Civil Engineering": {"3": ["CE 201"]},
+        "Computer Science and Engineering": {"1": ["CS 101", "MA 105"], "2": ["CS 102"]},
+    }
+    assert list(response.json()) == ["Civil Engineering", "Computer Science and Engineering"]
+    assert response.headers["ETag"]
+
+
+def test_course_batch_lookup_normalizes_codes(client, fake_db):
+    fake_db.collections["courses"] = COURSES
+    response = client.post("/api/v1/courses/batch", json={"codes": ["cs293", "CS 101", "ZZ 999", "CS101"]})
+    assert response.status_code == 200
+    result = response.json()
+    assert [course["id"] for course in result["courses"]] == ["c2", "c1"]
+    assert result["missing"] == ["ZZ 999"]
+
+
+@pytest.mark.parametrize("payload", [{"codes": []}, {"codes": ["CS 101"] * 201}, {}])
+def test_course_batch_lookup_rejects_bad_payloads(client, fake_db, payload):
+    assert client.post("/api/v1/courses/batch", json=payload).status_code == 422
+
+
+def test_metrics_endpoint_reports_routes_and_cache(client, fake_db):
+    fake_db.collections["courses"] = COURSES
+    client.get("/api/v1/courses/")
+    client.get("/api/v1/courses/")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/api/v1/courses/",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/courses/",le="+Inf"}' in body
+    assert 'cache_requests_total{cache="catalogue_snapshot",result="hit"}' in body
+    assert "http_requests_in_flight 1" in body
+    assert "catalogue_snapshot_age_seconds" in body
@@ -0,0 +1,38 @@
+def test_check_timetable_without_clash(client):
+    response = client.post("/api/v1/timetable/check", json={"courses": [
+        {"course_code": "CS 101", "slot": "1"},
+        {"course_code": "MA 105", "slot": "2"},
+    ]})
+    assert response.status_code == 200
+    assert response.json() == {"has_clash": False, "clashes": []}
+
+
+def test_check_timetable_reports_clashing_pairs(client):
+    response = client.post("/api/v1/timetable/check", json={"courses": [
+        {"course_code": "EE 229", "slot": "8"},
+        {"course_code": "CS 101", "slot": "1"},
+        {"course_code": "CS 293", "slot": "L1"},
+    ]})
+    assert response.status_code == 200
+    assert response.json() == {"has_clash": True, "clashes": [{
+        "first": {"course_code": "EE 229", "slot": "8"},
+        "second": {"course_code": "CS 293", "slot": "L1"},
+    }]}
+
+
+def test_check_timetable_accepts_zero_padded_slots(client):
+    response = client.post("/api/v1/timetable/check", json={"courses": [
+        {"course_code": "CS 101", "slot": "07"},
+        {"course_code": "MA 105", "slot": "7"},
+    ]})
+    assert response.status_code == 200
+    assert response.json()["has_clash"] is True
+
+
+def test_check_timetable_unknown_slot(client):
+    response = client.post("/api/v1/timetable/check", json={"courses": [{"course_code": "CS 101", "slot": "X"}]})
+    assert response.status_code == 400
+
+
+def test_check_timetable_requires_courses(client):
+    assert client.post("/api/v1/timetable/check", json={"courses": []}).status_code == 422
@@ -1,27 +1,30 @@
-import sys
-import types
-from unittest.mock import Mock
+import os
 import pytest
 
-fake_fb = types.ModuleType("firebase_admin")
-fake_credentials = types.ModuleType("firebase_admin.credentials")
-fake_firestore = types.ModuleType("firebase_admin.firestore")
+# The app under test runs on the in-memory storage backend, starting empty (no artifact at MEMORY_SEED_PATH)
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ["MEMORY_SEED_PATH"] = os.path.join(os.path.dirname(__file__), "no-catalogue.iitbcat")
 
-mock_db = Mock(name="firestore_db")
-setattr(fake_credentials, "Certificate", Mock(name="Certificate"))
-setattr(fake_firestore, "client", Mock(name="firestore.client", return_value=mock_db))
-
-setattr(fake_fb, "credentials", fake_credentials)
-setattr(fake_fb, "firestore", fake_firestore)
-fake_fb.__dict__["initialize_app"] = Mock(name="initialize_app")
-fake_fb.__dict__['_apps'] = [] 
-sys.modules["firebase_admin"] = fake_fb
-sys.modules["firebase_admin.credentials"] = fake_credentials
-sys.modules["firebase_admin.firestore"] = fake_firestore
 
 @pytest.fixture(scope="module")
 def client():
     from main import app
     from fastapi.testclient import TestClient
     with TestClient(app) as c:
-        yield c
\ No newline at end of file
+        yield c
+
+
+@pytest.fixture
+def fake_db():
+    """Serves the API from an empty memory Firestore that records its calls, with an empty catalogue snapshot."""
+    from main import app
+    from app.api.deps import get_db
+    from app.db.memory import MemoryAsyncFirestore
+    from app.services.catalogue_snapshot import catalogue_snapshot
+
+    db = MemoryAsyncFirestore(record_calls=True)
+    app.dependency_overrides[get_db] = lambda: db
+    catalogue_snapshot.clear()
+    yield db
+    app.dependency_overrides.pop(get_db, None)
+    catalogue_snapshot.clear()
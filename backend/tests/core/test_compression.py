@@ -0,0 +1,95 @@
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import encoding
+from app.core.compression import CompressionMiddleware
+from app.core.encoding import EncodedBody
+
+BIG = b'{"courses":[' + b",".join(b'{"course_code":"CS %d"}' % i for i in range(200)) + b"]}"
+
+
+@pytest.fixture(scope="module")
+def app_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big():
+        return Response(content=BIG, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return Response(content=b'{"a":1}', media_type="application/json")
+
+    @app.get("/binary")
+    def binary():
+        return Response(content=b"\0" * 1000, media_type="application/octet-stream")
+
+    @app.get("/precompressed")
+    def precompressed():
+        return EncodedBody(BIG).response("gzip")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BIG[:300], BIG[300:]]), media_type="application/json")
+
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def without_brotli(monkeypatch):
+    monkeypatch.setattr(encoding, "brotli", None)
+
+
+def test_large_json_is_gzipped(app_client):
+    response = app_client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) < len(BIG)
+    assert response.headers["ETag"] == '"v1-gzip"'
+    assert response.content == BIG
+
+
+def test_no_compression_without_accept_encoding(app_client):
+    response = app_client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"v1"'
+
+
+@pytest.mark.parametrize("path", ["/small", "/binary"])
+def test_small_and_binary_bodies_pass_through(app_client, path):
+    response = app_client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_precompressed_body_is_not_compressed_again(app_client):
+    response = app_client.get("/precompressed", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.content == BIG
+
+
+def test_streamed_body_is_compressed_incrementally(app_client):
+    response = app_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert response.content == BIG
+
+
+def test_not_modified_keeps_the_compressed_tag(app_client):
+    response = app_client.get("/not-modified", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"v1-gzip"'
+
+
+def test_brotli_when_available(app_client, monkeypatch):
+    brotli = pytest.importorskip("brotli")
+    monkeypatch.setattr(encoding, "brotli", brotli)
+    response = app_client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
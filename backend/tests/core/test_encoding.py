@@ -0,0 +1,54 @@
+import gzip
+import json
+
+import pytest
+
+from app.core import encoding
+from app.core.encoding import EncodedBody, choose_encoding, dumps, join_json_array
+
+
+def test_dumps_matches_compact_json():
+    content = [{"course_name": "Électronique", "slot": "L1"}]
+    assert json.loads(dumps(content)) == content
+    assert b" " not in dumps({"a": [1, 2]})
+
+
+def test_join_json_array():
+    assert json.loads(join_json_array([dumps({"a": 1}), dumps({"b": 2})])) == [{"a": 1}, {"b": 2}]
+    assert join_json_array([]) == b"[]"
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("deflate, gzip;q=0.5", "gzip"),
+    ("*", "gzip"),
+    ("*, gzip;q=0", None),
+])
+def test_choose_encoding_without_brotli(monkeypatch, header, expected):
+    monkeypatch.setattr(encoding, "brotli", None)
+    assert choose_encoding(header) == expected
+
+
+def test_choose_encoding_prefers_brotli_when_available(monkeypatch):
+    monkeypatch.setattr(encoding, "brotli", object())
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip, br;q=0.1") == "gzip"
+
+
+def test_encoded_body_compresses_once(monkeypatch):
+    monkeypatch.setattr(encoding, "brotli", None)
+    body = EncodedBody.from_content([{"course_code": f"CS {i}"} for i in range(100)])
+    response = body.response("gzip")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.body) == body.identity
+    assert body.response("gzip").body is response.body
+
+
+def test_small_bodies_are_not_compressed():
+    response = EncodedBody(b"[]").response("gzip, br")
+    assert "Content-Encoding" not in response.headers
+    assert response.body == b"[]"
@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.http_cache import cache_headers, format_etag, make_etag, matching_etag
+
+
+def test_make_etag_is_stable_and_content_derived():
+    assert make_etag(b"[1]") == make_etag("[1]")
+    assert make_etag(b"[1]") != make_etag(b"[2]")
+    assert make_etag("ab", "c") != make_etag("a", "bc")
+
+
+def test_format_etag_per_coding():
+    assert format_etag("abc") == '"abc"'
+    assert format_etag("abc", "gzip") == '"abc-gzip"'
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ('"abc"', '"abc"'),
+    ('W/"abc"', '"abc"'),
+    ('"abc-br"', '"abc-br"'),
+    ('"other", "abc-gzip"', '"abc-gzip"'),
+    ('"abcd"', None),
+    ('"abc-deflate"', None),
+    ('"ab"', None),
+    ("*", '"abc-gzip"'),
+])
+def test_matching_etag_echoes_the_variant_the_client_holds(header, expected):
+    assert matching_etag(header, "abc", "gzip") == expected
+
+
+def test_cache_headers(monkeypatch):
+    from app.core.config import config
+
+    monkeypatch.setattr(config, "CATALOGUE_MAX_AGE_SECONDS", 60)
+    assert cache_headers("abc", "gzip") == {"ETag": '"abc-gzip"', "Cache-Control": "public, max-age=60"}
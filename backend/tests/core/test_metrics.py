@@ -0,0 +1,63 @@
+import pytest
+
+from app.core.metrics import Registry
+
+
+@pytest.fixture
+def registry():
+    return Registry()
+
+
+def test_counter_renders_per_label(registry):
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    requests.inc(route="/a")
+    requests.inc(2, route="/b")
+    requests.inc(route="/a")
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/a"} 2\n'
+        'requests_total{route="/b"} 2\n'
+    )
+
+
+def test_labels_must_match(registry):
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    with pytest.raises(ValueError):
+        requests.inc(path="/a")
+
+
+def test_duplicate_names_are_rejected(registry):
+    registry.counter("x_total", "X.")
+    with pytest.raises(ValueError):
+        registry.gauge("x_total", "X.")
+
+
+def test_gauge_inc_dec_and_function(registry):
+    in_flight = registry.gauge("in_flight", "In flight.")
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    assert in_flight.value() == 1
+    age = registry.gauge("age_seconds", "Age.", function=lambda: 1.5)
+    assert "age_seconds 1.5" in registry.render()
+    assert age.value() == 1.5
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, route="/a")
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+    assert latency.count(route="/a") == 4
+
+
+def test_label_values_are_escaped(registry):
+    errors = registry.counter("errors_total", "Errors.", ("reason",))
+    errors.inc(reason='bad "quote"\n')
+    assert 'errors_total{reason="bad \\"quote\\"\\n"} 1' in registry.render()
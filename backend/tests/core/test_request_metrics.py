@@ -0,0 +1,33 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import request_metrics
+from app.core.request_metrics import RequestMetricsMiddleware
+
+
+def test_routes_are_labelled_with_their_full_path_template(monkeypatch):
+    labels = []
+    monkeypatch.setattr(request_metrics.http_requests, "inc", lambda **labelled: labels.append(labelled["route"]))
+
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    mounted = FastAPI()
+
+    @mounted.get("/ping")
+    def ping():
+        return {}
+
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+    app.include_router(router, prefix="/api/v1")
+    app.mount("/sub", mounted)
+
+    with TestClient(app) as client:
+        client.get("/api/v1/items/7")
+        client.get("/sub/ping")
+        client.get("/missing")
+    assert labels == ["/api/v1/items/{item_id}", "/sub/ping", "unmatched"]
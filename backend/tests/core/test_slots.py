@@ -0,0 +1,74 @@
+import pytest
+from pydantic import ValidationError
+
+from app.api.v1.schemas import Course, CourseCreate
+from app.core.slots import ALL_SLOTS, canonical_slot, check_slot, find_lab_slot, is_legal_slot
+from app.services.course_scraper import parse_course_row
+from app.services.timetable import SLOT_MEETINGS
+
+
+def test_canonical_slots_are_the_timetable_slots():
+    assert set(ALL_SLOTS) == set(SLOT_MEETINGS)
+
+
+@pytest.mark.parametrize("course_type,slot,expected", [
+    ("Theory", "1", "1"),
+    ("Theory", "07", "7"),
+    ("Theory", "15", "15"),
+    ("Lab", "L1", "L1"),
+    ("Lab", "L6", "L6"),
+])
+def test_legal_slots(course_type, slot, expected):
+    assert is_legal_slot(course_type, slot)
+    assert canonical_slot(course_type, slot) == expected
+    assert check_slot(course_type, slot) == expected
+
+
+@pytest.mark.parametrize("course_type,slot", [
+    ("Theory", "0"),
+    ("Theory", "16"),
+    ("Theory", "007"),
+    ("Theory", "L1"),
+    ("Lab", "L7"),
+    ("Lab", "L01"),
+    ("Lab", "3"),
+    ("Non-Credit", "1"),
+])
+def test_illegal_slots(course_type, slot):
+    assert not is_legal_slot(course_type, slot)
+    assert canonical_slot(course_type, slot) is None
+    with pytest.raises(ValueError):
+        check_slot(course_type, slot)
+
+
+def test_check_slot_messages():
+    with pytest.raises(ValueError, match="Theory courses must have slots 1-15, got 'L2'"):
+        check_slot("Theory", "L2")
+    with pytest.raises(ValueError, match="Unknown course type 'Seminar'"):
+        check_slot("Seminar", "1")
+
+
+def test_find_lab_slot():
+    assert find_lab_slot("L3\nTue 2pm") == "L3"
+    assert find_lab_slot("Lab in L5, L2") == "L5"
+    assert find_lab_slot("Slot 4") is None
+
+
+def test_schemas_store_canonical_slots():
+    assert Course(id="x", course_code="CS 101", course_name="Intro", course_type="Theory", slot="07").slot == "7"
+    assert CourseCreate(course_code="CS 101", course_name="Intro", course_type="Lab", slot="L2").slot == "L2"
+
+
+def test_course_create_rejects_illegal_courses():
+    with pytest.raises(ValidationError):
+        CourseCreate(course_code="CS 101", course_name="Intro", course_type="Theory", slot="L2")
+    with pytest.raises(ValidationError):
+        CourseCreate(course_code="cs101", course_name="Intro", course_type="Theory", slot="2")
+
+
+def test_scraper_canonicalizes_slots():
+    assert parse_course_row("CS 101", "Intro", "Theory", "07\nMon 9:30")["slot"] == "7"
+    assert parse_course_row("CS 102", "Lab", "Lab", "L4\nTue 2pm")["slot"] == "L4"
+    assert parse_course_row("CS 103", "Intro", "Theory", "L4") is None
+    assert parse_course_row("CS 104", "Seminar", "Non-Credit", "X") is None
+    assert parse_course_row("CS 105", "Seminar", "Non-Credit", "Fri\n5pm")["slot"] == "Fri"
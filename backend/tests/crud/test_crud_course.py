@@ -1,2 +1,29 @@
+import asyncio
+from app import crud
+from app.db.memory import MemoryAsyncFirestore
+
 def test_get_departments_endpoint(client):
-    assert 10==10
\ No newline at end of file
+    assert 10==10
+
+
+def test_course_get_all_uses_document_id():
+    db = MemoryAsyncFirestore({"courses": {
+        "abc": {"course_name": "Calculus", "course_code": "MA 105", "course_type": "Theory", "slot": "1"},
+    }})
+    courses = asyncio.run(crud.course.get_all(db))
+    assert len(courses) == 1
+    assert courses[0].id == "abc"
+    assert courses[0].course_code == "MA 105"
+
+
+def test_department_get_all_falls_back_to_document_id_for_name():
+    db = MemoryAsyncFirestore({"departments": {"Chemistry": {"code": "CH"}}})
+    departments = asyncio.run(crud.department.get_all(db))
+    assert departments[0].name == "Chemistry"
+
+
+def test_department_courses_get_all_keys_plans_by_department():
+    db = MemoryAsyncFirestore({"department_courses": {"Chemistry": {"1": ["CH 105"]}, "Physics": {}}}, record_calls=True)
+    plans = asyncio.run(crud.department_courses.get_all(db))
+    assert plans == {"Chemistry": {"1": ["CH 105"]}, "Physics": {}}
+    assert db.streams == ["department_courses"]
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.core.metrics import firestore_call_duration, firestore_calls, firestore_documents
+from app.db.instrumented import InstrumentedAsyncClient
+from app.db.memory import MemoryAsyncFirestore
+
+
+def test_streams_and_reads_are_counted_and_timed():
+    fake = MemoryAsyncFirestore({"probe_courses": {"a": {"x": 1}, "b": {"x": 2}}}, record_calls=True)
+    db = InstrumentedAsyncClient(fake)
+    streams_before = firestore_calls.value(operation="stream", collection="probe_courses", outcome="ok")
+    gets_before = firestore_calls.value(operation="get", collection="probe_courses", outcome="ok")
+    documents_before = firestore_documents.value(collection="probe_courses")
+    timed_before = firestore_call_duration.count(operation="stream", collection="probe_courses")
+
+    async def scenario():
+        docs = [doc async for doc in db.collection("probe_courses").order_by("x").limit(5).stream()]
+        snapshot = await db.collection("probe_courses").document("a").get()
+        missing = await db.collection("probe_courses").document("zz").get()
+        return docs, snapshot, missing
+
+    docs, snapshot, missing = asyncio.run(scenario())
+    assert [doc.id for doc in docs] == ["a", "b"]
+    assert snapshot.to_dict() == {"x": 1}
+    assert not missing.exists
+    assert firestore_calls.value(operation="stream", collection="probe_courses", outcome="ok") == streams_before + 1
+    assert firestore_calls.value(operation="get", collection="probe_courses", outcome="ok") == gets_before + 2
+    assert firestore_documents.value(collection="probe_courses") == documents_before + 3
+    assert firestore_call_duration.count(operation="stream", collection="probe_courses") == timed_before + 1
+    assert fake.streams == ["probe_courses"]
+
+
+def test_failed_stream_is_counted_as_error():
+    class Broken:
+        def collection(self, name):
+            return self
+
+        async def stream(self):
+            raise RuntimeError("unavailable")
+            yield
+
+    db = InstrumentedAsyncClient(Broken())
+    before = firestore_calls.value(operation="stream", collection="probe_broken", outcome="error")
+
+    async def scenario():
+        return [doc async for doc in db.collection("probe_broken").stream()]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
+    assert firestore_calls.value(operation="stream", collection="probe_broken", outcome="error") == before + 1
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import deps
+from app.crud.crud_course import course
+from app.db import session
+from app.db.instrumented import InstrumentedAsyncClient
+from app.db.memory import Latency, MemoryAsyncFirestore, MemoryFirestore, artifact_collections
+from app.services.catalogue_artifact import write_catalogue_artifact
+from app.services.course_uploader import sync_courses
+from benchmarks.catalogue import artifact_catalogue
+
+
+@pytest.fixture
+def memory_backend(monkeypatch):
+    """A fresh memory backend: new clients and an unseeded store."""
+    monkeypatch.setattr(session.config, "STORAGE_BACKEND", "memory")
+    monkeypatch.setattr(session, "_client", None)
+    monkeypatch.setattr(session, "_async_client", None)
+    monkeypatch.setattr(session, "_memory_collections", None)
+    return monkeypatch
+
+
+def test_memory_backend_clients_share_one_store(memory_backend, tmp_path):
+    memory_backend.setattr(session.config, "MEMORY_SEED_PATH", str(tmp_path / "missing.iitbcat"))
+    client = session.get_client()
+    db = session.get_async_client()
+    assert isinstance(client, MemoryFirestore)
+    assert isinstance(db, InstrumentedAsyncClient)
+
+    sync_courses(client, [{"course_code": "CS 101", "course_name": "Intro", "course_type": "Theory", "slot": "3"}])
+    courses = asyncio.run(course.get_all(db))
+    assert [(c.id, c.course_code) for c in courses] == [("CS101", "CS 101")]
+
+
+def test_memory_backend_is_seeded_from_the_artifact(memory_backend, tmp_path):
+    catalogue = artifact_catalogue(scale=1)
+    path = str(tmp_path / "catalogue.iitbcat")
+    write_catalogue_artifact(path, **catalogue)
+    memory_backend.setattr(session.config, "MEMORY_SEED_PATH", path)
+
+    db = asyncio.run(deps.get_db().__anext__())
+    courses = asyncio.run(course.get_all(db))
+    assert len(courses) == len(catalogue["courses"])
+    assert session.get_client().collections is db.collections
+    assert artifact_collections(path) == db.collections
+
+
+def test_unknown_backend_is_unavailable(memory_backend):
+    memory_backend.setattr(session.config, "STORAGE_BACKEND", "postgres")
+    memory_backend.setattr(deps.config, "CATALOGUE_ARTIFACT_PATH", None)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(deps.get_db().__anext__())
+    assert exc_info.value.status_code == 503
+
+
+def test_latency_is_repeatable():
+    first, second = Latency(0.01, 0.02, seed=7), Latency(0.01, 0.02, seed=7)
+    delays = [first.next() for _ in range(50)]
+    assert delays == [second.next() for _ in range(50)]
+    assert all(0.01 <= delay <= 0.03 for delay in delays)
+    assert Latency(0.01).next() == 0.01
+    assert not Latency()
+
+
+def test_latency_is_waited_out():
+    db = MemoryAsyncFirestore({"courses": {"a": {}}}, latency_seconds=0.02)
+
+    async def timed_read():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await db.collection("courses").document("a").get()
+        return loop.time() - start
+
+    assert asyncio.run(timed_read()) >= 0.015
+
+
+def test_calls_are_recorded_only_when_asked():
+    quiet = MemoryFirestore({"courses": {"a": {}}})
+    recording = MemoryFirestore({"courses": {"a": {}}}, record_calls=True)
+    for client in (quiet, recording):
+        list(client.collection("courses").stream())
+        client.collection("courses").document("a").get()
+    assert quiet.streams == [] and quiet.reads == []
+    assert recording.streams == ["courses"]
+    assert recording.reads == [("courses", "a")]
+
+
+def test_failed_commit_writes_nothing():
+    client = MemoryFirestore(failures=[RuntimeError("connection lost")], record_calls=True)
+    batch = client.batch()
+    batch.set(client.collection("courses").document("a"), {"x": 1})
+    with pytest.raises(RuntimeError):
+        batch.commit()
+    assert client.collections == {} and client.commits == []
+    batch.commit()
+    assert client.collections == {"courses": {"a": {"x": 1}}}
+    assert client.commits == [[("set", "a", {"x": 1})]]
@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+
+from app.api import deps
+from app.db import session
+from app.db.session import DatabaseUnavailableError
+
+
+def test_get_db_returns_503_when_firestore_cannot_be_initialized(monkeypatch):
+    def unavailable():
+        raise DatabaseUnavailableError("Service account key file not found")
+
+    monkeypatch.setattr(deps, "get_async_client", unavailable)
+
+    async def first_db():
+        return await deps.get_db().__anext__()
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(first_db())
+    assert exc_info.value.status_code == 503
+
+
+def test_get_db_yields_none_when_the_catalogue_comes_from_an_artifact(monkeypatch):
+    def unavailable():
+        raise DatabaseUnavailableError("Service account key file not found")
+
+    monkeypatch.setattr(deps, "get_async_client", unavailable)
+    monkeypatch.setattr(deps.config, "CATALOGUE_ARTIFACT_PATH", "/data/catalogue.iitbcat")
+
+    async def first_db():
+        return await deps.get_db().__anext__()
+
+    assert asyncio.run(first_db()) is None
+
+
+def test_missing_key_file_raises_instead_of_exiting(monkeypatch):
+    monkeypatch.setattr(session, "_app_initialized", False)
+    monkeypatch.setattr(session, "_async_client", None)
+    monkeypatch.setattr(session.config, "STORAGE_BACKEND", "firestore")
+    monkeypatch.setattr(session.config, "SERVICE_ACCOUNT_KEY_PATH", "/nonexistent/key.json")
+
+    with pytest.raises(DatabaseUnavailableError):
+        session.get_async_client()
@@ -0,0 +1,99 @@
+import pytest
+from google.api_core import exceptions
+from app.services.batch_writer import FIRESTORE_BATCH_LIMIT, chunked, commit_batch, write_in_batches
+from app.services.course_uploader import upload_courses
+from app.db.memory import MemoryFirestore
+
+
+def make_client(failures=()):
+    return MemoryFirestore(failures=failures, record_calls=True)
+
+
+def ref(client, doc_id):
+    return client.collection("docs").document(doc_id)
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_commit_batch_retries_transient_errors():
+    client = make_client(failures=[exceptions.ServiceUnavailable("busy"), exceptions.DeadlineExceeded("slow")])
+    operations = [("set", ref(client, "a"), {"x": 1})]
+    retries = commit_batch(client, operations, sleep=lambda seconds: None)
+    assert retries == 2
+    assert client.commits == [[("set", "a", {"x": 1})]]
+
+
+def test_commit_batch_does_not_retry_permanent_errors():
+    client = make_client(failures=[exceptions.PermissionDenied("no")])
+    with pytest.raises(exceptions.PermissionDenied):
+        commit_batch(client, [("delete", ref(client, "a"), None)], sleep=lambda seconds: None)
+
+
+def test_write_in_batches_splits_at_batch_limit():
+    client = make_client()
+    operations = [("set", ref(client, str(i)), {"i": i}) for i in range(1201)]
+    summary = write_in_batches(client, operations)
+    assert sorted(len(commit) for commit in client.commits) == [201, FIRESTORE_BATCH_LIMIT, FIRESTORE_BATCH_LIMIT]
+    assert summary.written == 1201
+    assert summary.batches == 3
+    assert summary.failed == 0
+
+
+def test_write_in_batches_reports_failed_batches():
+    client = make_client(failures=[exceptions.PermissionDenied("no")])
+    summary = write_in_batches(client, [("set", ref(client, str(i)), {}) for i in range(10)], batch_size=5, max_workers=1)
+    assert summary.written == 5
+    assert summary.failed == 5
+    assert "no" in summary.report()
+
+
+def test_write_in_batches_rejects_oversized_batches():
+    with pytest.raises(ValueError):
+        write_in_batches(make_client(), [], batch_size=FIRESTORE_BATCH_LIMIT + 1)
+
+
+def test_upload_courses():
+    client = make_client()
+    courses = [{"course_code": f"CS {100 + i}"} for i in range(3)]
+    summary = upload_courses(client, courses)
+    assert summary.written == 3
+    assert [data for commit in client.commits for _, _, data in commit] == courses
+
+
+def test_write_batches_reads_only_as_fast_as_it_writes():
+    import threading
+    from app.services.batch_writer import write_batches
+
+    produced = []
+    committed = []
+    lock = threading.Lock()
+
+    class SlowClient(MemoryFirestore):
+        def batch(self):
+            batch = super().batch()
+            commit = batch.commit
+
+            def slow_commit():
+                with lock:
+                    # Everything read but not yet committed is waiting in the queue or in a writer
+                    assert len(produced) - len(committed) <= 2 + 1 + 1
+                commit()
+                with lock:
+                    committed.append(1)
+
+            batch.commit = slow_commit
+            return batch
+
+    def batches():
+        for i in range(20):
+            with lock:
+                produced.append(i)
+            yield [("set", ref(client, str(i)), {"i": i})]
+
+    indexes = []
+    client = SlowClient()
+    summary = write_batches(client, batches(), max_workers=1, max_pending=2, on_batch=lambda index, batch, error: indexes.append(index))
+    assert summary.written == 20
+    assert sorted(indexes) == list(range(20))
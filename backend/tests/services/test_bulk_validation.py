@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+from app.api.v1.schemas import Course
+from app.core.slots import check_slot
+from app.services.bulk_validation import validate_courses
+
+
+def course(code="CS 101", name="Intro", course_type="Theory", slot="3", **extra):
+    return {"course_code": code, "course_name": name, "course_type": course_type, "slot": slot, **extra}
+
+
+def test_valid_courses_are_cleaned_and_kept():
+    valid, report = validate_courses([course(code=" CS 101 ", name=" Intro  ", slot=" 3"), course("EE2101", course_type="Lab", slot="L2")])
+    assert list(valid["course_code"]) == ["CS 101", "EE2101"]
+    assert list(valid["course_name"]) == ["Intro", "Intro"]
+    assert list(valid["slot"]) == ["3", "L2"]
+    assert report.total == 2 and report.valid == 2 and report.rejected_count == 0
+    assert report.counts == {}
+
+
+def test_slots_are_canonicalized():
+    valid, _ = validate_courses([course(slot="07"), course(slot="12"), course(course_type="Lab", slot="L4")])
+    assert list(valid["slot"]) == ["7", "12", "L4"]
+
+
+def test_extra_columns_survive():
+    valid, _ = validate_courses(pd.DataFrame([course(department="CS")]))
+    assert valid.iloc[0]["department"] == "CS"
+
+
+def test_rejections_list_every_reason():
+    records = [
+        course(),
+        course(code="cs101"),
+        course(course_type="Tutorial"),
+        course(slot="16"),
+        course(course_type="Lab", slot="L7"),
+        course(code="XYZ", slot="0"),
+        {"course_code": "CS 102", "course_name": "No slot", "course_type": "Theory"},
+    ]
+    valid, report = validate_courses(records)
+    assert list(valid.index) == [0]
+    reasons = dict(zip(report.rejected.index, report.rejected["reasons"]))
+    assert reasons == {
+        1: ("invalid_course_code",),
+        2: ("invalid_course_type",),
+        3: ("invalid_theory_slot",),
+        4: ("invalid_lab_slot",),
+        5: ("invalid_course_code", "invalid_theory_slot"),
+        6: ("missing_slot",),
+    }
+    assert report.counts == {
+        "invalid_course_code": 2,
+        "invalid_course_type": 1,
+        "invalid_theory_slot": 2,
+        "invalid_lab_slot": 1,
+        "missing_slot": 1,
+    }
+    assert report.to_records()[0]["row"] == 1
+    assert report.summary().startswith("1/7 courses valid, 6 rejected")
+
+
+def test_empty_input():
+    valid, report = validate_courses([])
+    assert valid.empty
+    assert report.total == 0 and report.summary().startswith("0/0")
+
+
+@pytest.mark.parametrize("code, course_type, slot", [
+    ("CS 101", "Theory", "1"), ("CSE101", "Theory", "15"), ("ME2024", "Theory", "01"),
+    ("CS 101", "Theory", "0"), ("CS 101", "Theory", "L1"), ("CS 101", "Theory", "1a"),
+    ("CS 101", "Lab", "L6"), ("CS 101", "Lab", "L0"), ("CS 101", "Lab", "3"), ("CS 101", "Lab", "L12"),
+    ("CS  101", "Theory", "1"), ("C 1010", "Theory", "1"), ("CS 101", "theory", "1"),
+    ("cs 101", "Theory", "1"), ("CS 1O1", "Theory", "1"), ("CS 10", "Theory", "1"), ("CS \uff11\uff10\uff11", "Theory", "1"),
+])
+def test_agrees_with_course_schema(code, course_type, slot):
+    try:
+        Course(id="1", course_name="Intro", course_code=code, course_type=course_type, slot=slot)
+        schema_valid = True
+    except ValidationError:
+        schema_valid = False
+    valid, report = validate_courses([course(code, course_type=course_type, slot=slot)])
+    assert (report.rejected_count == 0) == schema_valid
+    if schema_valid:
+        assert valid.iloc[0]["slot"] == check_slot(course_type, slot)
@@ -0,0 +1,78 @@
+import struct
+
+import pytest
+
+from app.services.catalogue_artifact import (
+    ARTIFACT_FORMAT, MAGIC, ArtifactFormatError, CatalogueArtifact, DictionaryColumn,
+    encode_catalogue, read_catalogue_artifact, update_catalogue_artifact, write_catalogue_artifact,
+)
+
+COURSES = [
+    {"department": "electrical", "course_code": "EE 229", "course_name": "Signal Processing", "course_type": "Theory", "slot": "3"},
+    {"department": "computer_science", "course_code": "CS 293", "course_name": "Data Structures Lab", "course_type": "Lab", "slot": "L3"},
+    {"department": "computer_science", "course_code": "CS 101", "course_name": "Programmation café", "course_type": "Theory", "slot": "3"},
+]
+PLANS = {"Computer Science and Engineering": {"2": ["CS 293"], "1": ["CS 101"]}}
+DEPARTMENTS = [{"id": "Computer Science and Engineering", "name": "Computer Science and Engineering", "code": "CS"}]
+
+
+def test_round_trip_sorted_by_department_and_code():
+    artifact = CatalogueArtifact(encode_catalogue(COURSES, DEPARTMENTS, PLANS))
+    assert len(artifact) == 3
+    assert [record["course_code"] for record in artifact.records()] == ["CS 101", "CS 293", "EE 229"]
+    assert list(artifact.records())[0] == COURSES[2]
+    assert artifact.departments == DEPARTMENTS
+    assert artifact.department_courses == {"Computer Science and Engineering": {"1": ["CS 101"], "2": ["CS 293"]}}
+
+
+def test_repeated_columns_are_dictionary_encoded():
+    artifact = CatalogueArtifact(encode_catalogue(COURSES))
+    slots = artifact.columns["slot"]
+    assert isinstance(slots, DictionaryColumn)
+    assert slots.dictionary == ("3", "L3")
+    assert list(slots.codes) == [0, 1, 0]
+    assert slots[-1] == "3" and slots[:2] == ["3", "L3"]
+    names = artifact.columns["course_name"]
+    assert names[0] == "Programmation café" and names[1:] == ["Data Structures Lab", "Signal Processing"]
+
+
+def test_version_depends_only_on_content():
+    assert CatalogueArtifact(encode_catalogue(COURSES)).version == CatalogueArtifact(encode_catalogue(COURSES[::-1])).version
+    assert CatalogueArtifact(encode_catalogue(COURSES)).version != CatalogueArtifact(encode_catalogue(COURSES[:2])).version
+    assert CatalogueArtifact(encode_catalogue(COURSES)).version != CatalogueArtifact(encode_catalogue(COURSES, department_courses=PLANS)).version
+
+
+def test_empty_catalogue():
+    artifact = CatalogueArtifact(encode_catalogue([]))
+    assert len(artifact) == 0
+    assert list(artifact.records()) == []
+
+
+def test_rejects_other_files_and_formats():
+    with pytest.raises(ArtifactFormatError):
+        CatalogueArtifact(b"course_code,course_name\n")
+    newer = struct.pack("<8sII", MAGIC, ARTIFACT_FORMAT + 1, 2) + b"{}"
+    with pytest.raises(ArtifactFormatError, match="format"):
+        CatalogueArtifact(newer)
+
+
+def test_file_is_memory_mapped_and_closes_cleanly(tmp_path):
+    path = str(tmp_path / "catalogue.iitbcat")
+    version = write_catalogue_artifact(path, COURSES, DEPARTMENTS, PLANS)
+    with CatalogueArtifact.open(path) as artifact:
+        assert artifact.version == version
+        records = artifact.records()
+        frame = artifact.to_frame()
+        next(records)
+    assert list(frame["course_code"]) == ["CS 101", "CS 293", "EE 229"]
+    assert str(frame["slot"].dtype) == "category"
+
+
+def test_update_replaces_only_the_given_parts(tmp_path):
+    path = str(tmp_path / "catalogue.iitbcat")
+    update_catalogue_artifact(path, courses=COURSES, departments=DEPARTMENTS)
+    update_catalogue_artifact(path, department_courses=PLANS)
+    courses, departments, plans = read_catalogue_artifact(path)
+    assert len(courses) == 3
+    assert departments == DEPARTMENTS
+    assert plans["Computer Science and Engineering"]["1"] == ["CS 101"]
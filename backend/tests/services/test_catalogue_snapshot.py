@@ -0,0 +1,204 @@
+import asyncio
+import pytest
+
+from app.services.catalogue_artifact import write_catalogue_artifact
+from app.services.catalogue_snapshot import SnapshotStore, artifact_loader, build_department_index, load_catalogue_snapshot
+from app.db.memory import MemoryAsyncFirestore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSnapshot:
+    def __init__(self, version, loaded_at):
+        self.version = version
+        self.loaded_at = loaded_at
+
+
+def make_store(clock, fail=lambda: False, delay=0.0):
+    calls = []
+
+    async def loader(db, previous=None):
+        calls.append(db)
+        await asyncio.sleep(delay)
+        if fail():
+            raise RuntimeError("firestore is down")
+        return FakeSnapshot(len(calls), clock())
+
+    return SnapshotStore(60, loader=loader, clock=clock), calls
+
+
+def test_first_get_waits_for_the_load():
+    clock = Clock()
+    store, calls = make_store(clock)
+    assert asyncio.run(store.get("db")).version == 1
+    assert calls == ["db"]
+
+
+def test_first_load_failure_is_raised():
+    store, _ = make_store(Clock(), fail=lambda: True)
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.get("db"))
+    assert store.snapshot is None
+
+
+def test_stale_snapshot_is_served_while_refreshing():
+    clock = Clock()
+    store, calls = make_store(clock)
+
+    async def scenario():
+        await store.get("db")
+        clock.now = 61
+        stale = await store.get("db")
+        await asyncio.sleep(0)
+        return stale
+
+    assert asyncio.run(scenario()).version == 1
+    assert len(calls) == 2
+    assert store.snapshot.version == 2
+    assert not store.is_stale()
+
+
+def test_failed_refresh_keeps_serving_the_previous_snapshot():
+    clock = Clock()
+    down = False
+    store, _ = make_store(clock, fail=lambda: down)
+
+    async def scenario():
+        nonlocal down
+        await store.get("db")
+        down = True
+        clock.now = 61
+        first = await store.get("db")
+        await asyncio.sleep(0)
+        return first, await store.get("db")
+
+    first, second = asyncio.run(scenario())
+    assert first.version == second.version == 1
+    assert store.is_stale()
+
+
+def test_concurrent_refreshes_share_one_load():
+    store, calls = make_store(Clock(), delay=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(store.refresh("db") for _ in range(5)))
+
+    assert {snapshot.version for snapshot in asyncio.run(scenario())} == {1}
+    assert len(calls) == 1
+
+
+def test_load_started_before_clear_is_not_swapped_in():
+    store, _ = make_store(Clock(), delay=0.01)
+
+    async def scenario():
+        refresh = asyncio.ensure_future(store.refresh("db"))
+        await asyncio.sleep(0)
+        store.clear()
+        await refresh
+
+    asyncio.run(scenario())
+    assert store.snapshot is None
+
+
+def test_invalidate_wakes_the_refresher():
+    clock = Clock()
+    store, calls = make_store(clock)
+
+    async def scenario():
+        await store.refresh("db")
+        refresher = asyncio.ensure_future(store.run_refresher(lambda: "db", interval_seconds=3600))
+        await asyncio.sleep(0)
+        store.invalidate()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        refresher.cancel()
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert store.snapshot.version == 2
+
+
+def test_load_catalogue_snapshot_indexes_every_collection():
+    db = MemoryAsyncFirestore({
+        "courses": {"c1": {"course_name": "Computer Programming", "course_code": "CS 101", "course_type": "Theory", "slot": "3"}},
+        "departments": {"cse": {"name": "Computer Science", "code": "CS"}},
+        "department_courses": {"Computer Science": {"1": ["CS 101"]}},
+    })
+    snapshot = asyncio.run(load_catalogue_snapshot(db, clock=lambda: 42.0))
+    assert [course.id for course in snapshot.courses] == ["c1"]
+    assert snapshot.department_index["CS"] == "Computer Science"
+    assert snapshot.department_courses["Computer Science"] == {"1": ["CS 101"]}
+    assert snapshot.search_index.search("programming")[0].id == "c1"
+    assert snapshot.loaded_at == 42.0
+    with pytest.raises(TypeError):
+        snapshot.department_courses["Other"] = {}
+
+
+def test_refresh_updates_a_copy_of_the_previous_search_index():
+    collections = {"courses": {
+        "c1": {"course_name": "Computer Programming", "course_code": "CS 101", "course_type": "Theory", "slot": "3"},
+        "c2": {"course_name": "Thermodynamics", "course_code": "ME 209", "course_type": "Theory", "slot": "4"},
+    }}
+    db = MemoryAsyncFirestore(collections)
+    first = asyncio.run(load_catalogue_snapshot(db))
+    collections["courses"]["c2"] = {**collections["courses"]["c2"], "course_name": "Fluid Mechanics"}
+    second = asyncio.run(load_catalogue_snapshot(db, previous=first))
+    assert [course.id for course in second.search_index.search("fluid")] == ["c2"]
+    assert second.search_index.search("thermo") == []
+    # The snapshot being replaced keeps answering from its own index
+    assert [course.id for course in first.search_index.search("thermo")] == ["c2"]
+    assert first.search_index.search("fluid") == []
+
+
+def test_version_does_not_depend_on_stream_order():
+    collections = {
+        "courses": {
+            "c1": {"course_name": "Computer Programming", "course_code": "CS 101", "course_type": "Theory", "slot": "3"},
+            "c2": {"course_name": "Thermodynamics", "course_code": "ME 209", "course_type": "Theory", "slot": "4"},
+        },
+        "departments": {"cse": {"name": "Computer Science", "code": "CS"}, "me": {"name": "Mechanical", "code": "ME"}},
+        "department_courses": {"Computer Science": {"1": ["CS 101"], "2": []}, "Mechanical": {"3": ["ME 209"]}},
+    }
+    reordered = {
+        "courses": dict(reversed(collections["courses"].items())),
+        "departments": dict(reversed(collections["departments"].items())),
+        "department_courses": {
+            name: dict(reversed(plan.items())) for name, plan in reversed(collections["department_courses"].items())
+        },
+    }
+    first = asyncio.run(load_catalogue_snapshot(MemoryAsyncFirestore(collections)))
+    second = asyncio.run(load_catalogue_snapshot(MemoryAsyncFirestore(reordered)))
+    assert first.version == second.version
+    assert first.department_courses_body.identity == second.department_courses_body.identity
+    assert first.departments_body.identity == second.departments_body.identity
+
+
+def test_department_index_falls_back_to_static_mapping():
+    assert build_department_index([])["CS"] == "Computer Science and Engineering"
+
+
+def test_artifact_loader_boots_without_firestore(tmp_path):
+    path = str(tmp_path / "catalogue.iitbcat")
+    write_catalogue_artifact(
+        path,
+        [
+            {"department": "computer_science", "course_code": "CS 101", "course_name": "Computer Programming", "course_type": "Theory", "slot": "3"},
+            # Listed by a second department: one course per code, like the uploader writes
+            {"department": "electrical", "course_code": "CS 101", "course_name": "Computer Programming", "course_type": "Theory", "slot": "3"},
+            {"department": "electrical", "course_code": "EE 229", "course_name": "Bad slot", "course_type": "Theory", "slot": "L2"},
+        ],
+        departments=[{"id": "Computer Science", "name": "Computer Science", "code": "CS"}],
+        department_courses={"Computer Science": {"1": ["CS 101"]}},
+    )
+    store = SnapshotStore(60, loader=artifact_loader(path, clock=lambda: 7.0))
+    snapshot = asyncio.run(store.get(None))
+    assert [course.id for course in snapshot.courses] == ["CS101"]
+    assert snapshot.department_index["CS"] == "Computer Science"
+    assert snapshot.department_courses["Computer Science"] == {"1": ["CS 101"]}
+    assert snapshot.loaded_at == 7.0
@@ -0,0 +1,78 @@
+import pytest
+from app.api.v1.schemas import Course
+from app.services.course_index import CourseIndex, normalize_code, paginate
+
+
+def make_course(doc_id, code, course_type="Theory", slot="1"):
+    return Course(id=doc_id, course_name=f"Course {code}", course_code=code, course_type=course_type, slot=slot)
+
+
+CATALOGUE = [
+    make_course("1", "CS 101", "Theory", "3"),
+    make_course("2", "CS 293", "Lab", "L3"),
+    make_course("3", "CSE101", "Theory", "5"),
+    make_course("4", "EE 229", "Lab", "L3"),
+    make_course("5", "EE 101", "Theory", "3"),
+    make_course("6", "ME2024", "Theory", "3"),
+]
+
+
+@pytest.fixture
+def index():
+    return CourseIndex(CATALOGUE)
+
+
+def codes(courses):
+    return [course.course_code for course in courses]
+
+
+@pytest.mark.parametrize("raw, expected", [("CS 101", "CS101"), ("cs101", "CS101"), (" EE  2 ", "EE2")])
+def test_normalize_code(raw, expected):
+    assert normalize_code(raw) == expected
+
+
+def test_no_filters_returns_sorted_catalogue(index):
+    assert codes(index.filter()) == ["CS 101", "CS 293", "CSE101", "EE 101", "EE 229", "ME2024"]
+
+
+def test_filter_by_type_and_slot(index):
+    assert codes(index.filter(course_type="Lab", slot="L3")) == ["CS 293", "EE 229"]
+
+
+def test_filter_by_department(index):
+    assert codes(index.filter(department="EE")) == ["EE 101", "EE 229"]
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("CS", ["CS 101", "CS 293", "CSE101"]),
+    ("cs 1", ["CS 101"]),
+    ("CSE", ["CSE101"]),
+    ("ZZ", []),
+])
+def test_filter_by_code_prefix(index, prefix, expected):
+    assert codes(index.filter(code_prefix=prefix)) == expected
+
+
+def test_filters_combine(index):
+    assert codes(index.filter(course_type="Theory", slot="3", code_prefix="CS")) == ["CS 101"]
+    assert index.filter(department="ME", course_type="Lab") == []
+
+
+def test_paginate(index):
+    courses = index.filter()
+    page, next_key = paginate(courses, 4)
+    assert codes(page) == ["CS 101", "CS 293", "CSE101", "EE 101"]
+    page, next_key = paginate(courses, 4, next_key)
+    assert codes(page) == ["EE 229", "ME2024"]
+    assert next_key is None
+
+
+def test_lookup_by_code_in_any_format():
+    index = CourseIndex([
+        make_course("a", "AE 103"),
+        make_course("b", "AE 103"),
+        make_course("c", "EE2101"),
+    ])
+    courses, missing = index.lookup(["ee 2101", "AE103", "XX 000", "ae 103"])
+    assert [course.id for course in courses] == ["c", "a", "b"]
+    assert missing == ["XX 000"]
@@ -0,0 +1,70 @@
+import pytest
+from app.api.v1.schemas import Course
+from app.services.course_search import CourseSearchIndex, tokenize
+
+
+def make_course(doc_id, code, name):
+    return Course(id=doc_id, course_name=name, course_code=code, course_type="Theory", slot="1")
+
+
+CATALOGUE = [
+    make_course("1", "ME 209", "Thermodynamics"),
+    make_course("2", "CL 253", "Chemical Engineering Thermodynamics I"),
+    make_course("3", "EE 229", "Signal Processing"),
+    make_course("4", "EE 204", "Analog Circuits"),
+    make_course("5", "CS 101", "Computer Programming and Utilization"),
+    make_course("6", "CSE101", "Thermal Physics"),
+    make_course("7", "CS1011", "Programming Lab"),
+]
+
+
+@pytest.fixture
+def index():
+    search_index = CourseSearchIndex()
+    search_index.update(CATALOGUE)
+    return search_index
+
+
+def codes(courses):
+    return [course.course_code for course in courses]
+
+
+def test_tokenize():
+    assert tokenize("Computer Programming & Utilization-II") == ["computer", "programming", "utilization", "ii"]
+
+
+def test_name_prefix_search(index):
+    assert codes(index.search("thermo")) == ["CL 253", "ME 209"]
+    assert codes(index.search("therm")) == ["CL 253", "CSE101", "ME 209"]
+
+
+def test_exact_name_token_ranks_above_prefix(index):
+    assert codes(index.search("programming"))[:2] == ["CS 101", "CS1011"]
+    assert codes(index.search("chemical thermo")) == ["CL 253"]
+
+
+def test_code_prefix_search(index):
+    assert codes(index.search("EE 2")) == ["EE 204", "EE 229"]
+    assert codes(index.search("ee2")) == ["EE 204", "EE 229"]
+
+
+def test_exact_code_ranks_first(index):
+    assert codes(index.search("CS 101")) == ["CS 101", "CS1011"]
+    assert codes(index.search("cs101"))[0] == "CS 101"
+
+
+def test_results_are_capped(index):
+    assert len(index.search("c", limit=2)) == 2
+
+
+def test_no_match(index):
+    assert index.search("quantum") == []
+
+
+def test_update_applies_changes(index):
+    renamed = make_course("3", "EE 229", "Quantum Signals")
+    index.update([course for course in CATALOGUE if course.id not in ("1", "3")] + [renamed])
+    assert codes(index.search("thermo")) == ["CL 253"]
+    assert codes(index.search("quantum")) == ["EE 229"]
+    assert index.search("signal processing") == []
+    assert len(index) == 6
@@ -0,0 +1,48 @@
+import os
+
+from app.services import department_course_scraper
+from app.services.catalogue_artifact import read_catalogue_artifact
+from app.services.scrape_manifest import ScrapeManifest
+
+
+def record_uploads(monkeypatch):
+    uploads = []
+
+    def upload(scraped_data, semesters):
+        uploads.append(department_course_scraper.build_department_documents(scraped_data, semesters))
+        return True
+
+    monkeypatch.setattr(department_course_scraper, "uploadDataToFireStore", upload)
+    return uploads
+
+
+def test_a_failed_page_publishes_nothing(tmp_path, monkeypatch):
+    uploads = record_uploads(monkeypatch)
+    artifact_path = str(tmp_path / "catalogue.iitbcat")
+    manifest = ScrapeManifest(str(tmp_path / "scrape_manifest.json"))
+    scraped_files = [
+        (("sem_1_btech.html", 1), {"Chemistry": {"CH 105"}}),
+        (("sem_1_bs.html", 1), None),
+        (("sem_2_btech.html", 2), {"Physics": {"PH 108"}}),
+    ]
+
+    assert not department_course_scraper.publish_department_courses(scraped_files, [1, 2], manifest, artifact_path)
+    assert uploads == []
+    assert not os.path.exists(artifact_path)
+
+
+def test_complete_scrape_is_published(tmp_path, monkeypatch):
+    uploads = record_uploads(monkeypatch)
+    artifact_path = str(tmp_path / "catalogue.iitbcat")
+    manifest = ScrapeManifest(str(tmp_path / "scrape_manifest.json"))
+    manifest.update("sem_1_btech.html", "digest", {"Chemistry": ["CH 105"]})
+    scraped_files = [
+        (("sem_1_btech.html", 1), {"Chemistry": {"CH 105"}}),
+        (("sem_2_btech.html", 2), {"Chemistry": {"CH 107"}, "Physics": {"PH 108"}}),
+    ]
+
+    assert department_course_scraper.publish_department_courses(scraped_files, [1, 2], manifest, artifact_path)
+    expected = {"Chemistry": {"1": ["CH 105"], "2": ["CH 107"]}, "Physics": {"2": ["PH 108"]}}
+    assert uploads == [expected]
+    assert read_catalogue_artifact(artifact_path)[2] == expected
+    assert not manifest.dirty
@@ -0,0 +1,98 @@
+import pytest
+from app.db.memory import MemoryFirestore
+from app.services.course_uploader import courses_by_document_id, sync_courses
+from app.services.department_course_scraper import build_department_documents
+from app.services.firestore_sync import content_hash, course_document_id, plan_sync, sync_collection
+
+
+def stored_client(stored):
+    """A memory Firestore holding `stored` as its courses collection"""
+    return MemoryFirestore({"courses": stored}, record_calls=True)
+
+
+CS101 = {"course_code": "CS 101", "course_name": "Computer Programming", "course_type": "Theory", "slot": "3"}
+MA105 = {"course_code": "MA 105", "course_name": "Calculus", "course_type": "Theory", "slot": "1"}
+
+
+def written(client):
+    return sorted((action, doc_id) for commit in client.commits for action, doc_id, _ in commit)
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+@pytest.mark.parametrize("code, doc_id", [("CS 101", "CS101"), ("CSE101", "CSE101"), ("ME2024", "ME2024")])
+def test_course_document_id(code, doc_id):
+    assert course_document_id(code) == doc_id
+
+
+def test_plan_sync():
+    existing = {"CS101": content_hash(CS101), "MA105": "stale", "OLD": "x"}
+    desired = {"CS101": CS101, "MA105": MA105, "EE229": {"course_code": "EE 229"}}
+    plan = plan_sync(desired, existing)
+    assert list(plan.inserts) == ["EE229"]
+    assert list(plan.updates) == ["MA105"]
+    assert plan.deletes == ["OLD"]
+    assert plan.unchanged == 1
+
+
+def test_courses_by_document_id_collapses_duplicates():
+    assert list(courses_by_document_id([CS101, MA105, dict(CS101)])) == ["CS101", "MA105"]
+
+
+def test_sync_courses_writes_only_changes():
+    client = stored_client({"CS101": CS101, "random-id": MA105})
+    plan, summary = sync_courses(client, [CS101, MA105])
+    assert written(client) == [("delete", "random-id"), ("set", "MA105")]
+    assert summary.written == 2
+    assert plan.unchanged == 1
+
+
+def test_sync_dry_run_writes_nothing():
+    client = stored_client({})
+    plan, summary = sync_courses(client, [CS101], dry_run=True)
+    assert summary is None
+    assert list(plan.inserts) == ["CS101"]
+    assert client.commits == []
+
+
+def test_sync_with_manifest_skips_reads(tmp_path):
+    manifest = str(tmp_path / "manifest.json")
+    client = stored_client({})
+    sync_collection(client, "courses", {"CS101": CS101}, manifest_path=manifest)
+    assert client.streams == ["courses"]
+
+    second = stored_client({})
+    plan, summary = sync_collection(second, "courses", {"CS101": CS101}, manifest_path=manifest)
+    assert second.streams == []
+    assert plan.is_empty
+    assert second.commits == []
+
+
+def test_failed_sync_keeps_the_manifest_and_logs_why(tmp_path, caplog):
+    manifest = tmp_path / "manifest.json"
+    client = MemoryFirestore(failures=[RuntimeError("connection lost")])
+    with caplog.at_level("WARNING", logger="app.services.firestore_sync"):
+        _, summary = sync_collection(client, "courses", {"CS101": CS101}, manifest_path=str(manifest))
+    assert summary.failed == 1
+    assert not manifest.exists()
+    assert f"Not updating {manifest}: 1 writes failed." in caplog.text
+
+
+def test_sync_refuses_to_empty_collection():
+    with pytest.raises(ValueError):
+        sync_collection(stored_client({"CS101": CS101}), "courses", {})
+
+
+def test_build_department_documents_merges_streams():
+    scraped = [
+        [{"Chemistry": {"CH 107"}}, {"Chemistry": {"CH 117", "MA 105"}}],
+        [],
+        [{"Mathematics": {"MA 214"}}],
+    ]
+    assert build_department_documents(scraped, [1, 2, 3]) == {
+        "Chemistry": {"1": ["CH 107", "CH 117", "MA 105"]},
+        "Mathematics": {"3": ["MA 214"]},
+    }
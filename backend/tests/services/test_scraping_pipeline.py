@@ -0,0 +1,126 @@
+from app.services import course_scraper, department_course_scraper
+from app.services.scrape_manifest import ScrapeManifest
+from app.services.scraping_pipeline import scrape_changed_files, scrape_in_parallel
+
+
+def course_row(code, name, course_type, slot, color="#CCCC99"):
+    cells = ["1", "x", code, name, course_type, "6", "a", "b", slot, "c"]
+    return f'<tr bgcolor="{color}">' + "".join(f"<td> {cell} </td>" for cell in cells) + "</tr>"
+
+
+COURSE_PAGE = (
+    "<html><body><table>"
+    + "<tr><th>header</th></tr>"
+    + course_row("CS 101", "Computer <b>Programming</b>", "Theory", "3<br>Mon 8:30")
+    + course_row("CS 293", "Data Structures Lab", "Lab", "Slot: L2, L4")
+    + course_row("CS 999", "No Slot", "Theory", "X")
+    + course_row("CS 998", "Bad Lab", "Lab", "7")
+    + course_row("CS 997", "Seminar", "Seminar", "5")
+    + course_row("CS 996", "Wrong colour", "Theory", "4", color="#FFFFFF")
+    + course_row("CS 995", "Theory in lab slot", "Theory", "L1")
+    + '<tr bgcolor="#CCCC99"><td>short</td></tr>'
+    + "</table></body></html>"
+)
+
+
+def department_row(department, division, code, first_year_code=""):
+    cells = ["1", "2", "3", "4", department, "5", "6", "7", division if first_year_code else code, first_year_code]
+    return "<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>"
+
+
+DEPARTMENT_PAGE = (
+    '<html><body><table id="layout"><tr><td>nav</td></tr></table>'
+    '<table id="example"><thead><tr><th>Dept</th></tr></thead><tbody>'
+    + department_row("Chemistry", "", "CH 107")
+    + department_row("Chemistry", "", "CH 117")
+    + department_row("Mathematics", "", "MA 105")
+    + department_row("Physics", "", "PH 107")
+    + department_row("Underwater Basket Weaving", "", "UB 101")
+    + "<tr><td>too</td><td>short</td></tr>"
+    + "</tbody></table></body></html>"
+)
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_streaming_course_scrape_matches_beautifulsoup(tmp_path):
+    path = write(tmp_path, "cs.html", COURSE_PAGE)
+    expected = course_scraper.scrape_course_data(COURSE_PAGE)
+    assert [course["course_code"] for course in expected] == ["CS 101", "CS 293"]
+    assert expected[0]["course_name"] == "ComputerProgramming"
+    assert expected[1]["slot"] == "L2"
+    assert list(course_scraper.iter_course_file(path)) == expected
+
+
+def test_streaming_department_scrape_matches_beautifulsoup(tmp_path):
+    path = write(tmp_path, "sem_3_btech.html", DEPARTMENT_PAGE)
+    expected = department_course_scraper.scrape_course_data(DEPARTMENT_PAGE, False)
+    assert expected == {"Chemistry": {"CH 107", "CH 117"}, "Mathematics": {"MA 105"}}
+    assert department_course_scraper.scrape_department_course_file(path, 3) == expected
+
+
+def test_first_year_rows_are_filtered_by_division(tmp_path):
+    page = (
+        '<table id="example"><tbody>'
+        + department_row("Chemistry", "D1", "", "CH 105")
+        + department_row("Chemistry", "D2", "", "CH 999")
+        + "</tbody></table>"
+    )
+    path = write(tmp_path, "sem_1_btech.html", page)
+    assert department_course_scraper.scrape_department_course_file(path, 1) == {"Chemistry": {"CH 105"}}
+    assert department_course_scraper.scrape_course_data(page, True) == {"Chemistry": {"CH 105"}}
+
+
+def test_scrape_in_parallel(tmp_path):
+    paths = [write(tmp_path, f"{i}.html", COURSE_PAGE) for i in range(3)]
+    missing = str(tmp_path / "missing.html")
+    results = dict(scrape_in_parallel(course_scraper.scrape_course_file, [(path,) for path in paths + [missing]], max_workers=2))
+    assert all(len(results[(path,)]) == 2 for path in paths)
+    assert results[(missing,)] is None
+
+
+class RecordingManifest(ScrapeManifest):
+    """Remembers which files were parsed (rather than served from the manifest)"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.parsed = []
+
+    def update(self, key, digest, records):
+        self.parsed.append(key)
+        super().update(key, digest, records)
+
+
+def test_scrape_changed_files_only_parses_changed_files(tmp_path):
+    manifest = ScrapeManifest(str(tmp_path / "manifest.json"))
+    first = write(tmp_path, "cs.html", COURSE_PAGE)
+    second = write(tmp_path, "ee.html", COURSE_PAGE)
+    jobs = [(first,), (second,)]
+
+    results = dict(scrape_changed_files(course_scraper.scrape_course_file, jobs, manifest, max_workers=1))
+    assert len(results[(first,)]) == 2
+    assert manifest.dirty == ["cs.html", "ee.html"]
+    manifest.clear_dirty()
+    manifest.save()
+
+    write(tmp_path, "ee.html", COURSE_PAGE.replace("CS 293", "EE 293"))
+    reloaded = RecordingManifest(manifest.path)
+    results = dict(scrape_changed_files(course_scraper.scrape_course_file, jobs, reloaded, max_workers=1))
+    assert reloaded.parsed == ["ee.html"]
+    assert results[(first,)][1]["course_code"] == "CS 293"
+    assert results[(second,)][1]["course_code"] == "EE 293"
+    assert reloaded.dirty == ["ee.html"]
+
+
+def test_rewritten_file_with_same_records_is_not_dirty(tmp_path):
+    manifest = ScrapeManifest(str(tmp_path / "manifest.json"))
+    manifest.update("cs.html", "old-hash", [{"course_code": "CS 101"}])
+    manifest.clear_dirty()
+    manifest.update("cs.html", "new-hash", [{"course_code": "CS 101"}])
+    assert manifest.dirty == []
+    assert manifest.cached_records("cs.html", "new-hash") == [{"course_code": "CS 101"}]
+    assert manifest.cached_records("cs.html", "old-hash") is None
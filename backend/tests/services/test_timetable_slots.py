@@ -0,0 +1,49 @@
+from itertools import combinations
+import pytest
+from app.services.timetable import SLOT_MASKS, find_clashes, has_clash, meeting_mask, slot_mask
+
+THEORY_SLOTS = [str(slot) for slot in range(1, 16)]
+LAB_SLOTS = [f"L{slot}" for slot in range(1, 7)]
+
+
+def test_every_course_slot_has_a_mask():
+    assert set(SLOT_MASKS) == set(THEORY_SLOTS + LAB_SLOTS)
+    assert all(mask for mask in SLOT_MASKS.values())
+
+
+def test_theory_slots_never_overlap_each_other():
+    for a, b in combinations(THEORY_SLOTS, 2):
+        assert not SLOT_MASKS[a] & SLOT_MASKS[b], (a, b)
+
+
+def test_meeting_mask_adjacent_meetings_do_not_overlap():
+    assert not meeting_mask("Mon", "08:30", "09:25") & meeting_mask("Mon", "09:30", "10:25")
+    assert meeting_mask("Mon", "08:30", "09:30") & meeting_mask("Mon", "09:25", "10:25")
+
+
+def test_meeting_mask_outside_day():
+    with pytest.raises(ValueError):
+        meeting_mask("Mon", "07:00", "08:30")
+
+
+def test_has_clash():
+    assert not has_clash(["1", "2", "3", "4", "5"])
+    assert has_clash(["1", "2", "1"])
+    assert has_clash(["8", "L1"])
+
+
+def test_find_clashes_reports_every_pair():
+    assert find_clashes(["8", "3", "L1", "9"]) == [(0, 2), (2, 3)]
+    assert find_clashes(["1", "2"]) == []
+
+
+def test_unknown_slot():
+    with pytest.raises(ValueError):
+        slot_mask("L7")
+
+
+def test_zero_padded_theory_slots_are_the_canonical_ones():
+    assert slot_mask("07") == slot_mask("7")
+    assert find_clashes(["07", "7"]) == [(0, 1)]
+    with pytest.raises(ValueError):
+        slot_mask("L01")
@@ -0,0 +1,145 @@
+import json
+
+from google.api_core import exceptions
+
+from app.services.catalogue_artifact import read_catalogue_artifact, write_catalogue_artifact
+from app.services.catalogue_snapshot import read_artifact_catalogue
+from app.services.course_uploader import sync_courses
+from app.services.firestore_sync import content_hash
+from app.services.upload_pipeline import UploadCheckpoint, upload_artifact
+from benchmarks.catalogue import artifact_catalogue
+from app.db.memory import MemoryFirestore
+
+
+class FailingFirestore(MemoryFirestore):
+    """Loses the connection for good at the given commit (1-based): it and every later one fail."""
+
+    def __init__(self, fail_from, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_from = fail_from
+        self.attempts = 0
+
+    def batch(self):
+        batch = super().batch()
+        commit = batch.commit
+
+        def failing_commit():
+            self.attempts += 1
+            if self.attempts >= self.fail_from:
+                raise exceptions.PermissionDenied("connection lost")
+            commit()
+
+        batch.commit = failing_commit
+        return batch
+
+
+def make_artifact(tmp_path, courses):
+    path = str(tmp_path / "catalogue.iitbcat")
+    write_catalogue_artifact(path, courses)
+    return path
+
+
+def quiet(message):
+    pass
+
+
+def test_sync_streams_every_valid_course(tmp_path):
+    catalogue = artifact_catalogue(scale=1)
+    path = make_artifact(tmp_path, catalogue["courses"] + [{"department": "CS", "course_code": "bad", "course_name": "x", "course_type": "Theory", "slot": "1"}])
+    client = MemoryFirestore()
+    result = upload_artifact(client, path, batch_size=100, chunk_size=250, log=quiet)
+    stored = client.collections["courses"]
+    assert len(stored) == len(catalogue["courses"])
+    assert result.sync.inserts == len(stored)
+    assert result.rejected == {"invalid_course_code": 1}
+    assert result.summary.written == len(stored) and result.summary.failed == 0
+    assert all(set(course) == {"course_code", "course_name", "course_type", "slot"} for course in stored.values())
+
+    again = upload_artifact(client, path, log=quiet)
+    assert again.sync.unchanged == len(stored)
+    assert again.summary.written == 0
+
+
+def test_every_path_keeps_the_last_listing_of_a_code(tmp_path):
+    calc_a = {"department": "AE", "course_code": "MA 105", "course_name": "Calc A", "course_type": "Theory", "slot": "1"}
+    calc_b = {**calc_a, "department": "ME", "course_name": "Calc B"}
+    path = make_artifact(tmp_path, [calc_b, calc_a])
+
+    client = MemoryFirestore()
+    result = upload_artifact(client, path, log=quiet)
+    assert result.sync.inserts == 1
+    assert client.collections["courses"]["MA105"]["course_name"] == "Calc B"
+
+    courses = read_artifact_catalogue(path)[0]
+    assert [(course.id, course.course_name) for course in courses] == [("MA105", "Calc B")]
+
+    synced = MemoryFirestore()
+    sync_courses(synced, read_catalogue_artifact(path)[0])
+    assert synced.collections["courses"]["MA105"]["course_name"] == "Calc B"
+
+
+def test_sync_deletes_courses_no_longer_listed(tmp_path):
+    courses = artifact_catalogue(scale=1)["courses"]
+    client = MemoryFirestore()
+    upload_artifact(client, make_artifact(tmp_path, courses), log=quiet)
+    result = upload_artifact(client, make_artifact(tmp_path, courses[:-5]), log=quiet)
+    assert result.sync.deletes == 5
+    assert len(client.collections["courses"]) == len(courses) - 5
+
+
+def test_interrupted_upload_resumes_from_checkpoint(tmp_path):
+    courses = artifact_catalogue(scale=1)["courses"]
+    path = make_artifact(tmp_path, courses)
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    client = FailingFirestore(fail_from=4)
+
+    first = upload_artifact(client, path, mode="append", checkpoint_path=checkpoint_path, batch_size=100, max_workers=1, log=quiet)
+    assert first.summary.written == 300
+    with open(checkpoint_path) as f:
+        position = json.load(f)["position"]
+    assert position == 300
+
+    reconnected = MemoryFirestore(client.collections)
+    reconnected.auto_ids = client.auto_ids
+    client = reconnected
+    second = upload_artifact(client, path, mode="append", checkpoint_path=checkpoint_path, batch_size=100, max_workers=1, log=quiet)
+    assert second.resumed_from == 300
+    assert second.summary.written == len(courses) - 300
+    # Append mode would duplicate anything written twice
+    assert len(client.collections["courses"]) == len(courses)
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_resumed_sync_keeps_the_rows_before_the_checkpoint(tmp_path):
+    courses = artifact_catalogue(scale=1)["courses"]
+    path = make_artifact(tmp_path, courses)
+    manifest_path = str(tmp_path / "manifest.json")
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    client = FailingFirestore(fail_from=3)
+
+    upload_artifact(client, path, checkpoint_path=checkpoint_path, manifest_path=manifest_path, batch_size=100, max_workers=1, log=quiet)
+    client = MemoryFirestore(client.collections)
+    result = upload_artifact(client, path, checkpoint_path=checkpoint_path, manifest_path=manifest_path, batch_size=100, max_workers=1, log=quiet)
+    assert result.resumed_from == 200
+    assert result.sync.deletes == 0
+    assert len(client.collections["courses"]) == len(courses)
+    with open(manifest_path) as f:
+        assert json.load(f) == {doc_id: content_hash(course) for doc_id, course in client.collections["courses"].items()}
+
+
+def test_checkpoint_of_another_artifact_is_ignored(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = UploadCheckpoint(path, "v1:sync")
+    checkpoint.position = 42
+    checkpoint.save()
+    assert UploadCheckpoint(path, "v1:sync").position == 42
+    assert UploadCheckpoint(path, "v2:sync").position == 0
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    courses = artifact_catalogue(scale=1)["courses"]
+    client = MemoryFirestore(record_calls=True)
+    result = upload_artifact(client, make_artifact(tmp_path, courses), dry_run=True, log=quiet)
+    assert result.summary is None
+    assert result.sync.inserts > 0
+    assert client.commits == []
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.api.v1.schemas import Course
+from app.services.course_uploader import sync_courses
+from benchmarks.catalogue import artifact_catalogue, course_page_html, firestore_collections, generate_courses
+from app.db.memory import MemoryAsyncFirestore, MemoryFirestore
+from benchmarks.run import Result, regression
+
+
+def test_generated_courses_pass_the_schema():
+    courses = generate_courses(scale=1)
+    assert len(courses) == len({course["course_code"] for course in courses})
+    for course in courses:
+        Course(id="x", **course)
+
+
+def test_generated_page_is_scraped_back():
+    from app.services.course_scraper import scrape_course_data
+
+    courses = generate_courses(scale=1)[:20]
+    scraped = scrape_course_data(course_page_html(courses))
+    assert [course["course_code"] for course in scraped] == [course["course_code"] for course in courses]
+
+
+def test_memory_firestore_serves_the_catalogue_and_uploads():
+    collections = firestore_collections(scale=1)
+    db = MemoryAsyncFirestore(collections)
+
+    async def count_courses():
+        return len([doc async for doc in db.collection("courses").stream()])
+
+    assert asyncio.run(count_courses()) == len(collections["courses"])
+
+    client = MemoryFirestore()
+    courses = list(collections["courses"].values())
+    _, summary = sync_courses(client, courses)
+    assert summary.written == len(courses)
+    plan, _ = sync_courses(client, courses)
+    assert plan.is_empty
+
+
+def test_artifact_catalogue_round_trips(tmp_path):
+    from app.services.catalogue_artifact import read_catalogue_artifact, write_catalogue_artifact
+
+    catalogue = artifact_catalogue(scale=1)
+    path = str(tmp_path / "catalogue.iitbcat")
+    write_catalogue_artifact(path, **catalogue)
+    courses, departments, plans = read_catalogue_artifact(path)
+    assert len(courses) == len(catalogue["courses"])
+    assert all(course["course_code"].startswith(course["department"]) for course in courses)
+    assert plans == catalogue["department_courses"]
+
+
+def test_regression_detection():
+    baseline = {"value": 100.0}
+    assert regression(Result("a", 80, "req/s"), baseline, 0.3) is None
+    assert regression(Result("a", 60, "req/s"), baseline, 0.3) is not None
+    assert regression(Result("a", 120, "ms", higher_is_better=False), baseline, 0.3) is None
+    assert regression(Result("a", 140, "ms", higher_is_better=False), baseline, 0.3) is not None
+    assert regression(Result("a", 1, "ms"), None, 0.3) is None